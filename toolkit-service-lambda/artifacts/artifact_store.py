@@ -0,0 +1,156 @@
+import os
+import stat
+import hashlib
+import tarfile
+import threading
+import zstandard
+
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+
+COMPRESSION_LEVEL = 3
+
+
+class ArtifactStore(ABC):
+    """
+    Stores directories produced by bootstrap stages, so a retried bootstrap can pick them up instead of
+    regenerating them.
+
+    Each artifact is a zstd-compressed tar streamed through a pipe, so it is never staged on disk. It is
+    content-addressed: stored under "blobs/<sha256>.tar.zst", where the hash covers the directory contents,
+    so saving content that is already stored skips the upload, and artifacts are loaded by their hash.
+    Blobs can be shared by services, so they are not deleted with a service; S3 expires them instead.
+    """
+
+    def save(self, source_dir: str) -> dict:
+        digest = content_hash(source_dir)
+        key = artifact_key(digest)
+
+        if self.exists(key):
+            print(f"Artifact {key} is already stored, skipping upload")
+            return {"key": key, "sha256": digest, "uploaded": False}
+
+        with piped(lambda pipe: pack(source_dir, pipe)) as reader:
+            self.write(key, reader)
+
+        print(f"Stored artifact {key}: {reader.bytes_read} bytes")
+        return {"key": key, "sha256": digest, "uploaded": True, "bytes": reader.bytes_read}
+
+    def load(self, digest: str, target_dir: str):
+        key = artifact_key(digest)
+
+        with piped(lambda pipe: self.read(key, pipe)) as reader:
+            unpack(reader, target_dir)
+
+        print(f"Restored artifact {key} to {target_dir}")
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        pass
+
+    @abstractmethod
+    def write(self, key: str, fileobj):
+        pass
+
+    @abstractmethod
+    def read(self, key: str, fileobj):
+        pass
+
+
+def artifact_key(digest: str) -> str:
+    return f"blobs/{digest}.tar.zst"
+
+
+def content_hash(source_dir: str) -> str:
+    """Hashes the paths, modes, link targets and contents of every file under `source_dir`."""
+    digest = hashlib.sha256()
+
+    for root, dirs, files in os.walk(source_dir):
+        dirs.sort()
+        for name in sorted(files + [d for d in dirs if os.path.islink(os.path.join(root, d))]):
+            path = os.path.join(root, name)
+            mode = os.lstat(path).st_mode
+
+            digest.update(os.path.relpath(path, source_dir).encode())
+            digest.update(b"\0")
+
+            if stat.S_ISLNK(mode):
+                digest.update(b"link:" + os.readlink(path).encode())
+            else:
+                digest.update(b"x" if mode & stat.S_IXUSR else b"-")
+                with open(path, "rb") as f:
+                    for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                        digest.update(chunk)
+
+            digest.update(b"\0")
+
+    return digest.hexdigest()
+
+
+def pack(source_dir: str, fileobj):
+    compressor = zstandard.ZstdCompressor(level=COMPRESSION_LEVEL, threads=-1)
+
+    with compressor.stream_writer(fileobj, closefd=False) as writer:
+        with tarfile.open(fileobj=writer, mode="w|") as tar:
+            tar.add(source_dir, arcname=".")
+
+
+def unpack(fileobj, target_dir: str):
+    os.makedirs(target_dir, exist_ok=True)
+
+    with zstandard.ZstdDecompressor().stream_reader(fileobj, closefd=False) as reader:
+        with tarfile.open(fileobj=reader, mode="r|") as tar:
+            tar.extractall(target_dir, filter="data")
+
+
+@contextmanager
+def piped(produce):
+    """
+    Runs `produce(writer)` in a thread and yields a reader for the pipe it writes to. A producer
+    error is raised by the reader at the end of the stream, so a truncated stream is never
+    mistaken for a complete one.
+    """
+    read_fd, write_fd = os.pipe()
+    errors = []
+
+    def run():
+        try:
+            with os.fdopen(write_fd, "wb") as writer:
+                produce(writer)
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=run, daemon=True)
+    reader = PipeReader(os.fdopen(read_fd, "rb"), thread, errors)
+    thread.start()
+
+    try:
+        yield reader
+        # Consumers such as tarfile can stop before the end; the producer must still finish
+        while reader.read(64 * 1024):
+            pass
+    finally:
+        # Closing the read end unblocks a producer whose consumer failed
+        reader.fileobj.close()
+        thread.join()
+
+
+class PipeReader:
+    """The read end of `piped`, counting bytes read so compressed artifact sizes can be reported."""
+
+    def __init__(self, fileobj, thread: threading.Thread, errors: list):
+        self.fileobj = fileobj
+        self.thread = thread
+        self.errors = errors
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.fileobj.read(size)
+        self.bytes_read += len(data)
+
+        if not data:
+            self.thread.join()
+            if self.errors:
+                raise self.errors[0]
+
+        return data
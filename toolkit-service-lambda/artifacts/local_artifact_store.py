@@ -0,0 +1,30 @@
+import os
+import shutil
+
+from artifacts.artifact_store import ArtifactStore
+
+
+class LocalArtifactStore(ArtifactStore):
+    """Stores artifacts in a local directory."""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self.path(key))
+
+    def write(self, key: str, fileobj):
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Written aside and renamed, so a failed write never leaves a partial artifact under its hash
+        with open(f"{path}.tmp", "wb") as artifact_file:
+            shutil.copyfileobj(fileobj, artifact_file)
+        os.replace(f"{path}.tmp", path)
+
+    def read(self, key: str, fileobj):
+        with open(self.path(key), "rb") as artifact_file:
+            shutil.copyfileobj(artifact_file, fileobj)
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, key)
@@ -0,0 +1,50 @@
+import boto3
+
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
+
+from artifacts.artifact_store import ArtifactStore
+
+KEY_PREFIX = "bootstrap"
+
+# Artifacts above 16 MB are transferred in parallel 16 MB parts
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=16 * 1024 * 1024,
+    multipart_chunksize=16 * 1024 * 1024,
+    max_concurrency=8,
+)
+
+
+class S3ArtifactStore(ArtifactStore):
+    """Stores artifacts in S3 under "bootstrap/", where the bucket's lifecycle rule expires them."""
+
+    def __init__(self, bucket: str, session: boto3.session.Session = None):
+        session = session or boto3.session.Session()
+
+        self.bucket = bucket
+        self.s3_client = session.client("s3")
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.s3_client.head_object(Bucket=self.bucket, Key=self.object_key(key))
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+        return True
+
+    def write(self, key: str, fileobj):
+        self.s3_client.upload_fileobj(
+            fileobj,
+            self.bucket,
+            self.object_key(key),
+            ExtraArgs={"ContentType": "application/zstd"},
+            Config=TRANSFER_CONFIG,
+        )
+
+    def read(self, key: str, fileobj):
+        self.s3_client.download_fileobj(self.bucket, self.object_key(key), fileobj, Config=TRANSFER_CONFIG)
+
+    def object_key(self, key: str) -> str:
+        return f"{KEY_PREFIX}/{key}"
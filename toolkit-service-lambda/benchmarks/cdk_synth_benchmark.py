@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Compares CDK infra generation with a warm synth cache against cold synth.
+
+Run from toolkit-service-lambda/ with the cdk CLI and aws-cdk-lib installed:
+
+    python3 benchmarks/cdk_synth_benchmark.py --iterations 5
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from infra.cdk_infra_generator import CdkInfraGenerator  # noqa: E402
+from workspace import project_path  # noqa: E402
+
+INFRA_CONFIG = {
+    "vpc": "vpc-0123456789abcdef0",
+    "subnets": "subnet-0123456789abcdef0,subnet-0fedcba9876543210",
+}
+
+
+def time_generation(generator: CdkInfraGenerator) -> float:
+    project_id = str(uuid.uuid4())
+
+    start = time.perf_counter()
+    generator.generate_infra(project_id, INFRA_CONFIG)
+    elapsed = time.perf_counter() - start
+
+    shutil.rmtree(project_path(project_id), ignore_errors=True)
+
+    return elapsed
+
+
+def summarize(label: str, samples: list):
+    print(f"{label:<12} n={len(samples):<3} "
+          f"mean={statistics.mean(samples):8.3f}s "
+          f"median={statistics.median(samples):8.3f}s "
+          f"min={min(samples):8.3f}s "
+          f"max={max(samples):8.3f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=3, help="Number of runs per mode")
+    args = parser.parse_args()
+
+    cold, warm = [], []
+
+    for _ in range(args.iterations):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cold.append(time_generation(CdkInfraGenerator(cache_dir=cache_dir)))
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        generator = CdkInfraGenerator(cache_dir=cache_dir)
+        # Prime the cache once, then measure cache hits only
+        time_generation(generator)
+        for _ in range(args.iterations):
+            warm.append(time_generation(generator))
+
+    summarize("cold synth", cold)
+    summarize("cached", warm)
+    print(f"speedup      {statistics.median(cold) / statistics.median(warm):.1f}x (median)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Sweeps the bootstrapper's memory setting against an offline bootstrap and reports the cost/latency curve.
+
+Each memory size runs the Lambda image locally through its runtime interface emulator, with docker
+limiting memory and CPU the way Lambda does (one vCPU per 1769 MB). The offline providers keep the
+run off AWS and GitHub; the model is still fetched unless --model points at a local file.
+
+Build the image, then run from toolkit-service-lambda/ with docker installed:
+
+    docker build -t industry-toolkit-bootstrapper .
+    python3 benchmarks/memory_sweep_benchmark.py --memory 1024,2048,3008,4096 --iterations 3
+"""
+import argparse
+import copy
+import json
+import os
+import statistics
+import subprocess
+import time
+import urllib.error
+import urllib.request
+
+# Lambda prices per GB-second and per request (us-east-1)
+GB_SECOND_PRICE = {"x86_64": 0.0000166667, "arm64": 0.0000133334}
+REQUEST_PRICE = 0.0000002
+
+MB_PER_VCPU = 1769
+MAX_VCPUS = 6
+
+INVOKE_PATH = "/2015-03-31/functions/function/invocations"
+
+PAYLOAD = {
+    "service": {
+        "type": "spring",
+        "name": "memory-sweep",
+        "description": "Memory sweep benchmark service",
+        "openapi": {
+            "model": "https://raw.githubusercontent.com/aws-samples/industry-reference-models/refs/heads/main/domains/retail/models/cart/model/cart.openapi.yaml",
+            "config": {
+                "basePackage": "com.example.sweep",
+                "modelPackage": "com.example.sweep.model",
+                "apiPackage": "com.example.sweep.api",
+                "groupId": "com.example",
+                "artifactId": "memory-sweep"
+            }
+        }
+    },
+    "scm": {
+        "github": {"repo": "https://github.com/example/memory-sweep"}
+    },
+    "iac": {
+        "cloudformation": {
+            "vpc": "vpc-0123456789abcdef0",
+            "subnets": "subnet-0123456789abcdef0,subnet-0fedcba9876543210"
+        }
+    }
+}
+
+
+def vcpus(memory_mb: int) -> float:
+    return round(min(MAX_VCPUS, memory_mb / MB_PER_VCPU), 2)
+
+
+def start_container(args, memory_mb: int) -> str:
+    command = [
+        "docker", "run", "-d", "--rm",
+        "-p", f"{args.port}:8080",
+        f"--memory={memory_mb}m",
+        f"--cpus={vcpus(memory_mb)}",
+        "-e", "BOOTSTRAP_PROVIDERS=offline",
+        "-e", f"AWS_LAMBDA_FUNCTION_MEMORY_SIZE={memory_mb}",
+        "-e", "AWS_LAMBDA_FUNCTION_TIMEOUT=900",
+    ]
+    if args.platform:
+        command += ["--platform", args.platform]
+    if args.model:
+        command += ["-v", f"{os.path.abspath(os.path.dirname(args.model))}:/models:ro"]
+
+    command.append(args.image)
+
+    return subprocess.run(command, check=True, capture_output=True, text=True).stdout.strip()
+
+
+def invoke(port: int, payload: dict, timeout: float = 900) -> float:
+    request = urllib.request.Request(
+        f"http://localhost:{port}{INVOKE_PATH}",
+        data=json.dumps(payload).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+
+    start = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        result = json.loads(response.read())
+    elapsed = time.perf_counter() - start
+
+    if not isinstance(result, dict) or result.get("statusCode") != 200:
+        raise RuntimeError(f"Bootstrap failed: {result}")
+
+    return elapsed
+
+
+def wait_for_emulator(port: int, deadline_seconds: float = 30):
+    deadline = time.monotonic() + deadline_seconds
+
+    while True:
+        try:
+            urllib.request.urlopen(f"http://localhost:{port}/", timeout=1)
+            return
+        except urllib.error.HTTPError:
+            # Any HTTP response means the emulator is listening
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise RuntimeError("The runtime interface emulator did not start")
+            time.sleep(0.2)
+
+
+def run_payload(payload: dict, run: int) -> dict:
+    # The offline SCM provider refuses to push to an existing local remote
+    payload = copy.deepcopy(payload)
+    _, scm_info = next(iter(payload["scm"].items()))
+    scm_info["repo"] = f"{scm_info['repo'].rstrip('/')}-{run}"
+
+    return payload
+
+
+def sweep(args, payload: dict) -> list:
+    results = []
+
+    for memory_mb in args.memory:
+        container_id = start_container(args, memory_mb)
+        try:
+            wait_for_emulator(args.port)
+
+            # The first invocation pays for the init phase, like a cold start
+            cold = invoke(args.port, run_payload(payload, 0))
+            warm = [invoke(args.port, run_payload(payload, run)) for run in range(1, args.iterations + 1)]
+        except Exception as e:
+            # Too little memory for the generator JVM shows up as a failed or killed invocation
+            print(f"{memory_mb} MB: failed: {e}")
+            results.append({"memoryMb": memory_mb, "vcpus": vcpus(memory_mb), "error": str(e)})
+            continue
+        finally:
+            subprocess.run(["docker", "stop", container_id], capture_output=True)
+
+        median = statistics.median(warm)
+        results.append({
+            "memoryMb": memory_mb,
+            "vcpus": vcpus(memory_mb),
+            "coldSeconds": cold,
+            "medianSeconds": median,
+            "maxSeconds": max(warm),
+            "costPer1000": 1000 * (median * memory_mb / 1024 * GB_SECOND_PRICE[args.architecture] + REQUEST_PRICE),
+        })
+        print(f"{memory_mb} MB: cold {cold:.1f}s, warm median {median:.1f}s")
+
+    return results
+
+
+def report(results: list):
+    completed = [r for r in results if "error" not in r]
+    if not completed:
+        print("No memory size completed the bootstrap")
+        return
+
+    cheapest = min(completed, key=lambda r: r["costPer1000"])
+    fastest = min(completed, key=lambda r: r["medianSeconds"])
+
+    print(f"\n{'memory':>8} {'vCPUs':>6} {'cold':>8} {'median':>8} {'max':>8} {'$/1000':>8}")
+    for r in results:
+        if "error" in r:
+            print(f"{r['memoryMb']:>6}MB {r['vcpus']:>6}  failed: {r['error']}")
+            continue
+        marks = [label for label, best in (("cheapest", cheapest), ("fastest", fastest)) if r is best]
+        print(f"{r['memoryMb']:>6}MB {r['vcpus']:>6} {r['coldSeconds']:>7.1f}s {r['medianSeconds']:>7.1f}s "
+              f"{r['maxSeconds']:>7.1f}s {r['costPer1000']:>8.3f}  {', '.join(marks)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--image", default="industry-toolkit-bootstrapper", help="Bootstrapper image to run")
+    parser.add_argument("--memory", default="1024,2048,3008,4096",
+                        type=lambda value: [int(m) for m in value.split(",")], help="Comma-separated memory sizes in MB")
+    parser.add_argument("--iterations", type=int, default=3, help="Warm invocations per memory size")
+    parser.add_argument("--architecture", choices=sorted(GB_SECOND_PRICE), default="x86_64", help="Architecture to price")
+    parser.add_argument("--platform", help="docker --platform, e.g. linux/arm64 for an arm64 image")
+    parser.add_argument("--payload", help="Service payload to bootstrap (default: a Spring service)")
+    parser.add_argument("--model", help="Local OpenAPI model to use instead of the payload's model URL")
+    parser.add_argument("--port", type=int, default=9000, help="Local port for the runtime interface emulator")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    payload = PAYLOAD
+    if args.payload:
+        with open(args.payload) as payload_file:
+            payload = json.load(payload_file)
+    if args.model:
+        payload = copy.deepcopy(payload)
+        payload["service"]["openapi"]["model"] = f"/models/{os.path.basename(args.model)}"
+
+    results = sweep(args, payload)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        report(results)
+
+
+if __name__ == "__main__":
+    main()
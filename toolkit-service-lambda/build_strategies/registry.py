@@ -0,0 +1,90 @@
+import importlib
+
+from functools import lru_cache
+
+
+DEFAULT_BUILD_MODE = "default"
+
+# Maps an openapi-generator generator name and build mode to the Dockerfile and buildspec
+# strategies that build it, plus any infra parameter defaults the mode needs. Classes are
+# referenced by import path and loaded on first use, so languages that are never requested
+# add no import cost.
+BUILD_STRATEGIES = {
+    "spring": {
+        DEFAULT_BUILD_MODE: {
+            "dockerfile": "docker.java_spring_boot_generator.JavaSpringBootDockerfileGenerator",
+            "buildspec": "codebuild.java_maven_buildspec_generator.JavaMavenBuildspecGenerator",
+        },
+        "native": {
+            "dockerfile": "docker.java_spring_native_generator.JavaSpringNativeDockerfileGenerator",
+            "buildspec": "codebuild.container_buildspec_generator.ContainerBuildspecGenerator",
+            "codegen_config": {"useSpringBoot3": "true"},
+            # The smallest Fargate task. It equals the template's defaults, so this is no reduction today;
+            # it keeps native tasks at the minimum if those defaults grow
+            "infra_defaults": {"taskCpu": "256", "taskMemory": "512"},
+            "build_compute_type": "BUILD_GENERAL1_LARGE",
+        },
+    },
+    "kotlin-spring": {
+        DEFAULT_BUILD_MODE: {
+            "dockerfile": "docker.kotlin_spring_generator.KotlinSpringDockerfileGenerator",
+            "buildspec": "codebuild.container_buildspec_generator.ContainerBuildspecGenerator",
+        },
+    },
+    "python-fastapi": {
+        DEFAULT_BUILD_MODE: {
+            "dockerfile": "docker.python_fastapi_generator.PythonFastApiDockerfileGenerator",
+            "buildspec": "codebuild.container_buildspec_generator.ContainerBuildspecGenerator",
+        },
+    },
+    "go-server": {
+        DEFAULT_BUILD_MODE: {
+            "dockerfile": "docker.go_server_generator.GoServerDockerfileGenerator",
+            "buildspec": "codebuild.container_buildspec_generator.ContainerBuildspecGenerator",
+        },
+    },
+    "nodejs-express-server": {
+        DEFAULT_BUILD_MODE: {
+            "dockerfile": "docker.node_express_generator.NodeExpressDockerfileGenerator",
+            "buildspec": "codebuild.container_buildspec_generator.ContainerBuildspecGenerator",
+        },
+    },
+}
+
+
+def supported_service_types() -> list:
+    return sorted(BUILD_STRATEGIES)
+
+
+def get_build_mode(service_info: dict) -> str:
+    """Returns the build mode requested in the payload, e.g. `"build": {"mode": "native"}`."""
+    return service_info.get("build", {}).get("mode", DEFAULT_BUILD_MODE)
+
+
+def get_build_strategy(service_type: str, build_mode: str = DEFAULT_BUILD_MODE) -> dict:
+    if service_type not in BUILD_STRATEGIES:
+        raise ValueError(f"Unsupported project type: {service_type}")
+
+    modes = BUILD_STRATEGIES[service_type]
+    if build_mode not in modes:
+        raise ValueError(f"Unsupported build mode '{build_mode}' for project type: {service_type}")
+
+    return modes[build_mode]
+
+
+def get_dockerfile_generator(service_type: str, build_mode: str = DEFAULT_BUILD_MODE):
+    """Returns a new Dockerfile generator for the given service type."""
+    return _load_class(get_build_strategy(service_type, build_mode)["dockerfile"])()
+
+
+def get_buildspec_generator(service_type: str, build_mode: str = DEFAULT_BUILD_MODE, session=None):
+    """Returns a new buildspec generator for the given service type, resolving the account with `session`."""
+    return _load_class(get_build_strategy(service_type, build_mode)["buildspec"])(session)
+
+
+@lru_cache(maxsize=None)
+def _load_class(class_path: str):
+    module_name, class_name = class_path.rsplit(".", 1)
+    module = importlib.import_module(module_name)
+
+    return getattr(module, class_name)
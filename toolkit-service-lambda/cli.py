@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Runs the service bootstrapper locally, without deploying the Lambda function.
+
+By default no AWS resources are created: the generated project is written under --workspace,
+pushed to a local bare git repository, and the registry, build projects and pipeline that
+would be created are printed as a plan. Run from toolkit-service-lambda/:
+
+    python3 cli.py service.json --workspace ./out
+    python3 cli.py service.json --plan
+    python3 cli.py service.json --providers aws
+"""
+import argparse
+import json
+import os
+import sys
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Bootstrap a service from a payload file.")
+    parser.add_argument("payload", help="Path to the service payload JSON, as passed to the Lambda function")
+    parser.add_argument("--workspace", help="Directory to generate projects in (default: $WORKSPACE_ROOT or /tmp)")
+    parser.add_argument("--providers", choices=["offline", "aws"], default="offline",
+                        help="offline records AWS resources and pushes to a local git remote; aws creates them")
+    parser.add_argument("--plan", action="store_true",
+                        help="Generate the project but only print what would be created (offline providers)")
+    parser.add_argument("--json", action="store_true", help="Print the plan and service record as JSON")
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    if args.plan and args.providers != "offline":
+        print("--plan is only supported with the offline providers", file=sys.stderr)
+        return 2
+
+    # The workspace is read when paths are built, so it must be set before the bootstrapper runs
+    if args.workspace:
+        os.environ["WORKSPACE_ROOT"] = os.path.abspath(args.workspace)
+    os.environ["BOOTSTRAP_PROVIDERS"] = args.providers
+
+    from handler import process_service_creation
+    from providers.providers import get_providers
+    from stage_timer import StageTimer
+    from workspace import project_path
+
+    with open(args.payload) as payload_file:
+        payload = json.load(payload_file)
+
+    if args.plan:
+        from providers.offline_providers import OfflineProviders
+        providers = OfflineProviders(plan_only=True)
+    else:
+        providers = get_providers(args.providers)
+
+    timer = StageTimer()
+    item = process_service_creation(payload, providers, timer)
+    plan = getattr(providers, "plan", [])
+
+    if args.json:
+        print(json.dumps({"plan": plan, "service": item}, indent=2, default=str))
+        return 0
+
+    if plan:
+        print("\nResources:")
+        for entry in plan:
+            region = f" ({entry['region']})" if "region" in entry else ""
+            print(f"  {entry['action']:<8} {entry['resource']:<20} {entry['name']}{region}")
+
+    print(f"\nProject {item['id']} generated in {project_path(item['id'])}")
+    print(f"\nStage timings:\n{timer.report()}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,99 @@
 import os
+import boto3
 
 from abc import ABC, abstractmethod
 
+from workspace import project_path
+
 
 class BuildspecGenerator(ABC):
 
+    def __init__(self, session: boto3.session.Session = None, region: str = None):
+        # The registry URI and region written to the buildspec; pipelines in other targets override
+        # them with project environment variables
+        self.session = session or boto3.session.Session()
+        self.region = region
+
     @abstractmethod
-    def generate_buildspec(self, project_id: str, service_info: dict) -> str:
+    def generate_buildspec(self, project_id: str, service_info: dict, registry_config: dict = None) -> str:
         pass
 
     def create_project_dir(self, project_id: str) -> str:
-        project_dir = f"/tmp/{project_id}"
+        project_dir = project_path(project_id)
         os.makedirs(project_dir, exist_ok=True)
 
         return project_dir
+
+    def get_account_id(self) -> str:
+        sts_client = self.session.client("sts")
+
+        identity = sts_client.get_caller_identity()
+
+        return identity["Account"]
+
+    def get_region(self) -> str:
+        return self.region or self.session.region_name
+
+    def image_tags(self, registry_config: dict = None) -> list:
+        """
+        Tags pushed for every build; the first is the one deployed. Repositories with immutable
+        tags cannot move :latest, so they only receive the commit tag.
+        """
+        if (registry_config or {}).get("tagImmutability"):
+            return ["$CODEBUILD_RESOLVED_SOURCE_VERSION"]
+
+        return ["latest", "$CODEBUILD_RESOLVED_SOURCE_VERSION"]
+
+    def cache_commands(self, registry_config: dict = None) -> str:
+        """
+        Pulls the image whose layers the build reuses, as $CACHE_IMAGE. Repositories with immutable
+        tags never receive :latest, so they use the most recently pushed commit tag instead.
+        """
+        if (registry_config or {}).get("tagImmutability"):
+            return "\n".join([
+                "      - CACHE_TAG=$(aws ecr describe-images --repository-name $ECR_REPOSITORY_NAME --filter tagStatus=TAGGED "
+                "--query 'sort_by(imageDetails,&imagePushedAt)[-1].imageTags[0]' --output text || true)",
+                "      - CACHE_IMAGE=$ECR_REGISTRY_URI/$ECR_REPOSITORY_NAME:$CACHE_TAG",
+                "      - docker pull $CACHE_IMAGE || true",
+            ])
+
+        return "\n".join([
+            "      - CACHE_IMAGE=$ECR_REGISTRY_URI/$ECR_REPOSITORY_NAME:latest",
+            "      - docker pull $CACHE_IMAGE || true",
+        ])
+
+    def tag_commands(self, image_tags: list) -> str:
+        return "\n".join(
+            f"      - docker tag $ECR_REPOSITORY_NAME:latest $ECR_REGISTRY_URI/$ECR_REPOSITORY_NAME:{tag}"
+            for tag in image_tags
+        )
+
+    def push_commands(self, image_tags: list, registry_config: dict = None) -> str:
+        """
+        Pushes every tag. Immutable tags cannot be overwritten, so a rebuild of a commit whose image
+        is already in the repository skips the push instead of failing it.
+        """
+        if (registry_config or {}).get("tagImmutability"):
+            return "\n".join(
+                f"      - if aws ecr describe-images --repository-name $ECR_REPOSITORY_NAME --image-ids imageTag={tag} "
+                f">/dev/null 2>&1; then echo Image {tag} already pushed; "
+                f"else docker push $ECR_REGISTRY_URI/$ECR_REPOSITORY_NAME:{tag}; fi"
+                for tag in image_tags
+            )
+
+        return "\n".join(f"      - docker push $ECR_REGISTRY_URI/$ECR_REPOSITORY_NAME:{tag}" for tag in image_tags)
+
+    def write_buildspec_file(self, project_dir: str, buildspec_content: str) -> str:
+        buildspec_path = os.path.join(project_dir, "buildspec.yaml")
+
+        print(f"Writing buildspec.yaml to {buildspec_path}")
+
+        try:
+            with open(buildspec_path, 'w') as f:
+                f.write(buildspec_content)
+            print(f"Buildspec written successfully to {buildspec_path}")
+        except Exception as e:
+            print(f"Failed to write buildspec.yaml: {e}")
+            raise
+
+        return buildspec_path
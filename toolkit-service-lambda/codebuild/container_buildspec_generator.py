@@ -0,0 +1,57 @@
+from codebuild.buildspec_generator import BuildspecGenerator
+
+
+class ContainerBuildspecGenerator(BuildspecGenerator):
+    """
+    Buildspec for services whose Dockerfile compiles the application in a multi-stage build.
+
+    BuildKit keeps the package manager caches in cache mounts, and the previously pushed image
+    is used as an inline layer cache so unchanged dependency layers are not rebuilt.
+    """
+
+    def generate_buildspec(self, project_id: str, service_info: dict, registry_config: dict = None) -> str:
+        project_dir = self.create_project_dir(project_id)
+
+        account_id = self.get_account_id()
+
+        return self.write_buildspec(project_dir, service_info["name"], account_id, registry_config)
+
+    def write_buildspec(self, project_dir: str, project_name: str, account_id: str, registry_config: dict = None):
+        region = self.get_region()
+        image_tags = self.image_tags(registry_config)
+
+        ecr_registry_uri = f"{account_id}.dkr.ecr.{region}.amazonaws.com"
+        ecr_repository_name = project_name
+
+        buildspec_content = f"""
+version: 0.2
+
+phases:
+  build:
+    commands:
+      - aws ecr get-login-password --region $AWS_DEFAULT_REGION | docker login --username AWS --password-stdin $ECR_REGISTRY_URI
+      - cd app
+{self.cache_commands(registry_config)}
+      - docker build --build-arg BUILDKIT_INLINE_CACHE=1 --cache-from $CACHE_IMAGE -t $ECR_REPOSITORY_NAME:latest -f Dockerfile .
+{self.tag_commands(image_tags)}
+      - cd ..
+  post_build:
+    commands:
+{self.push_commands(image_tags, registry_config)}
+      - echo Updating CloudFormation parameters file...
+      - find infra -name dev.json -exec sed -i 's|PLACEHOLDER_URI|'${{ECR_REGISTRY_URI}}/${{ECR_REPOSITORY_NAME}}:{image_tags[0]}'|' {{}} +
+      - find infra -name dev.json -exec cat {{}} +
+artifacts:
+  files:
+    - infra/**/*
+    - loadtest/**/*
+base-directory: .
+
+env:
+  variables:
+    DOCKER_BUILDKIT: 1
+    ECR_REPOSITORY_NAME: {ecr_repository_name}
+    ECR_REGISTRY_URI: {ecr_registry_uri}
+    AWS_DEFAULT_REGION: {region}
+"""
+        return self.write_buildspec_file(project_dir, buildspec_content)
@@ -1,27 +1,18 @@
 from codebuild.buildspec_generator import BuildspecGenerator
 
-import boto3
-import os
-
 
 class JavaMavenBuildspecGenerator(BuildspecGenerator):
 
-    def generate_buildspec(self, project_id: str, service_info: dict) -> str:
+    def generate_buildspec(self, project_id: str, service_info: dict, registry_config: dict = None) -> str:
         project_dir = self.create_project_dir(project_id)
 
-        sts_client = boto3.client("sts")
-
-        identity = sts_client.get_caller_identity()
-        account_id = identity["Account"]
-
-        return self.write_buildspec(project_dir, service_info["name"], account_id)
+        account_id = self.get_account_id()
 
-    def write_buildspec(self, project_dir: str, project_name:str, account_id: str):
-        buildspec_path = os.path.join(project_dir, "buildspec.yaml")
+        return self.write_buildspec(project_dir, service_info["name"], account_id, registry_config)
 
-        print(f"Writing buildspec.yaml to {buildspec_path}")
-
-        region = boto3.session.Session().region_name
+    def write_buildspec(self, project_dir: str, project_name:str, account_id: str, registry_config: dict = None):
+        region = self.get_region()
+        image_tags = self.image_tags(registry_config)
 
         ecr_registry_uri = f"{account_id}.dkr.ecr.{region}.amazonaws.com"
         ecr_repository_name = project_name
@@ -42,34 +33,28 @@ phases:
       - cd app
       - mvn clean install
       - docker build -t $ECR_REPOSITORY_NAME:latest -f Dockerfile .
-      - docker tag $ECR_REPOSITORY_NAME:latest $ECR_REGISTRY_URI/$ECR_REPOSITORY_NAME:latest
-      - docker tag $ECR_REPOSITORY_NAME:latest $ECR_REGISTRY_URI/$ECR_REPOSITORY_NAME:$CODEBUILD_RESOLVED_SOURCE_VERSION
+{self.tag_commands(image_tags)}
       - cd ..
   post_build:  
     commands:
-      - docker push $ECR_REGISTRY_URI/$ECR_REPOSITORY_NAME:latest
-      - docker push $ECR_REGISTRY_URI/$ECR_REPOSITORY_NAME:$CODEBUILD_RESOLVED_SOURCE_VERSION
+{self.push_commands(image_tags, registry_config)}
       - echo Updating CloudFormation parameters file...
-      - sed -i 's|PLACEHOLDER_URI|'${{ECR_REGISTRY_URI}}/${{ECR_REPOSITORY_NAME}}:latest'|' infra/dev.json
-      - cat infra/dev.json
+      - find infra -name dev.json -exec sed -i 's|PLACEHOLDER_URI|'${{ECR_REGISTRY_URI}}/${{ECR_REPOSITORY_NAME}}:{image_tags[0]}'|' {{}} +
+      - find infra -name dev.json -exec cat {{}} +
 artifacts:
   files:
-    - infra/dev.json
-    - infra/infra.yaml
+    - infra/**/*
+    - loadtest/**/*
 base-directory: .
 
+cache:
+  paths:
+    - '/root/.m2/**/*'
+
 env:
   variables:
     ECR_REPOSITORY_NAME: {ecr_repository_name}
     ECR_REGISTRY_URI: {ecr_registry_uri}
     AWS_DEFAULT_REGION: {region}
 """
-        try:
-            with open(buildspec_path, 'w') as f:
-                f.write(buildspec_content)
-            print(f"Buildspec written successfully to {buildspec_path}")
-        except Exception as e:
-            print(f"Failed to write buildspec.yaml: {e}")
-            raise
-
-        return buildspec_path
+        return self.write_buildspec_file(project_dir, buildspec_content)
@@ -1,8 +1,27 @@
 from abc import ABC, abstractmethod
 
+from build_strategies.registry import get_build_mode, get_build_strategy
+from codegen.spring_observability import observability_config
+
 
 class Codegen(ABC):
+    # Location (URL or local path) of the OpenAPI model the project was generated from
+    model_location = None
+
     @abstractmethod
     def generate_project(self, project_id: str, service_info: str):
         """Generates a project based on the provided event data."""
         pass
+
+    def additional_properties(self, service_info: dict, config: dict) -> str:
+        """Formats generator properties, applying any the build mode requires."""
+        strategy = get_build_strategy(service_info["type"], get_build_mode(service_info))
+
+        properties = dict(config)
+        properties.update(strategy.get("codegen_config", {}))
+
+        # Micrometer tracing and OTLP export are auto-configured from Spring Boot 3
+        if observability_config(service_info):
+            properties["useSpringBoot3"] = "true"
+
+        return ",".join(f"{k}={v}" for k, v in properties.items())
@@ -0,0 +1,42 @@
+from urllib.parse import unquote
+
+
+def pointer_parts(pointer: str) -> list:
+    """Splits a JSON pointer such as "/components/schemas/Pet" into its unescaped reference tokens."""
+    return [unquote(part).replace("~1", "/").replace("~0", "~") for part in pointer.split("/") if part]
+
+
+def resolve_pointer(document, pointer: str):
+    """Returns the node of `document` at `pointer`, raising ValueError when it does not resolve."""
+    node = document
+
+    for part in pointer_parts(pointer):
+        if isinstance(node, list) and part.isdigit() and int(part) < len(node):
+            node = node[int(part)]
+        elif isinstance(node, dict) and part in node:
+            node = node[part]
+        else:
+            raise ValueError(f"Unresolvable JSON pointer: {pointer}")
+
+    return node
+
+
+def resolve_local_ref(document, node):
+    """
+    Follows local "#/..." $refs from `node` within `document` until it reaches a node that is not a
+    reference. Returns None when a $ref is external, circular or does not resolve.
+    """
+    seen = set()
+
+    while isinstance(node, dict) and isinstance(node.get("$ref"), str):
+        ref = node["$ref"]
+        if ref in seen or not ref.startswith("#/"):
+            return None
+        seen.add(ref)
+
+        try:
+            node = resolve_pointer(document, ref[1:])
+        except ValueError:
+            return None
+
+    return node
@@ -0,0 +1,89 @@
+import os
+import re
+
+
+# Edits are textual so the generated pom keeps its formatting and namespaces.
+
+def add_dependency(pom_path: str, group_id: str, artifact_id: str, version: str = None, scope: str = None) -> bool:
+    """Adds a dependency to the project's <dependencies>. Returns False if it was already present."""
+    content = _read(pom_path)
+
+    if _declares(content, group_id, artifact_id):
+        return False
+
+    dependency = _element("dependency", group_id, artifact_id, version=version, scope=scope)
+    content = _insert_before_closing(content, "dependencies", dependency, skip_section="dependencyManagement")
+
+    _write(pom_path, content)
+
+    return True
+
+
+def add_plugin(pom_path: str, group_id: str, artifact_id: str, version: str = None) -> bool:
+    """Adds a build plugin to <build><plugins>. Returns False if it was already present."""
+    content = _read(pom_path)
+
+    if _declares(content, group_id, artifact_id):
+        return False
+
+    plugin = _element("plugin", group_id, artifact_id, version=version)
+
+    if "<build>" not in content:
+        content = content.replace("</project>", "  <build>\n    <plugins>\n    </plugins>\n  </build>\n</project>")
+    elif not re.search(r"<build>(?:(?!</build>).)*<plugins>", content, re.S):
+        content = content.replace("<build>", "<build>\n    <plugins>\n    </plugins>", 1)
+
+    content = _insert_before_closing(content, "plugins", plugin, skip_section="pluginManagement")
+
+    _write(pom_path, content)
+
+    return True
+
+
+def _declares(content: str, group_id: str, artifact_id: str) -> bool:
+    pattern = rf"<groupId>\s*{re.escape(group_id)}\s*</groupId>\s*<artifactId>\s*{re.escape(artifact_id)}\s*</artifactId>"
+    return re.search(pattern, content) is not None
+
+
+def _element(tag: str, group_id: str, artifact_id: str, version: str = None, scope: str = None) -> str:
+    lines = [
+        f"<{tag}>",
+        f"  <groupId>{group_id}</groupId>",
+        f"  <artifactId>{artifact_id}</artifactId>",
+    ]
+    if version:
+        lines.append(f"  <version>{version}</version>")
+    if scope:
+        lines.append(f"  <scope>{scope}</scope>")
+    lines.append(f"</{tag}>")
+
+    return lines
+
+
+def _insert_before_closing(content: str, section: str, element_lines: list, skip_section: str) -> str:
+    # Find the first closing tag that is not inside the management section
+    skipped = [m.span() for m in re.finditer(rf"<{skip_section}>.*?</{skip_section}>", content, re.S)]
+
+    for match in re.finditer(rf"^([ \t]*)</{section}>", content, re.M):
+        if any(start <= match.start() < end for start, end in skipped):
+            continue
+
+        indent = match.group(1) + "  "
+        block = "".join(f"{indent}{line}\n" for line in element_lines)
+
+        return content[:match.start()] + block + content[match.start():]
+
+    raise ValueError(f"No <{section}> section found in pom.xml")
+
+
+def _read(pom_path: str) -> str:
+    if not os.path.exists(pom_path):
+        raise FileNotFoundError(f"pom.xml not found at {pom_path}")
+
+    with open(pom_path) as pom_file:
+        return pom_file.read()
+
+
+def _write(pom_path: str, content: str):
+    with open(pom_path, 'w') as pom_file:
+        pom_file.write(content)
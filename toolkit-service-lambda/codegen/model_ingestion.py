@@ -0,0 +1,278 @@
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import requests
+import yaml
+
+from urllib.parse import urljoin, urlparse
+
+from codegen.json_pointer import pointer_parts, resolve_pointer
+from workspace import workspace_root
+
+# libyaml is an order of magnitude faster on large specs when it is available
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+class _BundleDumper(YamlDumper):
+    # Hoisted components are shared by reference; write them out in full rather than as anchors
+    def ignore_aliases(self, data):
+        return True
+
+
+CHUNK_SIZE = 1024 * 1024
+
+SCHEMA_KEYWORDS = ("type", "properties", "allOf", "oneOf", "anyOf", "items", "enum")
+
+
+class OpenApiModelIngestor:
+    """
+    Fetches an OpenAPI model once, bundles its external $refs into a single local document and
+    caches the result keyed by the source URL.
+
+    The cache records the ETag (or, without one, the content hash) of every document that went
+    into the bundle. A cached bundle is reused when all of them are unchanged, which costs one
+    conditional request per document instead of a full download and resolution.
+    """
+
+    def __init__(self, cache_dir: str = None):
+        self.cache_dir = cache_dir or os.getenv("OPENAPI_MODEL_CACHE_DIR", os.path.join(workspace_root(), "openapi-model-cache"))
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self.session = requests.Session()
+
+    def ingest(self, model_location: str, output_path: str) -> str:
+        """Writes the bundled model for `model_location` to `output_path` and returns that path."""
+        bundle_path = self.cached_bundle(model_location)
+
+        if bundle_path:
+            print(f"Using cached OpenAPI model bundle for {model_location}")
+        else:
+            bundle_path = self.build_bundle(model_location)
+
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        shutil.copyfile(bundle_path, output_path)
+
+        return output_path
+
+    def cached_bundle(self, model_location: str):
+        entry = self.read_index(model_location)
+        if not entry or not os.path.exists(entry["bundle"]):
+            return None
+
+        for location, validator in entry["sources"].items():
+            if not self.is_unchanged(location, validator):
+                return None
+
+        return entry["bundle"]
+
+    def build_bundle(self, model_location: str) -> str:
+        bundler = _Bundler(self)
+        spec = bundler.bundle(model_location)
+
+        content = yaml.dump(spec, Dumper=_BundleDumper, sort_keys=False, allow_unicode=True)
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+        bundle_path = os.path.join(self.cache_dir, f"{digest}.yaml")
+        self.write_atomic(bundle_path, content)
+
+        self.write_index(model_location, {"bundle": bundle_path, "sources": bundler.validators})
+        print(f"Bundled {len(bundler.validators)} OpenAPI document(s) from {model_location} into {bundle_path}")
+
+        return bundle_path
+
+    def fetch(self, location: str):
+        """Streams a document to disk, returning its parsed content and cache validator."""
+        digest = hashlib.sha256()
+
+        with tempfile.TemporaryFile(dir=self.cache_dir) as buffer:
+            etag = None
+
+            if is_url(location):
+                with self.session.get(location, stream=True, timeout=60) as response:
+                    response.raise_for_status()
+                    etag = response.headers.get("ETag")
+                    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                        digest.update(chunk)
+                        buffer.write(chunk)
+            else:
+                with open(location, 'rb') as source:
+                    for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+                        digest.update(chunk)
+                        buffer.write(chunk)
+
+            buffer.seek(0)
+            document = yaml.load(buffer, Loader=YamlLoader)
+
+        validator = {"etag": etag} if etag else {"sha256": digest.hexdigest()}
+
+        return document, validator
+
+    def is_unchanged(self, location: str, validator: dict) -> bool:
+        try:
+            if "etag" in validator:
+                response = self.session.get(location, headers={"If-None-Match": validator["etag"]},
+                                            stream=True, timeout=30)
+                response.close()
+                return response.status_code == 304
+
+            return self.content_hash(location) == validator["sha256"]
+        except (requests.RequestException, OSError):
+            return False
+
+    def content_hash(self, location: str) -> str:
+        digest = hashlib.sha256()
+
+        if is_url(location):
+            with self.session.get(location, stream=True, timeout=60) as response:
+                response.raise_for_status()
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    digest.update(chunk)
+        else:
+            with open(location, 'rb') as source:
+                for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+                    digest.update(chunk)
+
+        return digest.hexdigest()
+
+    def index_path(self, model_location: str) -> str:
+        key = hashlib.sha256(model_location.encode("utf-8")).hexdigest()
+
+        return os.path.join(self.cache_dir, f"{key}.index.json")
+
+    def read_index(self, model_location: str):
+        try:
+            with open(self.index_path(model_location)) as index_file:
+                return json.load(index_file)
+        except (OSError, ValueError):
+            return None
+
+    def write_index(self, model_location: str, entry: dict):
+        self.write_atomic(self.index_path(model_location), json.dumps(entry, indent=2))
+
+    def write_atomic(self, path: str, content: str):
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, 'w') as tmp_file:
+            tmp_file.write(content)
+        os.replace(tmp_path, path)
+
+
+class _Bundler:
+    """
+    Rewrites external $refs so the root document is self-contained.
+
+    Targets under /components/<section>/<name> in other documents are hoisted into the same
+    section of the root document, keeping their names so generated classes are unchanged.
+    Whole-file references to schemas are hoisted under the file name; anything else is inlined.
+    """
+
+    def __init__(self, ingestor: OpenApiModelIngestor):
+        self.ingestor = ingestor
+        self.documents = {}
+        self.validators = {}
+        self.hoisted = {}
+        self.components = {}
+        self.root_location = None
+
+    def bundle(self, model_location: str) -> dict:
+        self.root_location = model_location
+        root = self.rewrite(self.load(model_location), model_location, inlining=())
+
+        # Hoisted components are collected separately and merged once the root is rewritten
+        for section, entries in self.components.items():
+            root.setdefault("components", {}).setdefault(section, {}).update(entries)
+
+        return root
+
+    def load(self, location: str):
+        if location not in self.documents:
+            document, validator = self.ingestor.fetch(location)
+            self.documents[location] = document
+            self.validators[location] = validator
+
+        return self.documents[location]
+
+    def rewrite(self, node, base: str, inlining: tuple):
+        if isinstance(node, list):
+            return [self.rewrite(item, base, inlining) for item in node]
+        if not isinstance(node, dict):
+            return node
+
+        if isinstance(node.get("$ref"), str):
+            return self.rewrite_ref(node, base, inlining)
+
+        return {key: self.rewrite(value, base, inlining) for key, value in node.items()}
+
+    def rewrite_ref(self, node: dict, base: str, inlining: tuple):
+        ref = node["$ref"]
+        location, _, pointer = ref.partition("#")
+
+        if not location and base == self.root_location:
+            return node
+
+        target_location = resolve_location(base, location) if location else base
+        parts = pointer_parts(pointer)
+
+        if len(parts) == 3 and parts[0] == "components":
+            section, name = parts[1], parts[2]
+            return {"$ref": self.hoist(target_location, pointer, section, name)}
+
+        target = self.resolve_ref(self.load(target_location), pointer, ref)
+
+        if not parts and isinstance(target, dict) and any(k in target for k in SCHEMA_KEYWORDS):
+            name = os.path.splitext(os.path.basename(urlparse(target_location).path))[0]
+            return {"$ref": self.hoist(target_location, pointer, "schemas", name)}
+
+        key = (target_location, pointer)
+        if key in inlining:
+            raise ValueError(f"Circular $ref that cannot be bundled: {ref} from {base}")
+
+        return self.rewrite(target, target_location, inlining + (key,))
+
+    def hoist(self, location: str, pointer: str, section: str, name: str) -> str:
+        key = (location, pointer or "")
+
+        if key in self.hoisted:
+            return self.hoisted[key]
+
+        if location == self.root_location:
+            self.hoisted[key] = f"#{pointer}"
+            return self.hoisted[key]
+
+        root_components = self.load(self.root_location).get("components", {}).get(section, {})
+        components = self.components.setdefault(section, {})
+
+        unique_name = name
+        suffix = 2
+        while unique_name in root_components or unique_name in components:
+            unique_name = f"{name}{suffix}"
+            suffix += 1
+
+        local_ref = f"#/components/{section}/{unique_name}"
+        self.hoisted[key] = local_ref
+
+        # Register before rewriting so recursive schemas point back at the hoisted copy
+        components[unique_name] = {}
+        target = self.resolve_ref(self.load(location), pointer, f"{location}#{pointer}")
+        components[unique_name] = self.rewrite(target, location, inlining=())
+
+        return local_ref
+
+    def resolve_ref(self, document, pointer: str, ref: str):
+        try:
+            return resolve_pointer(document, pointer)
+        except ValueError:
+            raise ValueError(f"Unresolvable $ref: {ref}")
+
+
+def is_url(location: str) -> bool:
+    return urlparse(location).scheme in ("http", "https")
+
+
+def resolve_location(base: str, location: str) -> str:
+    if is_url(base) or is_url(location):
+        return urljoin(base, location)
+
+    return os.path.normpath(os.path.join(os.path.dirname(base), location))
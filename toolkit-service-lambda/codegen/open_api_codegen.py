@@ -1,7 +1,11 @@
 import subprocess
 import os
 
+from urllib.parse import urlparse
+
 from codegen.codegen import Codegen
+from codegen.model_ingestion import OpenApiModelIngestor
+from workspace import openapi_generator_jar, project_path
 
 
 class OpenApiCodegen(Codegen):
@@ -11,23 +15,29 @@ class OpenApiCodegen(Codegen):
 
         config = service_info["openapi"].get("config", {})
 
-        app_dir = f"/tmp/{project_id}/app"
+        app_dir = project_path(project_id, "app")
         os.makedirs(app_dir, exist_ok=True)
 
-        model_dir = f"/tmp/{project_id}/model"
+        model_dir = project_path(project_id, "model")
         os.makedirs(model_dir, exist_ok=True)
 
-        model_filename = os.path.basename(model_location)
+        # The bundle is always written as YAML
+        model_name = os.path.splitext(os.path.basename(urlparse(model_location).path))[0] or "model"
+        model_filename = f"{model_name}.yaml"
+
+        # Fetch and bundle the model once so the generator reads a pre-resolved local spec
+        model_local_path = OpenApiModelIngestor().ingest(model_location, os.path.join(model_dir, model_filename))
+        self.model_location = model_local_path
 
         command = [
             "java",
             "-jar",
-            "/opt/openapi-generator-cli.jar",
+            openapi_generator_jar(),
             "generate",
-            "-i", model_location,
+            "-i", model_local_path,
             "-g", service_type,
             "-o", app_dir,
-            "--additional-properties", ",".join(f"{k}={v}" for k, v in config.items())
+            "--additional-properties", self.additional_properties(service_info, config)
         ]
 
         try:
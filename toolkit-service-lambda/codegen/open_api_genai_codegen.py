@@ -4,12 +4,20 @@ import json
 import os
 
 from codegen.codegen import Codegen
+from codegen.openapi_validator import OpenApiValidator
+from workspace import openapi_generator_jar, project_path
+
+MODEL_ID = 'anthropic.claude-3-5-sonnet-20240620-v1:0'
+
+# Maximum number of repair prompts sent to Bedrock when the generated model fails validation
+DEFAULT_MAX_REPAIR_ATTEMPTS = 2
 
 # "service": {
 #   "type": "spring",
 #   "name": "my-service-01",
 #   "description": "My new service",
 #   "openapi-gen": {
+#     "maxRepairAttempts": 2,
 #     "prompt": "Create me a shopping cart service with OpenAPI that has operation to create, read, update, and delete carts, and to add and remove CartItems to a cart. Model objects should end in Request or Response.",
 #     "config": {
 #       "basePackage": "com.amazonaws.example",
@@ -29,28 +37,30 @@ class OpenApiGenAiCodegen(Codegen):
 
         config = service_info["openapi-gen"].get("config", {})
 
-        app_dir = f"/tmp/{project_id}/app"
+        app_dir = project_path(project_id, "app")
         os.makedirs(app_dir, exist_ok=True)
 
-        model_dir = f"/tmp/{project_id}/model"
+        model_dir = project_path(project_id, "model")
         os.makedirs(model_dir, exist_ok=True)
 
         model_filename = service_info["name"] + ".yaml"
         model_local_path = os.path.join(model_dir, model_filename)
 
         prompt = service_info["openapi-gen"]["prompt"]
+        max_repair_attempts = int(service_info["openapi-gen"].get("maxRepairAttempts", DEFAULT_MAX_REPAIR_ATTEMPTS))
 
-        self.generate_model_with_bedrock(prompt, model_local_path)
+        self.generate_model_with_bedrock(prompt, model_local_path, max_repair_attempts)
+        self.model_location = model_local_path
 
         command = [
             "java",
             "-jar",
-            "/opt/openapi-generator-cli.jar",
+            openapi_generator_jar(),
             "generate",
             "-i", model_local_path,
             "-g", service_type,
             "-o", app_dir,
-            "--additional-properties", ",".join(f"{k}={v}" for k, v in config.items())
+            "--additional-properties", self.additional_properties(service_info, config)
         ]
 
         try:
@@ -60,19 +70,43 @@ class OpenApiGenAiCodegen(Codegen):
             print(f"Failed to generate project: {e}")
             raise RuntimeError(f"Error running OpenAPI Generator: {e.stderr}")
 
-    def generate_model_with_bedrock(self, prompt: str, output_path: str):
+    def generate_model_with_bedrock(self, prompt: str, output_path: str,
+                                    max_repair_attempts: int = DEFAULT_MAX_REPAIR_ATTEMPTS):
         client = boto3.client("bedrock-runtime")
+        validator = OpenApiValidator()
 
         additional_prompt = "The service should be defined in OpenAPI using YAML format."
         formatted_prompt = f"Human: {prompt} {additional_prompt}\nAssistant:"
 
+        generated_content = self.extract_yaml(self.invoke_model(client, formatted_prompt))
+        errors = validator.validate(generated_content)
+
+        # Validate in-process and ask for targeted fixes, rather than failing later in the generator
+        attempt = 0
+        while errors and attempt < max_repair_attempts:
+            attempt += 1
+            print(f"Generated model has {len(errors)} validation error(s), requesting repair {attempt}/{max_repair_attempts}")
+
+            repair_prompt = self.repair_prompt(generated_content, errors)
+            generated_content = self.extract_yaml(self.invoke_model(client, repair_prompt))
+            errors = validator.validate(generated_content)
+
+        if errors:
+            raise ValueError(f"Generated OpenAPI model is invalid after {attempt} repair attempt(s): " + "; ".join(errors))
+
+        with open(output_path, "w") as model_file:
+            model_file.write(generated_content)
+        print(f"Generated model saved to {output_path}")
+        print(generated_content)
+
+    def invoke_model(self, client, prompt: str) -> str:
         response = client.invoke_model(
-            modelId='anthropic.claude-3-5-sonnet-20240620-v1:0',
+            modelId=MODEL_ID,
             contentType='application/json',
             accept='application/json',
             body=json.dumps({
                 "messages": [
-                    {"role": "user", "content": formatted_prompt}
+                    {"role": "user", "content": prompt}
                 ],
                 "max_tokens": 10000,
                 "anthropic_version": "bedrock-2023-05-31"
@@ -81,16 +115,26 @@ class OpenApiGenAiCodegen(Codegen):
 
         model_response = json.loads(response["body"].read())
         print(model_response)
-        response_text = model_response["content"][0]["text"]
 
-        split_text = response_text.split('```yaml', 1)
+        return model_response["content"][0]["text"]
 
-        if len(split_text) > 1:
-            generated_content = split_text[1].split('```', 1)[0].strip()
-        else:
-            generated_content = ""
+    def extract_yaml(self, response_text: str) -> str:
+        for fence in ('```yaml', '```yml', '```'):
+            split_text = response_text.split(fence, 1)
+            if len(split_text) > 1:
+                return split_text[1].split('```', 1)[0].strip()
 
-        with open(output_path, "w") as model_file:
-            model_file.write(generated_content)
-        print(f"Generated model saved to {output_path}")
-        print(generated_content)
\ No newline at end of file
+        # Fall back to an unfenced document
+        stripped = response_text.strip()
+        return stripped if stripped.startswith("openapi:") else ""
+
+    def repair_prompt(self, content: str, errors: list) -> str:
+        error_list = "\n".join(f"- {error}" for error in errors)
+
+        return (
+            "The following OpenAPI YAML document failed validation.\n\n"
+            f"Errors:\n{error_list}\n\n"
+            f"Document:\n```yaml\n{content}\n```\n\n"
+            "Fix only these errors and keep everything else unchanged. "
+            "Return the complete corrected document in a single ```yaml block."
+        )
@@ -0,0 +1,167 @@
+import re
+import yaml
+
+from codegen.json_pointer import resolve_local_ref
+
+HTTP_METHODS = ("get", "put", "post", "delete", "options", "head", "patch", "trace")
+PARAMETER_LOCATIONS = ("query", "header", "path", "cookie")
+RESPONSE_CODE = re.compile(r"^([1-5][0-9X]{2}|default)$")
+COMPONENT_NAME = re.compile(r"^[a-zA-Z0-9._-]+$")
+PATH_TEMPLATE = re.compile(r"{([^}]+)}")
+
+# Stop collecting after this many errors; a repair prompt does not benefit from hundreds
+MAX_ERRORS = 50
+
+
+class OpenApiValidator:
+    """
+    Structural validator for single-document OpenAPI 3 models.
+
+    It checks what openapi-generator needs to run: required fields, operations with
+    responses, declared path parameters, unique operationIds and resolvable local $refs.
+    It is fast enough to run on every LLM response before starting the generator JVM.
+    """
+
+    def validate(self, content: str) -> list:
+        """Returns a list of human-readable errors; an empty list means the model is valid."""
+        if not content or not content.strip():
+            return ["The response did not contain an OpenAPI document."]
+
+        try:
+            spec = yaml.safe_load(content)
+        except yaml.YAMLError as e:
+            return [f"The document is not valid YAML: {e}"]
+
+        if not isinstance(spec, dict):
+            return ["The document root must be a mapping."]
+
+        errors = []
+        self.check_root(spec, errors)
+        self.check_paths(spec, errors)
+        self.check_components(spec, errors)
+        self.check_refs(spec, spec, "#", errors)
+
+        return errors[:MAX_ERRORS]
+
+    def check_root(self, spec: dict, errors: list):
+        version = str(spec.get("openapi", ""))
+        if not version.startswith("3."):
+            errors.append(f"'openapi' must be a 3.x version string, got '{version}'.")
+
+        info = spec.get("info")
+        if not isinstance(info, dict):
+            errors.append("'info' is required and must be a mapping.")
+        else:
+            for field in ("title", "version"):
+                if not info.get(field):
+                    errors.append(f"'info.{field}' is required.")
+
+    def check_paths(self, spec: dict, errors: list):
+        paths = spec.get("paths")
+        if not isinstance(paths, dict) or not paths:
+            errors.append("'paths' is required and must define at least one path.")
+            return
+
+        operation_ids = {}
+
+        for path, path_item in paths.items():
+            if not str(path).startswith("/"):
+                errors.append(f"Path '{path}' must start with '/'.")
+            if not isinstance(path_item, dict):
+                errors.append(f"Path '{path}' must be a mapping.")
+                continue
+
+            shared = self.parameters(spec, path_item.get("parameters", []), f"paths.{path}", errors)
+            operations = [method for method in HTTP_METHODS if method in path_item]
+            if not operations:
+                errors.append(f"Path '{path}' has no operations.")
+
+            for method in operations:
+                operation = path_item[method]
+                location = f"paths.{path}.{method}"
+
+                if not isinstance(operation, dict):
+                    errors.append(f"'{location}' must be a mapping.")
+                    continue
+
+                operation_id = operation.get("operationId")
+                if operation_id:
+                    if operation_id in operation_ids:
+                        errors.append(f"operationId '{operation_id}' is used by both {operation_ids[operation_id]} and {location}.")
+                    operation_ids[operation_id] = location
+
+                declared = dict(shared)
+                declared.update(self.parameters(spec, operation.get("parameters", []), location, errors))
+
+                for name in PATH_TEMPLATE.findall(str(path)):
+                    parameter = declared.get(("path", name))
+                    if parameter is None:
+                        errors.append(f"'{location}' does not declare path parameter '{name}'.")
+                    elif parameter.get("required") is not True:
+                        errors.append(f"Path parameter '{name}' in '{location}' must have 'required: true'.")
+
+                responses = operation.get("responses")
+                if not isinstance(responses, dict) or not responses:
+                    errors.append(f"'{location}' must define at least one response.")
+                else:
+                    for code in responses:
+                        if not RESPONSE_CODE.match(str(code)):
+                            errors.append(f"Response code '{code}' in '{location}' is not a valid HTTP status code.")
+
+    def parameters(self, spec: dict, parameters, location: str, errors: list) -> dict:
+        declared = {}
+
+        if not isinstance(parameters, list):
+            errors.append(f"'{location}.parameters' must be a list.")
+            return declared
+
+        for parameter in parameters:
+            parameter = self.resolve(spec, parameter)
+            if not isinstance(parameter, dict):
+                errors.append(f"A parameter in '{location}' is not a mapping or has an unresolvable $ref.")
+                continue
+
+            name, parameter_in = parameter.get("name"), parameter.get("in")
+            if not name or parameter_in not in PARAMETER_LOCATIONS:
+                errors.append(f"Parameters in '{location}' need a 'name' and 'in' (one of {', '.join(PARAMETER_LOCATIONS)}).")
+                continue
+            if "schema" not in parameter and "content" not in parameter:
+                errors.append(f"Parameter '{name}' in '{location}' needs a 'schema'.")
+
+            declared[(parameter_in, name)] = parameter
+
+        return declared
+
+    def check_components(self, spec: dict, errors: list):
+        components = spec.get("components", {})
+        if not isinstance(components, dict):
+            errors.append("'components' must be a mapping.")
+            return
+
+        for section, entries in components.items():
+            if not isinstance(entries, dict):
+                errors.append(f"'components.{section}' must be a mapping.")
+                continue
+            for name in entries:
+                if not COMPONENT_NAME.match(str(name)):
+                    errors.append(f"Component name '{section}.{name}' may only contain letters, digits, '.', '_' and '-'.")
+
+    def check_refs(self, spec: dict, node, location: str, errors: list):
+        if len(errors) >= MAX_ERRORS:
+            return
+
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str):
+                if not ref.startswith("#/"):
+                    errors.append(f"$ref '{ref}' at '{location}' must point into this document (#/...).")
+                elif self.resolve(spec, node) is None:
+                    errors.append(f"$ref '{ref}' at '{location}' does not resolve.")
+            for key, value in node.items():
+                self.check_refs(spec, value, f"{location}/{key}", errors)
+        elif isinstance(node, list):
+            for index, value in enumerate(node):
+                self.check_refs(spec, value, f"{location}/{index}", errors)
+
+    def resolve(self, spec: dict, node):
+        return resolve_local_ref(spec, node)
@@ -0,0 +1,199 @@
+import os
+import shutil
+import hashlib
+
+from fnmatch import fnmatch
+
+from workspace import project_path
+
+# Files openapi-generator emits that the service build and runtime never use. Patterns are
+# relative to the generated app directory; a trailing "/" removes the whole directory.
+COMMON_PATTERNS = [
+    ".openapi-generator/",
+    ".openapi-generator-ignore",
+    ".travis.yml",
+    ".gitlab-ci.yml",
+    "git_push.sh",
+    "docs/",
+]
+
+PRUNE_PROFILES = {
+    "minimal": {
+        "*": [".openapi-generator/", ".openapi-generator-ignore"],
+    },
+    "standard": {
+        "*": COMMON_PATTERNS + ["README.md"],
+        # The buildspec and Dockerfiles use Maven directly, so the wrapper is not needed
+        "spring": [".mvn/", "mvnw", "mvnw.cmd"],
+        "kotlin-spring": [".mvn/", "mvnw", "mvnw.cmd", "gradle/wrapper/", "gradlew", "gradlew.bat"],
+        "python-fastapi": [".flake8", "tox.ini"],
+        "nodejs-express-server": [".eslintrc.json"],
+    },
+    "aggressive": {
+        "*": COMMON_PATTERNS + ["README.md", "*.md"],
+        "spring": [".mvn/", "mvnw", "mvnw.cmd", "src/test/"],
+        "kotlin-spring": [".mvn/", "mvnw", "mvnw.cmd", "gradle/wrapper/", "gradlew", "gradlew.bat", "src/test/"],
+        "python-fastapi": [".flake8", "tox.ini", "tests/"],
+        # go-server does not read api/openapi.yaml at runtime; nodejs-express-server does, so it is kept
+        "go-server": ["api/"],
+        "nodejs-express-server": [".eslintrc.json", "tests/"],
+    },
+}
+
+DEFAULT_PROFILE = "standard"
+
+# Duplicates smaller than this are not worth a symlink
+MIN_DEDUPE_BYTES = 1024
+
+
+class OutputPruner:
+    """
+    Removes generator boilerplate from the generated project before it is committed.
+
+    Configured through the optional "prune" block of the service payload:
+        "prune": {"profile": "standard", "exclude": ["extra/*.txt"], "keep": ["README.md"], "dedupe": "report"}
+
+    "profile" is one of minimal, standard (default), aggressive or none. "dedupe" reports
+    identical files ("report", the default) or replaces repeats with relative symlinks ("symlink").
+    """
+
+    def __init__(self, config: dict = None):
+        config = config or {}
+
+        self.profile = config.get("profile", DEFAULT_PROFILE)
+        if self.profile != "none" and self.profile not in PRUNE_PROFILES:
+            raise ValueError(f"Unsupported prune profile '{self.profile}', use one of: "
+                             f"{', '.join(sorted(PRUNE_PROFILES))}, none")
+
+        self.dedupe = config.get("dedupe", "report")
+        if self.dedupe not in ("report", "symlink", "off"):
+            raise ValueError(f"Unsupported prune.dedupe mode '{self.dedupe}', use one of: report, symlink, off")
+
+        self.extra_patterns = list(config.get("exclude", []))
+        self.keep_patterns = list(config.get("keep", []))
+
+    def patterns(self, service_type: str) -> list:
+        if self.profile == "none":
+            return list(self.extra_patterns)
+
+        profile = PRUNE_PROFILES[self.profile]
+
+        return profile.get("*", []) + profile.get(service_type, []) + self.extra_patterns
+
+    def prune(self, project_id: str, service_type: str) -> dict:
+        app_dir = project_path(project_id, "app")
+
+        files_before, bytes_before = self.measure(app_dir)
+
+        removed = self.remove_matching(app_dir, self.patterns(service_type))
+        duplicates = self.find_duplicates(app_dir) if self.dedupe != "off" else []
+
+        if self.dedupe == "symlink":
+            self.link_duplicates(app_dir, duplicates)
+
+        files_after, bytes_after = self.measure(app_dir)
+
+        report = {
+            "profile": self.profile,
+            "removed": len(removed),
+            "filesBefore": files_before,
+            "filesAfter": files_after,
+            "bytesBefore": bytes_before,
+            "bytesAfter": bytes_after,
+            "duplicateGroups": len(duplicates),
+            "duplicateBytes": sum(size * (len(paths) - 1) for size, paths in duplicates),
+        }
+
+        print(f"Pruned generated output in {app_dir}: {files_before} -> {files_after} files, "
+              f"{bytes_before} -> {bytes_after} bytes ({report['duplicateGroups']} duplicate group(s), "
+              f"{report['duplicateBytes']} duplicate bytes)")
+
+        return report
+
+    def remove_matching(self, app_dir: str, patterns: list) -> list:
+        removed = []
+
+        for root, dirs, files in os.walk(app_dir, topdown=True):
+            rel_root = os.path.relpath(root, app_dir)
+            rel_root = "" if rel_root == "." else rel_root.replace(os.sep, "/") + "/"
+
+            for name in list(dirs):
+                rel_path = rel_root + name + "/"
+                if self.matches(rel_path, patterns) and not self.is_kept(rel_path):
+                    shutil.rmtree(os.path.join(root, name))
+                    dirs.remove(name)
+                    removed.append(rel_path)
+
+            for name in files:
+                rel_path = rel_root + name
+                if self.matches(rel_path, patterns) and not self.is_kept(rel_path):
+                    os.remove(os.path.join(root, name))
+                    removed.append(rel_path)
+
+        return removed
+
+    def matches(self, rel_path: str, patterns: list) -> bool:
+        for pattern in patterns:
+            if pattern.endswith("/"):
+                if rel_path.endswith("/") and fnmatch(rel_path, pattern):
+                    return True
+            elif not rel_path.endswith("/") and fnmatch(rel_path, pattern):
+                return True
+
+        return False
+
+    def is_kept(self, rel_path: str) -> bool:
+        return any(fnmatch(rel_path.rstrip("/"), pattern.rstrip("/")) for pattern in self.keep_patterns)
+
+    def find_duplicates(self, app_dir: str) -> list:
+        by_size = {}
+
+        for root, _, files in os.walk(app_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                if os.path.islink(path):
+                    continue
+                size = os.path.getsize(path)
+                if size >= MIN_DEDUPE_BYTES:
+                    by_size.setdefault(size, []).append(path)
+
+        # Only hash files whose size collides with another file
+        duplicates = []
+        for size, paths in by_size.items():
+            if len(paths) < 2:
+                continue
+
+            by_hash = {}
+            for path in paths:
+                by_hash.setdefault(self.file_hash(path), []).append(path)
+
+            duplicates.extend((size, sorted(group)) for group in by_hash.values() if len(group) > 1)
+
+        return duplicates
+
+    def link_duplicates(self, app_dir: str, duplicates: list):
+        for _, paths in duplicates:
+            original = paths[0]
+            for duplicate in paths[1:]:
+                os.remove(duplicate)
+                os.symlink(os.path.relpath(original, os.path.dirname(duplicate)), duplicate)
+
+    def measure(self, app_dir: str):
+        files, total_bytes = 0, 0
+
+        for root, _, names in os.walk(app_dir):
+            for name in names:
+                path = os.path.join(root, name)
+                files += 1
+                total_bytes += os.lstat(path).st_size
+
+        return files, total_bytes
+
+    def file_hash(self, path: str) -> str:
+        digest = hashlib.sha256()
+
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+
+        return digest.hexdigest()
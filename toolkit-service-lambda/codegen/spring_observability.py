@@ -0,0 +1,77 @@
+import os
+
+from codegen import maven_pom
+from workspace import project_path
+
+# Spring Boot 3 manages all versions below and auto-configures OTLP export for them.
+OBSERVABILITY_DEPENDENCIES = [
+    ("org.springframework.boot", "spring-boot-starter-actuator"),
+    ("io.micrometer", "micrometer-registry-otlp"),
+    ("io.micrometer", "micrometer-tracing-bridge-otel"),
+    ("io.opentelemetry", "opentelemetry-exporter-otlp"),
+]
+
+SUPPORTED_SERVICE_TYPES = ("spring", "kotlin-spring")
+
+# The ADOT collector runs as a sidecar in the same task, so it is reachable on localhost.
+COLLECTOR_ENDPOINT = "http://localhost:4318"
+
+
+def observability_config(service_info: dict) -> dict:
+    """Returns the "observability" block of the service payload, or an empty dict when disabled."""
+    config = service_info.get("observability") or {}
+
+    if config is True:
+        config = {"enabled": True}
+
+    return config if config.get("enabled") else {}
+
+
+class SpringObservabilityCustomizer:
+    """
+    Adds Micrometer metrics and OpenTelemetry tracing to a generated Spring Boot 3 project.
+
+    HTTP server timings are published with client-side percentiles so latency percentiles are
+    available in CloudWatch without histogram post-processing.
+    """
+
+    def __init__(self, config: dict, service_type: str):
+        if service_type not in SUPPORTED_SERVICE_TYPES:
+            raise ValueError(f"Observability is not supported for project type: {service_type}")
+
+        self.sampling_probability = float(config.get("samplingProbability", 0.1))
+
+        if not 0.0 <= self.sampling_probability <= 1.0:
+            raise ValueError(f"observability.samplingProbability must be between 0 and 1, got {self.sampling_probability}")
+
+    def customize(self, project_id: str, service_info: dict):
+        app_dir = project_path(project_id, "app")
+
+        pom_path = os.path.join(app_dir, "pom.xml")
+        for group_id, artifact_id in OBSERVABILITY_DEPENDENCIES:
+            if maven_pom.add_dependency(pom_path, group_id, artifact_id):
+                print(f"Added {group_id}:{artifact_id} to {pom_path}")
+
+        self.write_properties(app_dir, service_info["name"])
+
+    def write_properties(self, app_dir: str, service_name: str):
+        resources_dir = os.path.join(app_dir, "src", "main", "resources")
+        os.makedirs(resources_dir, exist_ok=True)
+
+        properties_path = os.path.join(resources_dir, "application.properties")
+
+        properties = f"""
+# Observability (added by the Industry Toolkit)
+management.endpoints.web.exposure.include=health,info,metrics
+management.opentelemetry.resource-attributes.service.name={service_name}
+management.metrics.distribution.percentiles.http.server.requests=0.5,0.9,0.95,0.99
+management.otlp.metrics.export.url={COLLECTOR_ENDPOINT}/v1/metrics
+management.otlp.metrics.export.step=60s
+management.otlp.tracing.endpoint={COLLECTOR_ENDPOINT}/v1/traces
+management.tracing.sampling.probability={self.sampling_probability}
+"""
+
+        with open(properties_path, 'a') as properties_file:
+            properties_file.write(properties)
+
+        print(f"Observability properties written to {properties_path}")
@@ -2,6 +2,8 @@ import os
 
 from abc import ABC, abstractmethod
 
+from workspace import project_path
+
 
 class DockerfileGenerator(ABC):
 
@@ -10,7 +12,7 @@ class DockerfileGenerator(ABC):
         pass
 
     def write_dockerfile(self, project_id, dockerfile_content: str):
-        project_dir = f"/tmp/{project_id}/app"
+        project_dir = project_path(project_id, "app")
         os.makedirs(project_dir, exist_ok=True)
 
         dockerfile_path = os.path.join(project_dir, "Dockerfile")
@@ -0,0 +1,35 @@
+from docker.dockerfile_generator import DockerfileGenerator
+
+
+class GoServerDockerfileGenerator(DockerfileGenerator):
+
+    def generate_dockerfile(self, project_id: str) -> str:
+        build_image = 'public.ecr.aws/docker/library/golang:1.22'
+        base_image = 'gcr.io/distroless/static-debian12:nonroot'
+
+        dockerfile_content = f"""
+# syntax=docker/dockerfile:1
+FROM {build_image} AS build
+
+WORKDIR /src
+
+# Dependencies change less often than sources, so they get their own layer
+COPY go.mod go.sum* ./
+RUN --mount=type=cache,target=/go/pkg/mod \\
+    go mod download
+
+COPY . .
+RUN --mount=type=cache,target=/go/pkg/mod \\
+    --mount=type=cache,target=/root/.cache/go-build \\
+    CGO_ENABLED=0 go build -trimpath -ldflags="-s -w" -o /out/server .
+
+FROM {base_image}
+
+COPY --from=build /out/server /app/server
+
+EXPOSE 8080
+
+ENTRYPOINT ["/app/server"]
+"""
+
+        return self.write_dockerfile(project_id, dockerfile_content.strip())
@@ -0,0 +1,35 @@
+from docker.dockerfile_generator import DockerfileGenerator
+
+
+class KotlinSpringDockerfileGenerator(DockerfileGenerator):
+
+    def generate_dockerfile(self, project_id: str) -> str:
+        build_image = 'public.ecr.aws/docker/library/maven:3.9-amazoncorretto-17'
+        base_image = 'gcr.io/distroless/java17-debian12:nonroot'
+
+        dockerfile_content = f"""
+# syntax=docker/dockerfile:1
+FROM {build_image} AS build
+
+WORKDIR /build
+
+# Dependencies change less often than sources, so they get their own layer
+COPY pom.xml .
+RUN --mount=type=cache,target=/root/.m2 \\
+    mvn -B -q dependency:go-offline
+
+COPY src ./src
+RUN --mount=type=cache,target=/root/.m2 \\
+    mvn -B -q package -DskipTests && cp target/*.jar /build/app.jar
+
+FROM {base_image}
+
+WORKDIR /app
+COPY --from=build /build/app.jar /app/app.jar
+
+EXPOSE 8080
+
+ENTRYPOINT ["java", "-XX:MaxRAMPercentage=75", "-jar", "/app/app.jar"]
+"""
+
+        return self.write_dockerfile(project_id, dockerfile_content.strip())
@@ -0,0 +1,35 @@
+from docker.dockerfile_generator import DockerfileGenerator
+
+
+class NodeExpressDockerfileGenerator(DockerfileGenerator):
+
+    def generate_dockerfile(self, project_id: str) -> str:
+        build_image = 'public.ecr.aws/docker/library/node:20-slim'
+        base_image = 'gcr.io/distroless/nodejs20-debian12:nonroot'
+
+        dockerfile_content = f"""
+# syntax=docker/dockerfile:1
+FROM {build_image} AS build
+
+WORKDIR /app
+
+# Dependencies change less often than sources, so they get their own layer
+COPY package*.json ./
+RUN --mount=type=cache,target=/root/.npm \\
+    npm install --omit=dev --no-audit --no-fund
+
+COPY . .
+
+FROM {base_image}
+
+ENV NODE_ENV=production
+
+WORKDIR /app
+COPY --from=build /app /app
+
+EXPOSE 8080
+
+CMD ["index.js"]
+"""
+
+        return self.write_dockerfile(project_id, dockerfile_content.strip())
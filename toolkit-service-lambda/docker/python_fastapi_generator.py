@@ -0,0 +1,38 @@
+from docker.dockerfile_generator import DockerfileGenerator
+
+
+class PythonFastApiDockerfileGenerator(DockerfileGenerator):
+
+    def generate_dockerfile(self, project_id: str) -> str:
+        base_image = 'public.ecr.aws/docker/library/python:3.12-slim'
+
+        dockerfile_content = f"""
+# syntax=docker/dockerfile:1
+FROM {base_image} AS build
+
+WORKDIR /build
+
+# Dependencies change less often than sources, so they get their own layer
+COPY requirements.txt .
+RUN --mount=type=cache,target=/root/.cache/pip \\
+    pip install --prefix=/install -r requirements.txt uvicorn
+
+FROM {base_image}
+
+ENV PYTHONDONTWRITEBYTECODE=1 \\
+    PYTHONUNBUFFERED=1 \\
+    PYTHONPATH=/app/src
+
+COPY --from=build /install /usr/local
+
+WORKDIR /app
+COPY src ./src
+
+USER nobody
+
+EXPOSE 8080
+
+ENTRYPOINT ["python", "-m", "uvicorn", "openapi_server.main:app", "--host", "0.0.0.0", "--port", "8080"]
+"""
+
+        return self.write_dockerfile(project_id, dockerfile_content.strip())
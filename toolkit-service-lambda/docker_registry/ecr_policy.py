@@ -0,0 +1,87 @@
+import json
+
+
+# Defaults applied when the payload has no "registry" block, or omits a field.
+ECR_DEFAULTS = {
+    "keepTaggedImages": 20,
+    "expireUntaggedAfterDays": 7,
+    "scanOnPush": True,
+    "tagImmutability": False,
+}
+
+MAX_IMAGES = 10000
+
+
+def ecr_config(ecr: dict) -> dict:
+    """
+    Validates the "ecr" block of the registry payload and returns it merged with defaults.
+
+    Example:
+        "registry": {
+            "ecr": {
+                "keepTaggedImages": 30,
+                "expireUntaggedAfterDays": 3,
+                "scanOnPush": true,
+                "tagImmutability": true
+            }
+        }
+
+    A keepTaggedImages or expireUntaggedAfterDays of false or 0 disables that lifecycle rule.
+    """
+    ecr = dict(ecr or {})
+
+    unknown = set(ecr) - set(ECR_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unsupported registry.ecr fields: {', '.join(sorted(unknown))}")
+
+    config = dict(ECR_DEFAULTS)
+    config.update(ecr)
+
+    for key in ("keepTaggedImages", "expireUntaggedAfterDays"):
+        value = config[key]
+        if value is False or value is None:
+            config[key] = 0
+        elif not isinstance(value, int) or isinstance(value, bool) or not 0 <= value <= MAX_IMAGES:
+            raise ValueError(f"registry.ecr.{key} must be an integer between 0 and {MAX_IMAGES}, got {value!r}")
+
+    for key in ("scanOnPush", "tagImmutability"):
+        if not isinstance(config[key], bool):
+            raise ValueError(f"registry.ecr.{key} must be true or false, got {config[key]!r}")
+
+    return config
+
+
+def lifecycle_policy(config: dict):
+    """Returns the lifecycle policy document for the config, or None when both rules are disabled."""
+    rules = []
+
+    if config["expireUntaggedAfterDays"]:
+        rules.append({
+            "rulePriority": 1,
+            "description": f"Expire untagged images after {config['expireUntaggedAfterDays']} days",
+            "selection": {
+                "tagStatus": "untagged",
+                "countType": "sinceImagePushed",
+                "countUnit": "days",
+                "countNumber": config["expireUntaggedAfterDays"],
+            },
+            "action": {"type": "expire"},
+        })
+
+    if config["keepTaggedImages"]:
+        rules.append({
+            "rulePriority": 2,
+            "description": f"Keep the last {config['keepTaggedImages']} tagged images",
+            "selection": {
+                "tagStatus": "tagged",
+                "tagPatternList": ["*"],
+                "countType": "imageCountMoreThan",
+                "countNumber": config["keepTaggedImages"],
+            },
+            "action": {"type": "expire"},
+        })
+
+    if not rules:
+        return None
+
+    return json.dumps({"rules": rules})
@@ -3,33 +3,81 @@ import os
 
 from botocore.exceptions import NoCredentialsError, PartialCredentialsError
 
-from docker_registry.registry import Registry
+from docker_registry.ecr_policy import ecr_config, lifecycle_policy
+from docker_registry.registry import Registry, RepositoryNotFoundError
 
 
 class EcrRegistry(Registry):
 
-    def __init__(self):
-        self.region = os.environ.get("AWS_REGION")
-        self.ecr_client = boto3.client("ecr", region_name=self.region)
+    def __init__(self, session: boto3.session.Session = None, region: str = None):
+        # Without a session or region, the repository is created in the Lambda's own account and region
+        self.region = region or os.environ.get("AWS_REGION")
+        self.ecr_client = (session or boto3).client("ecr", region_name=self.region)
 
-    def create_repository(self, repository_name: str):
-        try:
-            ecr_client = boto3.client("ecr", region_name=self.region)
+    def create_repository(self, repository_name: str, config: dict = None):
+        config = ecr_config(config)
+
+        ecr_client = self.ecr_client
 
+        try:
             response = ecr_client.create_repository(
-                repositoryName=repository_name
+                repositoryName=repository_name,
+                imageTagMutability="IMMUTABLE" if config["tagImmutability"] else "MUTABLE",
+                imageScanningConfiguration={"scanOnPush": config["scanOnPush"]}
             )
 
             repository = response["repository"]
             print(f"Repository {repository_name} created successfully!")
             print(f"Repository URI: {repository['repositoryUri']}")
+
+            self.put_lifecycle_policy(repository_name, config)
             return repository
 
         except ecr_client.exceptions.RepositoryAlreadyExistsException:
             print(f"Repository '{repository_name}' already exists.")
+            self.apply_policies(repository_name, config)
         except NoCredentialsError:
             print("AWS credentials not found. Ensure they are configured.")
         except PartialCredentialsError:
             print("Incomplete AWS credentials configuration.")
         except Exception as e:
             print(f"An error occurred: {str(e)}")
+
+    def apply_policies(self, repository_name: str, config: dict = None):
+        """Brings an existing repository's tag mutability, scanning and lifecycle policy in line with `config`."""
+        config = ecr_config(config)
+
+        try:
+            self.ecr_client.put_image_tag_mutability(
+                repositoryName=repository_name,
+                imageTagMutability="IMMUTABLE" if config["tagImmutability"] else "MUTABLE"
+            )
+            self.ecr_client.put_image_scanning_configuration(
+                repositoryName=repository_name,
+                imageScanningConfiguration={"scanOnPush": config["scanOnPush"]}
+            )
+            self.put_lifecycle_policy(repository_name, config)
+        except self.ecr_client.exceptions.RepositoryNotFoundException:
+            raise RepositoryNotFoundError(f"Repository '{repository_name}' does not exist.")
+
+        print(f"Policies applied to repository {repository_name}.")
+
+    def put_lifecycle_policy(self, repository_name: str, config: dict):
+        policy = lifecycle_policy(config)
+
+        if policy is None:
+            try:
+                self.ecr_client.delete_lifecycle_policy(repositoryName=repository_name)
+            except self.ecr_client.exceptions.LifecyclePolicyNotFoundException:
+                pass
+            return
+
+        self.ecr_client.put_lifecycle_policy(repositoryName=repository_name, lifecyclePolicyText=policy)
+
+    def delete_repository(self, repository_name: str):
+        try:
+            # force also deletes the images, which would otherwise block the deletion
+            self.ecr_client.delete_repository(repositoryName=repository_name, force=True)
+            print(f"Repository {repository_name} deleted.")
+        except self.ecr_client.exceptions.RepositoryNotFoundException:
+            print(f"Repository '{repository_name}' does not exist.")
@@ -1,13 +1,39 @@
 from abc import ABC, abstractmethod
 
 
+class RepositoryNotFoundError(Exception):
+    """Raised when an operation on an existing repository finds no repository."""
+    pass
+
+
 class Registry(ABC):
 
     @abstractmethod
-    def create_repository(self, repository_name: str):
+    def create_repository(self, repository_name: str, config: dict = None):
         """
         Create a repository in the docker_registry.
 
         :param repository_name: Name of the repository to create.
+        :param config: Registry-specific repository settings, such as lifecycle rules.
+        """
+        pass
+
+    @abstractmethod
+    def apply_policies(self, repository_name: str, config: dict = None):
+        """
+        Apply registry-specific settings to an existing repository.
+
+        :param repository_name: Name of the repository to update.
+        :param config: Registry-specific repository settings, such as lifecycle rules.
+        :raises RepositoryNotFoundError: If the repository does not exist.
+        """
+        pass
+
+    @abstractmethod
+    def delete_repository(self, repository_name: str):
+        """
+        Delete a repository and the images in it. Deleting a missing repository is not an error.
+
+        :param repository_name: Name of the repository to delete.
         """
         pass
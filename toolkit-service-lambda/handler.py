@@ -1,96 +1,298 @@
-import boto3
 import json
+import math
 import uuid
 import os
+import time
+import shutil
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from boto3.dynamodb.types import TypeDeserializer
 from aws_lambda_powertools.logging import Logger
 
-from codebuild.java_maven_buildspec_generator import JavaMavenBuildspecGenerator
+from build_strategies.registry import (
+    get_build_mode,
+    get_build_strategy,
+    get_buildspec_generator,
+    get_dockerfile_generator,
+)
 from codegen.open_api_codegen import OpenApiCodegen
 from codegen.open_api_genai_codegen import OpenApiGenAiCodegen
-from docker.java_spring_boot_generator import JavaSpringBootDockerfileGenerator
-from docker_registry.ecr_registry import EcrRegistry
+from codegen.output_pruner import OutputPruner
+from codegen.spring_observability import SpringObservabilityCustomizer, observability_config
+from docker_registry.ecr_policy import ecr_config
+from infra.cdk_infra_generator import CdkInfraGenerator
 from infra.cloudformation_infra_generator import CloudFormationInfraGenerator
-from pipeline.aws_code_pipeline import AwsCodePipeline
-from source_repo.github_source_repo import GitHubSourceRepo
+from infra.terraform_infra_generator import TerraformInfraGenerator
+from lifecycle.job_status import FAILED, PENDING, JobStatus, job_view, start_async_bootstrap, wait_for_update
+from lifecycle.registry_policies import RegistryPolicyUpdater
+from lifecycle.teardown import ServiceTeardown
+from loadtest.scenario_generator import LoadTestScenarioGenerator, load_test_config
+from providers.providers import get_providers
+from stage_timer import StageTimer
+from targets.deployment_targets import deployment_targets
+from workspace import project_path
 
 logger = Logger()
 
-dynamodb = boto3.resource("dynamodb")
-services_table_name = os.getenv("SERVICES_TABLE_NAME", "ServicesTable")
-services_table = dynamodb.Table(services_table_name)
 
+def process_service_creation(payload, providers=None, timer: StageTimer = None, project_id: str = None):
+    """
+    Processes the input payload to create a new service.
 
-def process_service_creation(payload):
-    """Processes the input payload to create a new service."""
+    `providers` supplies the registry, pipeline, SCM and services table implementations; by default
+    they are selected with BOOTSTRAP_PROVIDERS. `timer` collects the duration of each stage.
+    `project_id` is given when the bootstrap was accepted by the API, which created its record; direct
+    invocations get a record only once their payload is valid.
+    The progress of each stage, and any error, is recorded in the record's "job" attribute. When an
+    earlier attempt under the same id stored the generated project, it is restored rather than regenerated.
+    """
     logger.info(f"Received input payload: {payload}")
 
-    service_info = payload["service"]
+    providers = providers or get_providers()
+    timer = timer or StageTimer()
+
+    status = JobStatus(providers.services_table(), project_id or str(uuid.uuid4()))
+
+    # Invalid payloads are rejected before a job record is written for them
+    try:
+        with timer.stage("validate"):
+            request = validate_payload(payload)
+    except Exception as e:
+        # The API wrote the record of a bootstrap it accepted, so it is failed rather than left PENDING
+        if project_id is not None:
+            status.resume()
+            status.fail(e)
+        raise
+
+    if project_id is None:
+        status.accept(payload.get("service") or {})
+        previous = {}
+    else:
+        previous = status.resume()
+    status.start()
+
+    timer.listeners.append(status)
+
+    try:
+        return create_service(payload, request, providers, timer, status, previous.get("checkpoint"))
+    except Exception as e:
+        status.fail(e)
+        raise
+    finally:
+        timer.listeners.remove(status)
+
+
+def validate_payload(payload) -> dict:
+    """
+    Validates a bootstrap payload without creating anything, returning what create_service needs
+    from it. Raises ValueError for invalid payloads.
+    """
+    service_info = payload.get("service")
+    if not isinstance(service_info, dict) or not service_info.get("name") or not service_info.get("type"):
+        raise ValueError("The payload needs a service block with a name and type")
+
     service_type = service_info["type"]
     scm_type, scm_info = next(iter(payload.get("scm", {}).items()), (None, {}))
     iac_type, iac_info = next(iter(payload.get("iac", {}).items()), (None, {}))
+    registry_type, registry_info = next(iter(payload.get("registry", {}).items()), ("ecr", {}))
+
+    build_mode = get_build_mode(service_info)
+    build_strategy = get_build_strategy(service_type, build_mode)
+
+    if iac_type == "cloudformation":
+        infra_generator = CloudFormationInfraGenerator()
+    elif iac_type == "cdk":
+        infra_generator = CdkInfraGenerator()
+    elif iac_type == "terraform":
+        infra_generator = TerraformInfraGenerator()
+    else:
+        raise ValueError(f"Unsupported iac_type type: {iac_type}")
+
+    observability = observability_config(service_info)
+    observability_customizer = SpringObservabilityCustomizer(observability, service_type) if observability else None
+
+    def build_infra_params(iac: dict) -> dict:
+        return infra_parameters(iac, build_strategy, observability, infra_generator)
+
+    infra_params = build_infra_params(iac_info)
+
+    # Each account and region gets its own infrastructure files, registry and pipeline
+    targets = deployment_targets(payload.get("targets"), iac_info)
+    target_infra_params = {target["id"]: build_infra_params(target["iac"]) for target in targets}
+
+    load_test = load_test_config(service_info)
+    if load_test and targets:
+        raise ValueError("loadTest is not supported with targets: its security groups belong to a single VPC")
+
+    pruner = OutputPruner(service_info.get("prune"))
 
-    project_id = str(uuid.uuid4())
+    if registry_type != "ecr":
+        raise ValueError(f"Unsupported registry type: {registry_type}")
+    registry_config = ecr_config(registry_info)
+
+    ttl_hours = (service_info.get("lifecycle") or {}).get("ttlHours")
+    if ttl_hours is not None and (not isinstance(ttl_hours, (int, float)) or ttl_hours <= 0):
+        raise ValueError(f"service.lifecycle.ttlHours must be a positive number, got {ttl_hours!r}")
+
+    return {
+        "service_info": service_info,
+        "service_type": service_type,
+        "scm_type": scm_type,
+        "scm_info": scm_info,
+        "iac_type": iac_type,
+        "iac_info": iac_info,
+        "registry_type": registry_type,
+        "build_mode": build_mode,
+        "infra_generator": infra_generator,
+        "observability_customizer": observability_customizer,
+        "infra_params": infra_params,
+        "targets": targets,
+        "target_infra_params": target_infra_params,
+        "load_test": load_test,
+        "pruner": pruner,
+        "registry_config": registry_config,
+        "ttl_hours": ttl_hours,
+    }
+
+
+def create_service(payload, request: dict, providers, timer: StageTimer, status: JobStatus, checkpoint: dict = None):
+    service_info, service_type = request["service_info"], request["service_type"]
+    scm_type, scm_info = request["scm_type"], request["scm_info"]
+    iac_type, iac_info = request["iac_type"], request["iac_info"]
+    registry_type, registry_config = request["registry_type"], request["registry_config"]
+    build_mode, infra_generator, infra_params = request["build_mode"], request["infra_generator"], request["infra_params"]
+    targets, target_infra_params = request["targets"], request["target_infra_params"]
+    observability_customizer, load_test = request["observability_customizer"], request["load_test"]
+    pruner, ttl_hours = request["pruner"], request["ttl_hours"]
+
+    project_id = status.project_id
     logger.info(f"Creating project with id {project_id}...")
 
-    project_dir = f"/tmp/{project_id}"
-    app_dir = f"{project_dir}/app"
-    os.makedirs(app_dir, exist_ok=True)
+    project_dir = project_path(project_id)
+    app_dir = project_path(project_id, "app")
 
-    # Generate project source code
-    logger.info(f"Creating project type '{service_type}'...")
+    # A retried bootstrap of the same payload restores the project it generated and stored before
+    artifact_store = providers.artifact_store()
+    payload_hash = hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+    if not artifact_store or not checkpoint or checkpoint.get("payloadHash") != payload_hash:
+        checkpoint = None
 
-    if "openapi" in service_info:
-        codegen = OpenApiCodegen()
-    elif "openapi-gen" in service_info:
-        codegen = OpenApiGenAiCodegen()
-    else:
-        raise ValueError(f"Unsupported model type.")
+    # A warm container may still hold the workspace of an earlier attempt
+    shutil.rmtree(project_dir, ignore_errors=True)
 
-    codegen.generate_project(project_id, service_info)
+    if checkpoint:
+        logger.info(f"Restoring project {project_id} from artifact {checkpoint['project']['key']}...")
 
-    # Create Dockerfile
-    logger.info(f"Creating Dockerfile for project type {service_type}...")
+        with timer.stage("restore"):
+            artifact_store.load(checkpoint["project"]["sha256"], project_dir)
 
-    if service_type == "spring":
-        generator = JavaSpringBootDockerfileGenerator()
-        generator.generate_dockerfile(project_id)
+        # Kept with the job, so the project can be restored again if this attempt fails too
+        status.checkpoint(checkpoint)
     else:
-        raise ValueError(f"Unsupported project type: {service_type}")
+        os.makedirs(app_dir, exist_ok=True)
+
+        # Generate project source code
+        logger.info(f"Creating project type '{service_type}'...")
+
+        with timer.stage("codegen"):
+            if "openapi" in service_info:
+                codegen = OpenApiCodegen()
+            elif "openapi-gen" in service_info:
+                codegen = OpenApiGenAiCodegen()
+            else:
+                raise ValueError(f"Unsupported model type.")
+
+            codegen.generate_project(project_id, service_info)
+
+        if observability_customizer:
+            logger.info("Adding metrics and tracing to the generated project...")
+            with timer.stage("observability"):
+                observability_customizer.customize(project_id, service_info)
+
+        # Create Dockerfile
+        logger.info(f"Creating Dockerfile for project type {service_type}...")
+
+        with timer.stage("dockerfile"):
+            generator = get_dockerfile_generator(service_type, build_mode)
+            generator.generate_dockerfile(project_id)
+
+        # Generate IaC code
+        logger.info(f"Creating IaC code for {iac_type}...")
+
+        with timer.stage("infra"):
+            if targets:
+                for target in targets:
+                    infra_generator.generate_infra(project_id, target_infra_params[target["id"]], target["id"])
+            else:
+                infra_generator.generate_infra(project_id, infra_params)
+
+        if load_test:
+            logger.info("Generating load-test scenario from the OpenAPI model...")
+            with timer.stage("loadtest"):
+                LoadTestScenarioGenerator().generate_scenario(project_id, codegen.model_location, load_test)
+
+        # Create AWS CodeBuild buildspec file
+        with timer.stage("buildspec"):
+            buildspec = get_buildspec_generator(service_type, build_mode, providers.session())
+            buildspec.generate_buildspec(project_id, service_info, registry_config)
+
+        # Drop generator boilerplate so the commit, CodeBuild source download and clones stay small
+        with timer.stage("prune"):
+            checkpoint = {"generatedOutput": pruner.prune(project_id, service_type)}
+
+        # Keep the generated project, so a retry can restore it instead of regenerating it
+        if artifact_store:
+            with timer.stage("artifacts"):
+                checkpoint["project"] = artifact_store.save(project_dir)
+            checkpoint["payloadHash"] = payload_hash
+            status.checkpoint(checkpoint)
 
     # Create container registry
     registry_name = service_info["name"]
-    logger.info(f"Creating ECR Registry named {registry_name}...")
 
-    registry = EcrRegistry()
-    registry.create_repository(registry_name)
+    if not targets:
+        logger.info(f"Creating ECR Registry named {registry_name}...")
 
-    # Generate IaC code
-    logger.info(f"Creating IaC code for {iac_type}...")
+        with timer.stage("registry"):
+            registry = providers.registry()
+            registry.create_repository(registry_name, registry_config)
 
-    if iac_type == "cloudformation":
-        infra_generator = CloudFormationInfraGenerator()
-        infra_generator.generate_infra(project_id, iac_info)
+    # The pipeline's source action needs the repo's credentials, so fetch them even when the push is skipped
+    repo = providers.source_repo(scm_type, scm_info)
+
+    # Create SCM repo, unless an earlier attempt already pushed the project
+    if checkpoint.get("committed"):
+        logger.info(f"Project {project_id} was already pushed to {scm_info['repo']}")
     else:
-        raise ValueError(f"Unsupported iac_type type: {iac_type}")
+        logger.info(f"Creating SCM repo type '{scm_type}'...")
 
-    # Create AWS CodeBuild buildspec file
-    buildspec = JavaMavenBuildspecGenerator()
-    buildspec.generate_buildspec(project_id, service_info)
+        with timer.stage("scm"):
+            repo.create_repo()
+            repo.commit(project_dir, "Initial commit")
 
-    # Create SCM repo
-    logger.info(f"Creating SCM repo type '{scm_type}'...")
+        if artifact_store:
+            checkpoint["committed"] = True
+            status.checkpoint(checkpoint)
 
-    if scm_type == "github":
-        repo = GitHubSourceRepo(scm_info)
-        repo.create_repo()
-        repo.commit(project_dir, "Initial commit")
-    else:
-        raise ValueError(f"Unsupported scm_type type: {scm_type}")
+    # Everything teardown needs to find and delete the service's resources
+    resources = {
+        "scm": {"type": scm_type, "repo": scm_info["repo"], "secretKey": scm_info.get("secretKey")},
+    }
 
-    # Create AWS CodePipeline
-    aws_pipeline = AwsCodePipeline()
-    aws_pipeline.create_pipeline(service_info, scm_info)
+    with timer.stage("pipeline"):
+        if targets:
+            # The committed code is shared; every target gets its own registry and pipeline
+            target_results = provision_targets(providers, targets, service_info, scm_info, iac_type, registry_config,
+                                               repo.access_token)
+            resources["targets"] = [result["resources"] for result in target_results]
+        else:
+            # Create AWS CodePipeline
+            aws_pipeline = providers.pipeline()
+            aws_pipeline.create_pipeline(service_info, scm_info, iac_type, iac_info, source_token=repo.access_token)
+
+            resources["registry"] = {"type": registry_type, "name": registry_name}
+            resources["pipeline"] = aws_pipeline.pipeline_resources(service_info, iac_type)
 
     # Write record to DynamoDB
     timestamp = datetime.utcnow().isoformat()
@@ -102,30 +304,236 @@ def process_service_creation(payload):
         "github_repo": scm_info["repo"],
         "created_timestamp": timestamp,
         "updated_timestamp": timestamp,
-        "metadata": {},
+        "metadata": {
+            "generatedOutput": checkpoint["generatedOutput"],
+            "artifacts": {"project": checkpoint["project"]} if "project" in checkpoint else {},
+            "resources": resources,
+            "tags": service_info.get("tags", {}),
+            "stageDurationsMs": timer.durations_ms(),
+        },
+        "job": status.succeed(),
     }
 
+    # Expired records are removed by DynamoDB TTL, and the stream triggers the teardown
+    if ttl_hours:
+        item["expires_at"] = int(time.time() + ttl_hours * 3600)
+
+    if targets:
+        item["targets"] = [{k: v for k, v in result.items() if k != "resources"} for result in target_results]
+
     try:
-        services_table.put_item(Item=item)
+        providers.services_table().put_item(Item=item)
         logger.info(f"Successfully inserted project {project_id} into DynamoDB: {item}")
     except Exception as e:
         logger.error(f"Failed to insert item: {e}")
 
     logger.info(f"Successfully inserted project {project_id} into DynamoDB")
+    logger.info(f"Stage durations for {project_id}:\n{timer.report()}")
 
     return item
 
 
+def infra_parameters(iac: dict, build_strategy: dict, observability: dict, infra_generator) -> dict:
+    """Merges the build mode's infra defaults under the payload's iac block, validating the result."""
+    # Build modes may carry their own defaults (e.g. the native mode's task size)
+    params = dict(build_strategy.get("infra_defaults", {}))
+    params.update(iac)
+    if observability:
+        params["enableObservability"] = True
+
+    # Validate infra parameters before any resources are created
+    infra_generator.normalize_params(params)
+
+    return params
+
+
+def provision_targets(providers, targets: list, service_info: dict, scm_info: dict, iac_type: str,
+                      registry_config: dict, source_token: str = None) -> list:
+    """Creates the registry and pipeline in every target concurrently, returning one result per target."""
+
+    def provision(target: dict) -> dict:
+        registry_name = service_info["name"]
+        result = {
+            "target": target["id"],
+            "account": target["account"],
+            "region": target["region"],
+            # Recorded even when provisioning fails, so teardown can remove what was created
+            "resources": {
+                "target": {k: target[k] for k in ("id", "account", "region", "roleArn")},
+                "registry": {"type": "ecr", "name": registry_name},
+            },
+        }
+
+        try:
+            session = providers.target_session(target)
+
+            logger.info(f"Creating ECR Registry named {registry_name} in {target['id']}...")
+            providers.registry(session, target["region"]).create_repository(registry_name, registry_config)
+
+            aws_pipeline = providers.pipeline(session, target)
+            result["resources"]["pipeline"] = aws_pipeline.pipeline_resources(service_info, iac_type)
+            aws_pipeline.create_pipeline(service_info, scm_info, iac_type, target["iac"], source_token=source_token)
+
+            result["status"] = "CREATED"
+        except Exception as e:
+            logger.error(f"Failed to provision {service_info['name']} in {target['id']}: {e}")
+            result["status"] = "FAILED"
+            result["error"] = str(e)
+
+        return result
+
+    with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+        return list(executor.map(provision, targets))
+
+
+def process_teardown(payload):
+    """Tears down one service by id, or every service matching a filter."""
+    providers = get_providers()
+    services_table = providers.services_table()
+    teardown = ServiceTeardown(services_table, providers)
+
+    if "id" in payload:
+        item = services_table.get_item(Key={"id": payload["id"]}).get("Item")
+        if item is None:
+            raise ValueError(f"Service {payload['id']} not found")
+        return teardown.teardown(item)
+
+    return teardown.teardown_matching(payload.get("filter") or {}, dry_run=payload.get("dryRun", False))
+
+
+def process_registry_policies(payload):
+    """Applies the payload's registry settings to the repositories of existing services."""
+    registry_type, registry_info = next(iter(payload.get("registry", {}).items()), ("ecr", {}))
+    if registry_type != "ecr":
+        raise ValueError(f"Unsupported registry type: {registry_type}")
+
+    providers = get_providers()
+    updater = RegistryPolicyUpdater(providers.services_table(), providers)
+
+    return updater.apply(registry_info, payload.get("filter"), dry_run=payload.get("dryRun", False))
+
+
+def process_expired_services(event):
+    """Tears down services whose records DynamoDB TTL removed; the stream delivers the old image."""
+    deserializer = TypeDeserializer()
+    providers = get_providers()
+    teardown = ServiceTeardown(providers.services_table(), providers)
+
+    results = []
+    for record in event["Records"]:
+        old_image = record["dynamodb"].get("OldImage")
+        if record["eventName"] != "REMOVE" or not old_image:
+            continue
+
+        item = {key: deserializer.deserialize(value) for key, value in old_image.items()}
+        results.append(teardown.teardown(item, delete_record=False))
+
+    # The record is already gone, so fail the batch and let the event source mapping retry it
+    failed = [result["name"] for result in results if result["status"] == "FAILED"]
+    if failed:
+        raise RuntimeError(f"Teardown of expired services failed: {', '.join(failed)}")
+
+    return results
+
+
+def is_stream_event(event) -> bool:
+    records = event.get("Records") or []
+    return bool(records) and records[0].get("eventSource") == "aws:dynamodb"
+
+
+def is_api_event(event) -> bool:
+    return "httpMethod" in event and "requestContext" in event
+
+
+def process_api_request(event, context):
+    """
+    Handles the bootstrapper's REST API:
+
+        POST /services                        accepts a service payload, returns 202 and the service id
+        GET  /services/{id}?since=N&wait=S    returns the bootstrap's job status, waiting up to S seconds
+                                              for a version newer than N
+    """
+    services_table = get_providers().services_table()
+
+    try:
+        if event["httpMethod"] == "POST":
+            payload = json.loads(event.get("body") or "{}")
+
+            # Invalid payloads get a 400, without a job record
+            service_info = validate_payload(payload)["service_info"]
+
+            project_id = str(uuid.uuid4())
+            status = JobStatus(services_table, project_id)
+            status.accept(service_info)
+
+            try:
+                # Invoked by ARN, so the bootstrap runs on the same alias (and provisioned concurrency) as the API
+                start_async_bootstrap(context.invoked_function_arn, project_id, payload)
+            except Exception as e:
+                # Otherwise the record would stay PENDING with nothing running it
+                logger.error(f"Failed to start bootstrap {project_id}: {e}")
+                status.fail(e)
+                return api_response(503, {"id": project_id, "status": FAILED, "message": f"Failed to start the bootstrap: {e}"})
+
+            logger.info(f"Accepted bootstrap of {service_info['name']} as {project_id}")
+            return api_response(202, {"id": project_id, "status": PENDING, "statusPath": f"/services/{project_id}"})
+
+        if event["httpMethod"] == "GET":
+            project_id = event["pathParameters"]["id"]
+            query = event.get("queryStringParameters") or {}
+            since = int(query["since"]) if "since" in query else None
+
+            wait = float(query.get("wait", 0))
+            if not math.isfinite(wait):
+                raise ValueError(f"wait must be a finite number of seconds, got {query['wait']}")
+
+            item = wait_for_update(services_table, project_id, since, wait)
+            if item is None:
+                return api_response(404, {"message": f"Service {project_id} not found"})
+
+            return api_response(200, job_view(item))
+
+        return api_response(405, {"message": f"Unsupported method: {event['httpMethod']}"})
+
+    except ValueError as e:
+        return api_response(400, {"message": str(e)})
+
+
+def api_response(status_code: int, body: dict) -> dict:
+    return {
+        "statusCode": status_code,
+        "headers": {"Content-Type": "application/json"},
+        # Numbers read from DynamoDB are Decimals
+        "body": json.dumps(body, default=lambda value: int(value) if value == int(value) else float(value)),
+    }
+
+
 @logger.inject_lambda_context
 def lambda_handler(event, context):
     """
     AWS Lambda Handler.
-    Expects `event` to contain the payload with service information.
+    Expects `event` to contain the payload with service information, a payload with
+    `"action": "teardown"` or `"action": "apply-registry-policies"`, ServicesTable stream records
+    for expired services, or a request from the bootstrapper API. Bootstraps accepted by the API
+    run in a second, asynchronous invocation with `"action": "bootstrap"`, which Lambda retries on failure.
     """
+    if is_stream_event(event):
+        return process_expired_services(event)
+
+    if is_api_event(event):
+        return process_api_request(event, context)
+
     try:
         logger.info(f"Received event: {json.dumps(event)}")
 
-        result = process_service_creation(event)
+        if event.get("action") == "teardown":
+            result = process_teardown(event)
+        elif event.get("action") == "apply-registry-policies":
+            result = process_registry_policies(event)
+        elif event.get("action") == "bootstrap":
+            result = process_service_creation(event["payload"], project_id=event["id"])
+        else:
+            result = process_service_creation(event)
 
         return {
             "statusCode": 200,
@@ -133,8 +541,16 @@ def lambda_handler(event, context):
         }
 
     except Exception as e:
-        logger.error(f"Error processing service creation: {e}")
+        logger.error(f"Error processing {event.get('action', 'service creation')}: {e}")
+
+        # Raised so Lambda retries the asynchronous invocation; invalid payloads would only fail again
+        if event.get("action") == "bootstrap" and not isinstance(e, ValueError):
+            raise
+
         return {
-            "statusCode": 500,
-            "body": json.dumps({"message": "An error occurred while processing the service creation."}),
+            "statusCode": 400 if isinstance(e, ValueError) else 500,
+            "body": json.dumps({
+                "message": f"An error occurred while processing the {event.get('action', 'service creation')}.",
+                "error": str(e),
+            }),
         }
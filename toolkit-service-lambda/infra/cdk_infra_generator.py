@@ -0,0 +1,130 @@
+from infra.infra_generator import InfraGenerator
+from workspace import workspace_root
+
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import subprocess
+
+from importlib import metadata, util
+
+
+class CdkInfraGenerator(InfraGenerator):
+    """
+    Synthesizes the service infrastructure with the AWS CDK.
+
+    This is a thin wrapper: the CDK app only includes the shared ECS Fargate CloudFormation template
+    with CfnInclude, so it deploys the same resources as the cloudformation backend.
+
+    `cdk synth` takes tens of seconds to start, so synthesized templates are cached on disk
+    keyed by the construct inputs, the CDK app source and the aws-cdk-lib version.
+    """
+
+    STACK_NAME = "ServiceStack"
+
+    def __init__(self, cache_dir: str = None):
+        # The CDK CLI and aws-cdk-lib are only installed in images built with WITH_CDK=true
+        if shutil.which("cdk") is None or util.find_spec("aws_cdk") is None:
+            raise ValueError("The cdk backend needs a bootstrapper image built with --build-arg WITH_CDK=true")
+
+        self.cache_dir = cache_dir or os.getenv("CDK_SYNTH_CACHE_DIR", os.path.join(workspace_root(), "cdk-synth-cache"))
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def generate_infra(self, project_id: str, infra_config: dict, target_id: str = None) -> str:
+        infra_dir = self.create_infra_dir(project_id, target_id)
+        params = self.normalize_params(infra_config)
+
+        template_path = os.path.join(infra_dir, "infra.yaml")
+        template = self.synth(self.include_parameters(params))
+
+        with open(template_path, 'w') as template_file:
+            template_file.write(template)
+
+        # Construct inputs are baked into the template; only the image is left for the build.
+        config_path = os.path.join(infra_dir, "dev.json")
+        with open(config_path, 'w') as json_file:
+            json.dump({"Parameters": {"imageUri": "PLACEHOLDER_URI"}}, json_file, indent=2)
+
+        return template_path
+
+    def include_parameters(self, params: dict) -> dict:
+        """CfnInclude takes list parameters as lists, and every other value as its template string."""
+        include_params = self.to_template_parameters(params)
+        include_params.update({key: value for key, value in params.items() if isinstance(value, list)})
+
+        return include_params
+
+    def synth(self, params: dict) -> str:
+        cache_key = self.cache_key(params)
+        cache_path = os.path.join(self.cache_dir, f"{cache_key}.template.json")
+
+        if os.path.exists(cache_path):
+            print(f"Using cached CDK template {cache_path}")
+            with open(cache_path) as cached_file:
+                return cached_file.read()
+
+        with tempfile.TemporaryDirectory(dir=self.cache_dir) as app_dir:
+            template = self.run_synth(app_dir, params)
+
+        # Write atomically so concurrent invocations never read a partial template
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, 'w') as tmp_file:
+            tmp_file.write(template)
+        os.replace(tmp_path, cache_path)
+
+        return template
+
+    def run_synth(self, app_dir: str, params: dict) -> str:
+        shutil.copyfile(self.get_app_path(), os.path.join(app_dir, "app.py"))
+        shutil.copyfile(self.get_template_path(), os.path.join(app_dir, "infra.ecs-fargate.template"))
+
+        with open(os.path.join(app_dir, "parameters.json"), 'w') as params_file:
+            json.dump(params, params_file, indent=2)
+
+        output_dir = os.path.join(app_dir, "cdk.out")
+        command = [
+            "cdk", "synth",
+            "--app", "python3 app.py",
+            "--output", output_dir,
+            "--no-version-reporting",
+            "--no-path-metadata",
+            "--no-asset-metadata",
+            "--quiet",
+        ]
+
+        env = dict(os.environ, HOME=os.getenv("HOME", "/tmp"), CDK_DISABLE_VERSION_CHECK="1")
+
+        try:
+            subprocess.run(command, cwd=app_dir, env=env, check=True, capture_output=True, text=True)
+            print(f"CDK app synthesized successfully in {app_dir}")
+        except subprocess.CalledProcessError as e:
+            print(f"Failed to synthesize CDK app: {e}")
+            raise RuntimeError(f"Error running cdk synth: {e.stderr}")
+
+        with open(os.path.join(output_dir, f"{self.STACK_NAME}.template.json")) as template_file:
+            return template_file.read()
+
+    def cache_key(self, params: dict) -> str:
+        digest = hashlib.sha256()
+        digest.update(json.dumps(params, sort_keys=True).encode("utf-8"))
+
+        for path in (self.get_app_path(), self.get_template_path()):
+            with open(path, 'rb') as source_file:
+                digest.update(source_file.read())
+
+        digest.update(self.cdk_version().encode("utf-8"))
+
+        return digest.hexdigest()
+
+    def cdk_version(self) -> str:
+        try:
+            return metadata.version("aws-cdk-lib")
+        except metadata.PackageNotFoundError:
+            return "unknown"
+
+    def get_app_path(self) -> str:
+        module_dir = os.path.dirname(os.path.abspath(__file__))
+
+        return os.path.join(module_dir, 'templates', 'cdk.app.template')
@@ -7,21 +7,20 @@ import shutil
 
 class CloudFormationInfraGenerator(InfraGenerator):
 
-    def generate_infra(self, project_id: str, infra_config: dict) -> str:
-        infra_dir = self.create_infra_dir(project_id)
+    def generate_infra(self, project_id: str, infra_config: dict, target_id: str = None) -> str:
+        infra_dir = self.create_infra_dir(project_id, target_id)
+        params = self.normalize_params(infra_config)
 
         # Create config file dev.json
         config_path = os.path.join(infra_dir, "dev.json")
-        self.write_config(infra_config, config_path)
+        self.write_config(self.to_template_parameters(params), config_path)
 
         return self.copy_cloudformation_template(infra_dir)
 
     def copy_cloudformation_template(self, project_dir: str) -> str:
-        module_dir = os.path.dirname(os.path.abspath(__file__))
-        source_template_path = os.path.join(module_dir, 'templates', 'infra.ecs-fargate.template')
         destination_template_path = os.path.join(project_dir, "infra.yaml")
 
-        shutil.copyfile(source_template_path, destination_template_path)
+        shutil.copyfile(self.get_template_path(), destination_template_path)
 
         return destination_template_path
 
@@ -2,15 +2,76 @@ import os
 
 from abc import ABC, abstractmethod
 
+from infra.scaling import scaling_parameters
+from workspace import project_path
+
+
+def infra_path(target_id: str = None) -> str:
+    """Path of the infrastructure files in the service repository; each deployment target has its own."""
+    return f"infra/targets/{target_id}" if target_id else "infra"
+
 
 class InfraGenerator(ABC):
 
+    # Parameters that are lists in the template and may arrive as comma-separated strings.
+    LIST_PARAMETERS = ("subnets",)
+
     @abstractmethod
-    def generate_infra(self, project_id: str, infra_config: dict) -> str:
+    def generate_infra(self, project_id: str, infra_config: dict, target_id: str = None) -> str:
         pass
 
-    def create_infra_dir(self, project_id: str) -> str:
-        project_dir = f"/tmp/{project_id}/infra"
+    def create_infra_dir(self, project_id: str, target_id: str = None) -> str:
+        project_dir = project_path(project_id, infra_path(target_id))
         os.makedirs(project_dir, exist_ok=True)
 
         return project_dir
+
+    def normalize_params(self, infra_config: dict) -> dict:
+        """
+        Normalizes the iac payload into a canonical parameter set shared by all backends.
+
+        Keys are sorted, None values are dropped, strings are stripped and list parameters
+        are always lists, so identical inputs produce identical parameters. The "scaling" block
+        is validated and flattened into the template's scaling parameters.
+        """
+        infra_config = dict(infra_config or {})
+        infra_config.update(scaling_parameters(infra_config.pop("scaling", None)))
+
+        params = {}
+
+        for key in sorted(infra_config):
+            value = infra_config[key]
+
+            if value is None:
+                continue
+
+            if key in self.LIST_PARAMETERS and isinstance(value, str):
+                value = value.split(",")
+
+            if isinstance(value, (list, tuple)):
+                value = [str(item).strip() for item in value if str(item).strip()]
+            elif isinstance(value, str):
+                value = value.strip()
+
+            params[key] = value
+
+        return params
+
+    def to_template_parameters(self, params: dict) -> dict:
+        """Formats normalized parameters as CloudFormation parameter values (strings)."""
+        template_params = {}
+
+        for key, value in params.items():
+            if isinstance(value, list):
+                template_params[key] = ",".join(value)
+            elif isinstance(value, bool):
+                template_params[key] = str(value).lower()
+            else:
+                template_params[key] = str(value)
+
+        return template_params
+
+    def get_template_path(self) -> str:
+        module_dir = os.path.dirname(os.path.abspath(__file__))
+
+        return os.path.join(module_dir, 'templates', 'infra.ecs-fargate.template')
@@ -0,0 +1,116 @@
+import re
+
+
+# Defaults applied when the iac payload has no "scaling" block, or omits a field.
+SCALING_DEFAULTS = {
+    "minCapacity": 1,
+    "maxCapacity": 4,
+    "cpuTarget": 70,
+    "memoryTarget": 80,
+    "scaleInCooldown": 300,
+    "scaleOutCooldown": 60,
+}
+
+SCHEDULE_EXPRESSION = re.compile(r"^(cron|rate|at)\(.+\)$")
+
+MAX_TASKS = 1000
+
+
+def scaling_parameters(scaling: dict) -> dict:
+    """
+    Validates the "scaling" block of the iac payload and returns it as template parameters.
+
+    Example:
+        "scaling": {
+            "minCapacity": 2,
+            "maxCapacity": 10,
+            "cpuTarget": 60,
+            "memoryTarget": false,
+            "schedule": {
+                "scaleOut": {"cron": "cron(0 8 ? * MON-FRI *)", "minCapacity": 4, "maxCapacity": 10},
+                "scaleIn": {"cron": "cron(0 20 ? * MON-FRI *)", "minCapacity": 2, "maxCapacity": 4}
+            }
+        }
+
+    A target of false or 0 disables that target-tracking policy.
+    """
+    scaling = dict(scaling or {})
+    schedule = scaling.pop("schedule", {}) or {}
+
+    if "requestCountTarget" in scaling:
+        raise ValueError("scaling.requestCountTarget is not supported: the service is fronted by a Network "
+                         "Load Balancer, which does not publish ALB request counts per target.")
+
+    unknown = set(scaling) - set(SCALING_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unsupported scaling fields: {', '.join(sorted(unknown))}")
+
+    settings = dict(SCALING_DEFAULTS)
+    settings.update(scaling)
+
+    min_capacity = _int(settings, "minCapacity", 0, MAX_TASKS)
+    max_capacity = _int(settings, "maxCapacity", 1, MAX_TASKS)
+    if min_capacity > max_capacity:
+        raise ValueError(f"scaling.minCapacity ({min_capacity}) must not exceed maxCapacity ({max_capacity})")
+
+    params = {
+        "minCapacity": min_capacity,
+        "maxCapacity": max_capacity,
+        "cpuTargetUtilization": _target(settings, "cpuTarget"),
+        "memoryTargetUtilization": _target(settings, "memoryTarget"),
+        "scaleInCooldown": _int(settings, "scaleInCooldown", 0, 3600),
+        "scaleOutCooldown": _int(settings, "scaleOutCooldown", 0, 3600),
+    }
+
+    unknown = set(schedule) - {"scaleOut", "scaleIn"}
+    if unknown:
+        raise ValueError(f"Unsupported scaling.schedule entries: {', '.join(sorted(unknown))}")
+
+    for name in ("scaleOut", "scaleIn"):
+        params.update(_scheduled_action(name, schedule.get(name)))
+
+    return params
+
+
+def _scheduled_action(name: str, action: dict) -> dict:
+    if not action:
+        return {f"{name}Schedule": "", f"{name}MinCapacity": 0, f"{name}MaxCapacity": 0}
+
+    expression = str(action.get("cron", "")).strip()
+    if not SCHEDULE_EXPRESSION.match(expression):
+        raise ValueError(f"scaling.schedule.{name}.cron must be a cron(), rate() or at() expression, got '{expression}'")
+
+    min_capacity = _int(action, "minCapacity", 0, MAX_TASKS, prefix=f"schedule.{name}.")
+    max_capacity = _int(action, "maxCapacity", 1, MAX_TASKS, prefix=f"schedule.{name}.")
+    if min_capacity > max_capacity:
+        raise ValueError(f"scaling.schedule.{name}.minCapacity must not exceed maxCapacity")
+
+    return {
+        f"{name}Schedule": expression,
+        f"{name}MinCapacity": min_capacity,
+        f"{name}MaxCapacity": max_capacity,
+    }
+
+
+def _target(settings: dict, key: str) -> int:
+    if settings.get(key) in (None, False, 0, "0"):
+        return 0
+
+    return _int(settings, key, 1, 100)
+
+
+def _int(settings: dict, key: str, minimum: int, maximum: int, prefix: str = "") -> int:
+    value = settings.get(key)
+
+    if isinstance(value, bool):
+        raise ValueError(f"scaling.{prefix}{key} must be an integer, got {value!r}")
+
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"scaling.{prefix}{key} must be an integer, got {value!r}")
+
+    if not minimum <= number <= maximum:
+        raise ValueError(f"scaling.{prefix}{key} must be between {minimum} and {maximum}, got {number}")
+
+    return number
@@ -0,0 +1,40 @@
+from infra.infra_generator import InfraGenerator
+
+import os
+import json
+import shutil
+
+
+class TerraformInfraGenerator(InfraGenerator):
+    """
+    Generates a Terraform configuration for the service.
+
+    This is a thin wrapper: the configuration only manages the shared ECS Fargate CloudFormation
+    template as an aws_cloudformation_stack, so it deploys the same resources as the cloudformation
+    backend. Variables are written to dev.json, which Terraform reads as a
+    JSON var file and the build updates with the image URI.
+    """
+
+    def generate_infra(self, project_id: str, infra_config: dict, target_id: str = None) -> str:
+        infra_dir = self.create_infra_dir(project_id, target_id)
+        params = self.normalize_params(infra_config)
+
+        shutil.copyfile(self.get_template_path(), os.path.join(infra_dir, "infra.yaml"))
+
+        main_path = os.path.join(infra_dir, "main.tf")
+        shutil.copyfile(self.get_main_path(), main_path)
+
+        parameters = {"imageUri": "PLACEHOLDER_URI"}
+        parameters.update(self.to_template_parameters(params))
+
+        config_path = os.path.join(infra_dir, "dev.json")
+        with open(config_path, 'w') as json_file:
+            json.dump({"parameters": parameters}, json_file, indent=2)
+        print(f"Successfully wrote Terraform variables to {config_path}")
+
+        return main_path
+
+    def get_main_path(self) -> str:
+        module_dir = os.path.dirname(os.path.abspath(__file__))
+
+        return os.path.join(module_dir, 'templates', 'terraform.main.template')
@@ -0,0 +1,179 @@
+import json
+import math
+import time
+import boto3
+
+from datetime import datetime
+from aws_lambda_powertools.logging import Logger
+
+logger = Logger()
+
+PENDING = "PENDING"
+RUNNING = "RUNNING"
+SUCCEEDED = "SUCCEEDED"
+FAILED = "FAILED"
+
+TERMINAL_STATES = (SUCCEEDED, FAILED)
+
+# API Gateway gives up on the integration after 29 seconds
+MAX_WAIT_SECONDS = 25
+POLL_INTERVAL_SECONDS = 1.0
+
+
+class JobStatus:
+    """
+    Tracks a bootstrap in the service's ServicesTable record, under "job":
+
+        {"status": "RUNNING", "stage": "dockerfile", "version": 4, "startedAt": "...",
+         "stages": {"codegen": {"status": "SUCCEEDED", "startedAt": "...", "finishedAt": "...", "durationMs": 3},
+                    "dockerfile": {"status": "RUNNING", "startedAt": "..."}}}
+
+    Every update increments "version", so pollers can wait for the next change. It is registered as a
+    StageTimer listener, so each stage of process_service_creation is recorded as it starts and finishes.
+    Once the project has been generated and stored, its "checkpoint" lets a retried bootstrap restore it.
+    Failing to write the status is logged, never raised: it must not fail the bootstrap itself.
+    """
+
+    def __init__(self, services_table, project_id: str):
+        self.services_table = services_table
+        self.project_id = project_id
+        self.job = {"status": PENDING, "version": 0, "stages": {}}
+
+    def accept(self, service_info: dict):
+        """Writes the initial record of a bootstrap that has been accepted but not started."""
+        timestamp = datetime.utcnow().isoformat()
+        self.job["version"] += 1
+        self.job["acceptedAt"] = timestamp
+
+        item = {
+            "id": self.project_id,
+            "project_name": service_info.get("name"),
+            "project_type": service_info.get("type"),
+            "description": service_info.get("description"),
+            "created_timestamp": timestamp,
+            "updated_timestamp": timestamp,
+            "job": self.job,
+        }
+
+        try:
+            self.services_table.put_item(Item=item)
+        except Exception as e:
+            logger.warning(f"Failed to record job status of {self.project_id}: {e}")
+
+    def resume(self) -> dict:
+        """
+        Continues the job of a bootstrap that was accepted, or ran before, under this id. Returns the
+        job as it was recorded, or an empty dict when there is no record.
+        """
+        item = self.services_table.get_item(Key={"id": self.project_id}, ConsistentRead=True).get("Item") or {}
+        previous = item.get("job") or {}
+
+        # Versions keep increasing across attempts, so pollers waiting on the last one see the retry
+        self.job["version"] = int(previous.get("version", 0))
+
+        return previous
+
+    def start(self):
+        self.job["status"] = RUNNING
+        self.job["startedAt"] = datetime.utcnow().isoformat()
+        self.save()
+
+    def stage_started(self, name: str):
+        self.job["stage"] = name
+        self.job["stages"][name] = {"status": RUNNING, "startedAt": datetime.utcnow().isoformat()}
+        self.save()
+
+    def stage_finished(self, name: str, seconds: float, error: Exception = None):
+        stage = self.job["stages"].setdefault(name, {})
+        stage["status"] = FAILED if error else SUCCEEDED
+        stage["finishedAt"] = datetime.utcnow().isoformat()
+        stage["durationMs"] = int(round(seconds * 1000))
+        if error:
+            stage["error"] = str(error)
+        self.save()
+
+    def checkpoint(self, checkpoint: dict):
+        self.job["checkpoint"] = checkpoint
+        self.save()
+
+    def succeed(self) -> dict:
+        """Marks the job as succeeded and returns it, to be stored with the final service record."""
+        self.job["status"] = SUCCEEDED
+        self.job["finishedAt"] = datetime.utcnow().isoformat()
+        self.job.pop("stage", None)
+        self.job["version"] += 1
+
+        return self.job
+
+    def fail(self, error: Exception):
+        self.job["status"] = FAILED
+        self.job["finishedAt"] = datetime.utcnow().isoformat()
+        self.job["error"] = {
+            "stage": self.job.get("stage"),
+            "type": type(error).__name__,
+            "message": str(error),
+        }
+        self.save()
+
+    def save(self):
+        self.job["version"] += 1
+
+        try:
+            self.services_table.update_item(
+                Key={"id": self.project_id},
+                UpdateExpression="SET job = :job, updated_timestamp = :now",
+                ExpressionAttributeValues={
+                    ":job": self.job,
+                    ":now": datetime.utcnow().isoformat(),
+                },
+            )
+        except Exception as e:
+            logger.warning(f"Failed to record job status of {self.project_id}: {e}")
+
+
+def job_view(item: dict) -> dict:
+    """The status API's view of a service record. Records written before jobs were tracked have succeeded."""
+    job = item.get("job") or {"status": SUCCEEDED, "version": 0, "stages": {}}
+
+    view = {"id": item["id"], "name": item.get("project_name")}
+    view.update({key: value for key, value in job.items() if key != "checkpoint"})
+
+    if job["status"] == SUCCEEDED:
+        view["resources"] = item.get("metadata", {}).get("resources")
+
+    return view
+
+
+def wait_for_update(services_table, project_id: str, since: int = None, wait_seconds: float = 0):
+    """
+    Long-polls the record of `project_id` until its job version is newer than `since`, the job has
+    finished, or `wait_seconds` (at most MAX_WAIT_SECONDS) have passed. Without `since`, returns the
+    current record. Returns None when there is no record.
+    """
+    # NaN would never reach the deadline and poll until the function times out
+    if not math.isfinite(wait_seconds):
+        raise ValueError(f"wait_seconds must be finite, got {wait_seconds}")
+
+    deadline = time.monotonic() + min(max(wait_seconds, 0), MAX_WAIT_SECONDS)
+
+    while True:
+        item = services_table.get_item(Key={"id": project_id}, ConsistentRead=True).get("Item")
+        if item is None:
+            return None
+
+        job = item.get("job") or {"status": SUCCEEDED, "version": 0}
+        if job["status"] in TERMINAL_STATES or since is None or job["version"] > since:
+            return item
+        if time.monotonic() + POLL_INTERVAL_SECONDS > deadline:
+            return item
+
+        time.sleep(POLL_INTERVAL_SECONDS)
+
+
+def start_async_bootstrap(function_name: str, project_id: str, payload: dict):
+    """Invokes this function asynchronously to run the bootstrap, so the API can return immediately."""
+    boto3.client("lambda").invoke(
+        FunctionName=function_name,
+        InvocationType="Event",
+        Payload=json.dumps({"action": "bootstrap", "id": project_id, "payload": payload}),
+    )
@@ -0,0 +1,74 @@
+from concurrent.futures import ThreadPoolExecutor
+from aws_lambda_powertools.logging import Logger
+
+from docker_registry.ecr_policy import ecr_config
+from docker_registry.registry import RepositoryNotFoundError
+from lifecycle.services import find_services, service_resources
+from lifecycle.teardown import with_retries
+from providers.providers import get_providers
+
+logger = Logger()
+
+MAX_PARALLEL_REPOSITORIES = 8
+
+
+class RegistryPolicyUpdater:
+    """
+    Applies ECR lifecycle, scanning and tag mutability settings to the repositories of existing
+    services, so repositories created before the settings existed stop growing without limit.
+    """
+
+    def __init__(self, services_table, providers=None):
+        self.services_table = services_table
+        self.providers = providers or get_providers()
+
+    def apply(self, config: dict, filters: dict = None, dry_run: bool = False) -> dict:
+        config = ecr_config(config)
+
+        # Pipelines of existing services push :latest on every build, which immutable tags would reject
+        if config["tagImmutability"]:
+            raise ValueError("registry.ecr.tagImmutability cannot be applied to existing services; "
+                             "their buildspecs push :latest")
+
+        repositories = {}
+        for resources in map(service_resources, find_services(self.services_table, filters)):
+            # Services bootstrapped into several targets have a repository in each
+            for target_resources in resources.get("targets", [resources]):
+                registry, target = target_resources["registry"], target_resources.get("target")
+                if registry["type"] == "ecr":
+                    key = f"{registry['name']}@{target['id']}" if target else registry["name"]
+                    repositories[key] = (registry["name"], target)
+
+        names = sorted(repositories)
+        logger.info(f"Applying registry policies {config} to {len(names)} repositories")
+
+        if dry_run:
+            return {"dryRun": True, "repositories": names}
+
+        def apply_policies(key: str) -> str:
+            repository_name, target = repositories[key]
+
+            try:
+                if target:
+                    registry = self.providers.registry(self.providers.target_session(target), target["region"])
+                else:
+                    registry = self.providers.registry()
+
+                try:
+                    with_retries(lambda: registry.apply_policies(repository_name, config),
+                                 f"Applying policies to {key}", permanent_errors=(ValueError, RepositoryNotFoundError))
+                    return "applied"
+                except RepositoryNotFoundError:
+                    return "skipped: repository does not exist"
+            except Exception as e:
+                logger.error(f"Failed to apply policies to {key}: {e}")
+                return f"failed: {e}"
+
+        with ThreadPoolExecutor(max_workers=MAX_PARALLEL_REPOSITORIES) as executor:
+            outcomes = dict(zip(names, executor.map(apply_policies, names)))
+
+        return {
+            "applied": sum(1 for o in outcomes.values() if o == "applied"),
+            "failed": sum(1 for o in outcomes.values() if o.startswith("failed")),
+            "repositories": outcomes,
+        }
@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta
+from boto3.dynamodb.conditions import Attr
+
+from lifecycle.job_status import SUCCEEDED
+
+
+def service_resources(item: dict) -> dict:
+    """Returns the resources recorded for a service, deriving them by name for records created before they were."""
+    resources = item.get("metadata", {}).get("resources")
+    if resources:
+        return resources
+
+    pipeline_name = f"{item['project_name']}-pipeline"
+
+    return {
+        "registry": {"type": "ecr", "name": item["project_name"]},
+        "scm": {"type": "github", "repo": item.get("github_repo")},
+        "pipeline": {
+            "pipeline": pipeline_name,
+            # Deleting a build project that was never created is a no-op
+            "buildProjects": [f"{pipeline_name}-build", f"{pipeline_name}-deploy", f"{pipeline_name}-loadtest"],
+            "stack": f"{pipeline_name}-stack",
+        },
+    }
+
+
+def find_services(services_table, filters: dict = None) -> list:
+    """
+    Scans the services table for records matching all of the given filters; no filters match every record.
+
+    Supported filters: "olderThanDays" (by creation time), "type" (one or a list of service types)
+    and "tags" (a map of tag values that must all match). Records of bootstraps that are still running
+    or have failed are skipped; tear those down by id.
+    """
+    condition = filter_condition(filters or {})
+
+    items = []
+    scan_kwargs = {"FilterExpression": condition} if condition is not None else {}
+
+    while True:
+        response = services_table.scan(**scan_kwargs)
+        items.extend(item for item in response.get("Items", []) if is_bootstrapped(item))
+
+        if "LastEvaluatedKey" not in response:
+            return items
+        scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def is_bootstrapped(item: dict) -> bool:
+    # Records written before jobs were tracked only exist for completed bootstraps
+    return item.get("job", {}).get("status", SUCCEEDED) == SUCCEEDED
+
+
+def filter_condition(filters: dict):
+    unknown = set(filters) - {"olderThanDays", "type", "tags"}
+    if unknown:
+        raise ValueError(f"Unsupported filter fields: {', '.join(sorted(unknown))}")
+
+    conditions = []
+
+    if "olderThanDays" in filters:
+        days = filters["olderThanDays"]
+        if not isinstance(days, (int, float)) or days < 0:
+            raise ValueError(f"filter.olderThanDays must be a non-negative number, got {days!r}")
+        cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
+        conditions.append(Attr("created_timestamp").lt(cutoff))
+
+    if "type" in filters:
+        types = filters["type"] if isinstance(filters["type"], list) else [filters["type"]]
+        if not types:
+            raise ValueError("filter.type must name at least one service type")
+        conditions.append(Attr("project_type").is_in(types))
+
+    for key, value in (filters.get("tags") or {}).items():
+        # Attr() parses "." and "[...]" as nested paths, so such keys would match the wrong attribute
+        if not key or any(c in key for c in ".[]"):
+            raise ValueError(f"filter.tags key {key!r} must not be empty or contain '.', '[' or ']'")
+        conditions.append(Attr(f"metadata.tags.{key}").eq(value))
+
+    if not conditions:
+        return None
+
+    condition = conditions[0]
+    for other in conditions[1:]:
+        condition = condition & other
+
+    return condition
@@ -0,0 +1,170 @@
+import time
+import random
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from aws_lambda_powertools.logging import Logger
+
+from lifecycle.services import filter_condition, find_services, service_resources
+from providers.providers import get_providers
+
+logger = Logger()
+
+MAX_ATTEMPTS = 4
+BASE_DELAY_SECONDS = 1.0
+
+# Services torn down in parallel by a bulk teardown; each also deletes its resources in parallel
+MAX_PARALLEL_SERVICES = 4
+MAX_PARALLEL_DELETIONS = 8
+
+
+def with_retries(action, description: str, max_attempts: int = MAX_ATTEMPTS, permanent_errors: tuple = (ValueError,)):
+    """
+    Runs `action`, retrying failures (throttling, eventual consistency) with jittered exponential backoff.
+    Errors in `permanent_errors`, such as invalid records or configuration, are raised immediately.
+    """
+    for attempt in range(1, max_attempts + 1):
+        try:
+            return action()
+        except permanent_errors:
+            raise
+        except Exception as e:
+            if attempt == max_attempts:
+                raise
+            delay = BASE_DELAY_SECONDS * 2 ** (attempt - 1) * (1 + random.random())
+            logger.warning(f"{description} failed (attempt {attempt}/{max_attempts}), retrying in {delay:.1f}s: {e}")
+            time.sleep(delay)
+
+
+class ServiceTeardown:
+    """
+    Deletes everything a bootstrap created for a service, driven by its ServicesTable record:
+    the CloudFormation stack, pipeline and build projects, ECR repository and SCM repository,
+    in every deployment target the service was bootstrapped into.
+
+    Resources are deleted concurrently. The record is only removed when every deletion succeeded,
+    so a failed teardown can be retried. Deletions go through `providers`, so offline records are
+    only torn down offline.
+    """
+
+    def __init__(self, services_table, providers=None):
+        self.services_table = services_table
+        self.providers = providers or get_providers()
+
+    def teardown(self, item: dict, delete_record: bool = True) -> dict:
+        result = self.delete_resources(item)
+
+        if delete_record:
+            self.finish(item, result)
+
+        return result
+
+    def teardown_matching(self, filters: dict, dry_run: bool = False) -> dict:
+        # An empty filter, including one whose fields are all empty, would match every service in the table
+        if filter_condition(filters or {}) is None:
+            raise ValueError("Bulk teardown needs at least one of filter.olderThanDays, filter.type or filter.tags")
+
+        items = find_services(self.services_table, filters)
+        logger.info(f"{len(items)} service(s) match teardown filters {filters}")
+
+        if dry_run:
+            return {"dryRun": True, "services": [{"id": i["id"], "name": i["project_name"]} for i in items]}
+
+        with ThreadPoolExecutor(max_workers=MAX_PARALLEL_SERVICES) as executor:
+            results = list(executor.map(self.delete_resources, items))
+
+        # Table resources are not thread-safe, so records are updated here rather than in the workers
+        for item, result in zip(items, results):
+            self.finish(item, result)
+
+        return {
+            "deleted": sum(1 for r in results if r["status"] == "DELETED"),
+            "failed": sum(1 for r in results if r["status"] == "FAILED"),
+            "services": results,
+        }
+
+    def delete_resources(self, item: dict) -> dict:
+        resources = service_resources(item)
+        logger.info(f"Tearing down service {item['project_name']} ({item['id']})...")
+
+        deletions = {"scm": lambda: self.delete_scm_repo(resources["scm"])}
+
+        # Services bootstrapped into several targets have a registry and pipeline in each
+        for target_resources in resources.get("targets", [resources]):
+            deletions.update(self.target_deletions(target_resources))
+
+        with ThreadPoolExecutor(max_workers=min(len(deletions), MAX_PARALLEL_DELETIONS)) as executor:
+            futures = {
+                name: executor.submit(with_retries, deletion, f"Deleting {name} of {item['project_name']}")
+                for name, deletion in deletions.items()
+            }
+
+        outcomes = {}
+        for name, future in futures.items():
+            error = future.exception()
+            if error:
+                logger.error(f"Failed to delete {name} of {item['project_name']}: {error}")
+                outcomes[name] = f"failed: {error}"
+            else:
+                outcomes[name] = future.result() or "deleted"
+
+        return {
+            "id": item["id"],
+            "name": item["project_name"],
+            "status": "FAILED" if any(o.startswith("failed") for o in outcomes.values()) else "DELETED",
+            "resources": outcomes,
+        }
+
+    def target_deletions(self, resources: dict) -> dict:
+        target = resources.get("target")
+        if target is None:
+            return {
+                "stack": lambda: self.providers.pipeline().delete_stack(resources["pipeline"]),
+                "pipeline": lambda: self.providers.pipeline().delete_pipeline(resources["pipeline"]),
+                "registry": lambda: self.delete_registry(resources["registry"]),
+            }
+
+        def target_pipeline():
+            return self.providers.pipeline(self.providers.target_session(target), target)
+
+        deletions = {
+            f"registry@{target['id']}": lambda: self.delete_registry(resources["registry"], target),
+        }
+
+        # Provisioning may have failed before the pipeline was created
+        if "pipeline" in resources:
+            deletions[f"stack@{target['id']}"] = lambda: target_pipeline().delete_stack(resources["pipeline"])
+            deletions[f"pipeline@{target['id']}"] = lambda: target_pipeline().delete_pipeline(resources["pipeline"])
+
+        return deletions
+
+    def delete_registry(self, registry: dict, target: dict = None):
+        if registry["type"] != "ecr":
+            raise ValueError(f"Unsupported registry type: {registry['type']}")
+
+        if target:
+            self.providers.registry(self.providers.target_session(target), target["region"]).delete_repository(registry["name"])
+        else:
+            self.providers.registry().delete_repository(registry["name"])
+
+    def delete_scm_repo(self, scm: dict):
+        if not scm.get("secretKey"):
+            # Records created before resources were stored do not say which token owns the repository
+            return f"skipped: delete {scm.get('repo')} manually"
+
+        self.providers.source_repo(scm["type"], scm).delete_repo()
+
+    def finish(self, item: dict, result: dict):
+        if result["status"] == "DELETED":
+            self.services_table.delete_item(Key={"id": item["id"]})
+            logger.info(f"Service {item['project_name']} ({item['id']}) torn down")
+            return
+
+        self.services_table.update_item(
+            Key={"id": item["id"]},
+            UpdateExpression="SET metadata.teardown = :teardown, updated_timestamp = :now",
+            ExpressionAttributeValues={
+                ":teardown": result["resources"],
+                ":now": datetime.utcnow().isoformat(),
+            },
+        )
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Runs the generated load-test scenario and enforces its performance budgets.
+
+Against a deployed service:
+    python3 loadtest/run.py --base-url http://my-service.example.com
+
+Against the service built and started locally in a container (requires Docker, and Maven for
+Spring services whose Dockerfile copies a prebuilt jar):
+    python3 loadtest/run.py --local
+
+Errors are transport failures and 5xx responses. 501 is not counted because generated
+operation stubs return it until they are implemented. The exit code is 1 if the p95 latency
+or error rate exceeds the budget.
+"""
+import argparse
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+
+SCENARIO_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scenario.json")
+REQUEST_TIMEOUT_SECONDS = 10
+
+
+def percentile(samples, fraction):
+    if not samples:
+        return 0.0
+
+    ordered = sorted(samples)
+    # Nearest-rank percentile
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+
+    return ordered[index]
+
+
+def send(base_url, request):
+    url = base_url + request["path"]
+    if request.get("query"):
+        url += "?" + urllib.parse.urlencode(request["query"], doseq=True)
+
+    data = None
+    if "body" in request:
+        data = json.dumps(request["body"]).encode("utf-8")
+
+    http_request = urllib.request.Request(url, data=data, method=request["method"], headers=request.get("headers", {}))
+
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(http_request, timeout=REQUEST_TIMEOUT_SECONDS) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except (urllib.error.URLError, socket.timeout, ConnectionError):
+        status = None
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    is_error = status is None or (status >= 500 and status != 501)
+
+    return elapsed_ms, is_error
+
+
+def run_scenario(base_url, scenario, duration_seconds, concurrency):
+    requests = scenario["requests"]
+    if not requests:
+        raise ValueError("The scenario has no requests")
+
+    latencies, errors = [], []
+    per_request = {request["name"]: [] for request in requests}
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration_seconds
+
+    def worker(offset):
+        index = offset
+        while time.monotonic() < deadline:
+            request = requests[index % len(requests)]
+            elapsed_ms, is_error = send(base_url, request)
+            with lock:
+                latencies.append(elapsed_ms)
+                errors.append(is_error)
+                per_request[request["name"]].append(elapsed_ms)
+            index += 1
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    total = len(latencies)
+
+    return {
+        "requests": total,
+        "throughputPerSecond": total / duration_seconds,
+        "errorRate": (sum(errors) / total) if total else 1.0,
+        "p50LatencyMs": percentile(latencies, 0.50),
+        "p95LatencyMs": percentile(latencies, 0.95),
+        "p99LatencyMs": percentile(latencies, 0.99),
+        "operations": {
+            name: {"requests": len(samples), "p95LatencyMs": percentile(samples, 0.95)}
+            for name, samples in per_request.items()
+        },
+    }
+
+
+def check_budgets(report, budgets):
+    violations = []
+
+    if report["p95LatencyMs"] > budgets["p95LatencyMs"]:
+        violations.append(f"p95 latency {report['p95LatencyMs']:.1f} ms exceeds budget of {budgets['p95LatencyMs']} ms")
+    if report["errorRate"] > budgets["maxErrorRate"]:
+        violations.append(f"error rate {report['errorRate']:.2%} exceeds budget of {budgets['maxErrorRate']:.2%}")
+
+    return violations
+
+
+def wait_for_service(base_url, timeout_seconds):
+    # The published port accepts connections before the app is up, so wait for an HTTP response
+    deadline = time.monotonic() + timeout_seconds
+
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(base_url + "/", timeout=2):
+                return
+        except urllib.error.HTTPError:
+            return
+        except (urllib.error.URLError, socket.timeout, ConnectionError):
+            time.sleep(1)
+
+    raise RuntimeError(f"Service at {base_url} did not respond within {timeout_seconds}s")
+
+
+def packages_outside_docker(app_dir):
+    # Single-stage Maven Dockerfiles copy the jar the pipeline's Maven build produced into the image
+    if not os.path.exists(os.path.join(app_dir, "pom.xml")):
+        return False
+
+    with open(os.path.join(app_dir, "Dockerfile")) as dockerfile:
+        return "COPY target/" in dockerfile.read()
+
+
+def start_local_service(app_dir, port):
+    image = f"loadtest-{uuid.uuid4().hex[:8]}"
+
+    if packages_outside_docker(app_dir):
+        subprocess.run(["mvn", "-q", "package", "-DskipTests"], cwd=app_dir, check=True)
+
+    subprocess.run(["docker", "build", "-t", image, app_dir], check=True)
+    container_id = subprocess.run(
+        ["docker", "run", "-d", "--rm", "-p", f"{port}:{port}", image],
+        check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+    return container_id
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--base-url", help="Base URL of the deployed service")
+    target.add_argument("--local", action="store_true", help="Build and run the service in a local container")
+    parser.add_argument("--scenario", default=SCENARIO_PATH, help="Path to scenario.json")
+    parser.add_argument("--app-dir", default="app", help="Docker build context for --local")
+    parser.add_argument("--duration", type=int, help="Override the scenario duration in seconds")
+    parser.add_argument("--concurrency", type=int, help="Override the scenario concurrency")
+    parser.add_argument("--startup-timeout", type=int, default=120, help="Seconds to wait for the local service")
+    parser.add_argument("--report", help="Write the JSON report to this path")
+    args = parser.parse_args()
+
+    with open(args.scenario) as scenario_file:
+        scenario = json.load(scenario_file)
+
+    duration = args.duration or scenario["durationSeconds"]
+    concurrency = args.concurrency or scenario["concurrency"]
+
+    container_id = None
+    try:
+        if args.local:
+            port = scenario["containerPort"]
+            container_id = start_local_service(args.app_dir, port)
+            base_url = f"http://127.0.0.1:{port}"
+            wait_for_service(base_url, args.startup_timeout)
+        else:
+            base_url = args.base_url.rstrip("/")
+
+        base_url += scenario.get("basePath", "")
+        print(f"Running {len(scenario['requests'])} operations against {base_url} "
+              f"for {duration}s with concurrency {concurrency}")
+
+        report = run_scenario(base_url, scenario, duration, concurrency)
+    finally:
+        if container_id:
+            subprocess.run(["docker", "stop", container_id], capture_output=True)
+
+    report["budgets"] = scenario["budgets"]
+    violations = check_budgets(report, scenario["budgets"])
+    report["passed"] = not violations
+
+    print(json.dumps(report, indent=2))
+    if args.report:
+        with open(args.report, 'w') as report_file:
+            json.dump(report, report_file, indent=2)
+
+    for violation in violations:
+        print(f"BUDGET EXCEEDED: {violation}")
+
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+import os
+import json
+import shutil
+import requests
+import yaml
+
+from urllib.parse import urlparse
+
+from codegen.json_pointer import resolve_local_ref
+from workspace import project_path
+
+HTTP_METHODS = ("get", "put", "post", "delete", "patch", "head", "options")
+
+# Defaults for the "loadTest" block of the service payload
+LOAD_TEST_DEFAULTS = {
+    "p95LatencyMs": 500,
+    "maxErrorRate": 0.01,
+    "durationSeconds": 60,
+    "concurrency": 10,
+    "containerPort": 8080,
+}
+
+# Nested schemas are expanded to this depth; deeper values are omitted
+MAX_SCHEMA_DEPTH = 6
+
+
+def load_test_config(service_info: dict) -> dict:
+    """Returns the "loadTest" block of the service payload merged with defaults, or {} when disabled."""
+    config = service_info.get("loadTest") or {}
+
+    if not config.get("enabled"):
+        return {}
+
+    merged = dict(LOAD_TEST_DEFAULTS)
+    merged.update(config)
+
+    for key in ("p95LatencyMs", "durationSeconds", "concurrency", "containerPort"):
+        if not isinstance(merged[key], int) or merged[key] <= 0:
+            raise ValueError(f"loadTest.{key} must be a positive integer, got {merged[key]!r}")
+
+    if not 0 <= float(merged["maxErrorRate"]) <= 1:
+        raise ValueError(f"loadTest.maxErrorRate must be between 0 and 1, got {merged['maxErrorRate']!r}")
+
+    # The load balancer is internal, so the CodeBuild load-test action runs inside the VPC
+    if not merged.get("securityGroupIds"):
+        raise ValueError("loadTest.securityGroupIds is required to run the load test inside the service VPC")
+
+    return merged
+
+
+class LoadTestScenarioGenerator:
+    """
+    Generates a load-test scenario from an OpenAPI model: one request per operation, with
+    synthetic path/query parameters and request bodies derived from the schemas.
+    """
+
+    def generate_scenario(self, project_id: str, model_location: str, config: dict) -> str:
+        spec = self.load_spec(model_location)
+
+        scenario = {
+            "basePath": self.base_path(spec),
+            "containerPort": config["containerPort"],
+            "durationSeconds": config["durationSeconds"],
+            "concurrency": config["concurrency"],
+            "budgets": {
+                "p95LatencyMs": config["p95LatencyMs"],
+                "maxErrorRate": float(config["maxErrorRate"]),
+            },
+            "requests": self.build_requests(spec),
+        }
+
+        loadtest_dir = project_path(project_id, "loadtest")
+        os.makedirs(loadtest_dir, exist_ok=True)
+
+        scenario_path = os.path.join(loadtest_dir, "scenario.json")
+        with open(scenario_path, 'w') as scenario_file:
+            json.dump(scenario, scenario_file, indent=2)
+
+        # The runner is stdlib-only so it works in CodeBuild and on a laptop without installs
+        module_dir = os.path.dirname(os.path.abspath(__file__))
+        shutil.copyfile(os.path.join(module_dir, "runner.py"), os.path.join(loadtest_dir, "run.py"))
+
+        print(f"Load-test scenario with {len(scenario['requests'])} requests written to {scenario_path}")
+
+        return scenario_path
+
+    def load_spec(self, model_location: str) -> dict:
+        if urlparse(model_location).scheme in ("http", "https"):
+            response = requests.get(model_location, timeout=30)
+            response.raise_for_status()
+            content = response.text
+        else:
+            with open(model_location) as model_file:
+                content = model_file.read()
+
+        return yaml.safe_load(content)
+
+    def base_path(self, spec: dict) -> str:
+        servers = spec.get("servers") or [{}]
+        path = urlparse(servers[0].get("url", "")).path
+
+        return path.rstrip("/")
+
+    def build_requests(self, spec: dict) -> list:
+        scenario_requests = []
+
+        for path, path_item in (spec.get("paths") or {}).items():
+            path_item = self.resolve(spec, path_item)
+            shared_parameters = path_item.get("parameters", [])
+
+            for method in HTTP_METHODS:
+                operation = path_item.get(method)
+                if not operation:
+                    continue
+
+                parameters = [self.resolve(spec, p) for p in shared_parameters + operation.get("parameters", [])]
+
+                request = {
+                    "name": operation.get("operationId") or f"{method.upper()} {path}",
+                    "method": method.upper(),
+                    "path": self.render_path(spec, path, parameters),
+                    "query": self.render_query(spec, parameters),
+                    "headers": {"Accept": "application/json"},
+                }
+
+                body = self.request_body(spec, operation)
+                if body is not None:
+                    request["headers"]["Content-Type"] = "application/json"
+                    request["body"] = body
+
+                scenario_requests.append(request)
+
+        return scenario_requests
+
+    def render_path(self, spec: dict, path: str, parameters: list) -> str:
+        for parameter in parameters:
+            if parameter.get("in") == "path":
+                value = self.parameter_value(spec, parameter)
+                path = path.replace("{" + parameter["name"] + "}", str(value))
+
+        return path
+
+    def render_query(self, spec: dict, parameters: list) -> dict:
+        return {
+            parameter["name"]: self.parameter_value(spec, parameter)
+            for parameter in parameters
+            if parameter.get("in") == "query" and parameter.get("required")
+        }
+
+    def parameter_value(self, spec: dict, parameter: dict):
+        if "example" in parameter:
+            return parameter["example"]
+
+        return self.synthesize(spec, parameter.get("schema", {"type": "string"}))
+
+    def request_body(self, spec: dict, operation: dict):
+        request_body = self.resolve(spec, operation.get("requestBody"))
+        if not request_body:
+            return None
+
+        content = request_body.get("content", {})
+        media = content.get("application/json") or next(iter(content.values()), None)
+        if media is None:
+            return None
+
+        if "example" in media:
+            return media["example"]
+
+        return self.synthesize(spec, media.get("schema", {}))
+
+    def synthesize(self, spec: dict, schema: dict, depth: int = 0, refs: tuple = ()):
+        # Recursive references (e.g. a Category with a parent Category) are cut at the first repeat
+        ref = schema.get("$ref") if isinstance(schema, dict) else None
+        if ref:
+            if ref in refs:
+                return None
+            refs = refs + (ref,)
+
+        schema = self.resolve(spec, schema) or {}
+
+        if depth > MAX_SCHEMA_DEPTH:
+            return None
+        if "example" in schema:
+            return schema["example"]
+        if "default" in schema:
+            return schema["default"]
+        if schema.get("enum"):
+            return schema["enum"][0]
+
+        if "allOf" in schema:
+            merged = {}
+            for part in schema["allOf"]:
+                value = self.synthesize(spec, part, depth + 1, refs)
+                if isinstance(value, dict):
+                    merged.update(value)
+            return merged
+        for keyword in ("oneOf", "anyOf"):
+            if schema.get(keyword):
+                return self.synthesize(spec, schema[keyword][0], depth + 1, refs)
+
+        schema_type = schema.get("type")
+        if schema_type is None:
+            schema_type = "object" if "properties" in schema else "string"
+
+        if schema_type == "object":
+            properties = {}
+            for name, property_schema in (schema.get("properties") or {}).items():
+                value = self.synthesize(spec, property_schema, depth + 1, refs)
+                if value is not None:
+                    properties[name] = value
+            return properties
+        if schema_type == "array":
+            item = self.synthesize(spec, schema.get("items", {}), depth + 1, refs)
+            return [] if item is None else [item]
+        if schema_type == "integer":
+            return int(schema.get("minimum", 1))
+        if schema_type == "number":
+            return float(schema.get("minimum", 1.0))
+        if schema_type == "boolean":
+            return True
+
+        return self.synthesize_string(schema)
+
+    def synthesize_string(self, schema: dict) -> str:
+        formats = {
+            "date": "2024-01-01",
+            "date-time": "2024-01-01T00:00:00Z",
+            "uuid": "00000000-0000-4000-8000-000000000001",
+            "email": "loadtest@example.com",
+            "uri": "https://example.com",
+        }
+        value = formats.get(schema.get("format"), "loadtest")
+
+        min_length = schema.get("minLength", 0)
+        if len(value) < min_length:
+            value = value.ljust(min_length, "x")
+
+        max_length = schema.get("maxLength")
+        if max_length is not None:
+            value = value[:max_length]
+
+        return value
+
+    def resolve(self, spec: dict, node):
+        resolved = resolve_local_ref(spec, node)
+
+        return {} if resolved is None else resolved
@@ -3,20 +3,54 @@ import json
 import os
 
 from urllib.parse import urlparse
+
+from build_strategies.registry import get_build_mode, get_build_strategy
+from infra.infra_generator import infra_path
+from loadtest.scenario_generator import load_test_config
 from pipeline.pipeline import Pipeline
 
 
 class AwsCodePipeline(Pipeline):
-    def __init__(self):
-        self.codepipeline_client = boto3.client('codepipeline')
-        self.codebuild_client = boto3.client('codebuild')
+    def __init__(self, session: boto3.session.Session = None, target: dict = None):
+        """
+        Without a target, the pipeline is created in the Lambda's own account and region using the
+        toolkit's roles and artifact bucket. With one, `session` must be in the target's account and
+        region, and the target's roles, bucket and registry are used instead.
+        """
+        self.target = target
+
+        session = session or boto3
+        region = target["region"] if target else None
+        self.codepipeline_client = session.client('codepipeline', region_name=region)
+        self.codebuild_client = session.client('codebuild', region_name=region)
+        self.cloudformation_client = session.client('cloudformation', region_name=region)
+        self.s3_client = session.client('s3', region_name=region)
+
+        if target:
+            # Teardown only knows the target's id, account and region
+            self.codebuild_role_arn = target.get("codeBuildRoleArn")
+            self.codepipeline_role_arn = target.get("codePipelineRoleArn")
+            self.artifact_bucket = target.get("artifactBucket")
+        else:
+            self.codebuild_role_arn = os.environ['CODEBUILD_ROLE_ARN']
+            self.codepipeline_role_arn = os.environ['CODEPIPELINE_ROLE_ARN']
+            self.artifact_bucket = os.environ['CODEPIPELINE_BUCKET']
+
+        self.infra_path = infra_path(target["id"] if target else None)
+
+    def create_pipeline(self, service_info: dict, scm_info: dict, iac_type: str = "cloudformation", iac_info: dict = None,
+                        source_token: str = None):
+        if not source_token:
+            raise ValueError("The GitHub source action needs the repository's access token")
 
-    def create_pipeline(self, service_info: dict, scm_info: dict):
         pipeline_name = f"{service_info['name']}-pipeline"
         repository_name = urlparse(scm_info["repo"]).path.strip("/")
         branch_name = "main"
 
-        build_project = self.codebuild_client.create_project(
+        build_strategy = get_build_strategy(service_info["type"], get_build_mode(service_info))
+        compute_type = build_strategy.get("build_compute_type", "BUILD_GENERAL1_SMALL")
+
+        build_project = self._create_or_update_project(
             name=f"{pipeline_name}-build",
             source={
                 'type': 'CODEPIPELINE'
@@ -28,10 +62,15 @@ class AwsCodePipeline(Pipeline):
             environment={
                 'type': 'LINUX_CONTAINER',
                 'image': 'aws/codebuild/standard:5.0',
-                'computeType': 'BUILD_GENERAL1_SMALL',
+                'computeType': compute_type,
+                'privilegedMode': True,
                 'environmentVariables': [
                     {'name': 'ENV', 'value': 'dev', 'type': 'PLAINTEXT'}
-                ]
+                ] + self._target_environment_variables()
+            },
+            cache={
+                'type': 'LOCAL',
+                'modes': ['LOCAL_DOCKER_LAYER_CACHE', 'LOCAL_CUSTOM_CACHE']
             },
             logsConfig={
                 'cloudWatchLogs': {
@@ -43,15 +82,15 @@ class AwsCodePipeline(Pipeline):
                     'status': 'DISABLED'
                 }
             },
-            serviceRole=os.environ['CODEBUILD_ROLE_ARN'],
+            serviceRole=self.codebuild_role_arn,
         )
 
         pipeline_definition = {
             'name': pipeline_name,
-            'roleArn': os.environ['CODEPIPELINE_ROLE_ARN'],
+            'roleArn': self.codepipeline_role_arn,
             'artifactStore': {
                 'type': 'S3',
-                'location': os.environ['CODEPIPELINE_BUCKET']
+                'location': self.artifact_bucket
             },
             'stages': [
                 {
@@ -69,7 +108,7 @@ class AwsCodePipeline(Pipeline):
                                 'Owner': repository_name.split('/')[0],
                                 'Repo': repository_name.split('/')[1],
                                 'Branch': branch_name,
-                                'OAuthToken': os.environ['GITHUB_TOKEN']
+                                'OAuthToken': source_token
                             },
                             'outputArtifacts': [{'name': 'SourceOutput'}],
                             'runOrder': 1
@@ -98,35 +137,275 @@ class AwsCodePipeline(Pipeline):
                         }
                     ]
                 },
-                {
-                    'name': 'Deploy',
-                    'actions': [
-                        {
-                            'name': 'DeployAction',
-                            'actionTypeId': {
-                                'category': 'Deploy',
-                                'owner': 'AWS',
-                                'provider': 'CloudFormation',
-                                'version': '1'
-                            },
-                            'configuration': {
-                                'ActionMode': 'CREATE_UPDATE',
-                                'StackName': f"{pipeline_name}-stack",
-                                'Capabilities': 'CAPABILITY_IAM',
-                                'TemplatePath': 'BuildOutput::infra/infra.yaml',
-                                'TemplateConfiguration': 'BuildOutput::infra/dev.json',
-                                'RoleArn': os.environ['CODEPIPELINE_ROLE_ARN']
-                            },
-                            'inputArtifacts': [
-                                {'name': 'BuildOutput'}
-                            ],
-                            'runOrder': 1
-                        }
-                    ]
-                }
+                self._deploy_stage(pipeline_name, iac_type)
             ]
         }
 
-        response = self.codepipeline_client.create_pipeline(pipeline=pipeline_definition)
+        load_test = load_test_config(service_info)
+        if load_test:
+            pipeline_definition['stages'].append(self._load_test_stage(pipeline_name, load_test, iac_info or {}))
+
+        try:
+            return self.codepipeline_client.create_pipeline(pipeline=pipeline_definition)
+        except self.codepipeline_client.exceptions.PipelineNameInUseException:
+            # Left behind by an earlier attempt of the same bootstrap
+            print(f"Pipeline {pipeline_name} already exists, updating it.")
+            return self.codepipeline_client.update_pipeline(pipeline=pipeline_definition)
+
+    def pipeline_resources(self, service_info: dict, iac_type: str = "cloudformation") -> dict:
+        pipeline_name = f"{service_info['name']}-pipeline"
+
+        build_projects = [f"{pipeline_name}-build"]
+        if iac_type == "terraform":
+            build_projects.append(f"{pipeline_name}-deploy")
+        if load_test_config(service_info):
+            build_projects.append(f"{pipeline_name}-loadtest")
+
+        resources = {
+            "pipeline": pipeline_name,
+            "buildProjects": build_projects,
+            "stack": f"{pipeline_name}-stack",
+            "iacType": iac_type,
+        }
+
+        if iac_type == "terraform":
+            resources["terraformState"] = self._terraform_state_key(pipeline_name)
+
+        if self.target:
+            resources["artifactBucket"] = self.artifact_bucket
+
+        return resources
+
+    def delete_pipeline(self, resources: dict):
+        try:
+            self.codepipeline_client.delete_pipeline(name=resources["pipeline"])
+            print(f"Pipeline {resources['pipeline']} deleted.")
+        except self.codepipeline_client.exceptions.PipelineNotFoundException:
+            print(f"Pipeline '{resources['pipeline']}' does not exist.")
+
+        # DeleteProject succeeds for projects that do not exist
+        for project_name in resources.get("buildProjects", []):
+            self.codebuild_client.delete_project(name=project_name)
+            print(f"Build project {project_name} deleted.")
+
+    def delete_stack(self, resources: dict):
+        # Terraform manages the same CloudFormation stack, so both backends are removed the same way.
+        # Deletion runs asynchronously under the role the stack was created with.
+        self.cloudformation_client.delete_stack(StackName=resources["stack"])
+        print(f"Deletion of stack {resources['stack']} started.")
+
+        if resources.get("terraformState"):
+            bucket = resources.get("artifactBucket", self.artifact_bucket)
+            self.s3_client.delete_object(Bucket=bucket, Key=resources["terraformState"])
+
+    def _create_or_update_project(self, **project) -> dict:
+        try:
+            return self.codebuild_client.create_project(**project)
+        except self.codebuild_client.exceptions.ResourceAlreadyExistsException:
+            # Left behind by an earlier attempt of the same bootstrap; UpdateProject takes the same settings
+            print(f"Build project {project['name']} already exists, updating it.")
+            return self.codebuild_client.update_project(**project)
+
+    def _target_environment_variables(self) -> list:
+        # Project variables take precedence over the buildspec, which holds the Lambda's own registry and region
+        if not self.target:
+            return []
+
+        return [
+            {'name': 'ECR_REGISTRY_URI', 'value': self.target["ecrRegistryUri"], 'type': 'PLAINTEXT'},
+            {'name': 'AWS_DEFAULT_REGION', 'value': self.target["region"], 'type': 'PLAINTEXT'}
+        ]
+
+    def _terraform_state_key(self, pipeline_name: str) -> str:
+        return f"terraform/{pipeline_name}/terraform.tfstate"
+
+    def _deploy_stage(self, pipeline_name: str, iac_type: str) -> dict:
+        stack_name = f"{pipeline_name}-stack"
+
+        if iac_type in ("cloudformation", "cdk"):
+            # CDK templates are synthesized by the bootstrapper, so both deploy with CloudFormation
+            action = {
+                'name': 'DeployAction',
+                'actionTypeId': {
+                    'category': 'Deploy',
+                    'owner': 'AWS',
+                    'provider': 'CloudFormation',
+                    'version': '1'
+                },
+                'configuration': {
+                    'ActionMode': 'CREATE_UPDATE',
+                    'StackName': stack_name,
+                    'Capabilities': 'CAPABILITY_IAM',
+                    'TemplatePath': f'BuildOutput::{self.infra_path}/infra.yaml',
+                    'TemplateConfiguration': f'BuildOutput::{self.infra_path}/dev.json',
+                    'RoleArn': self.codepipeline_role_arn
+                },
+                'inputArtifacts': [
+                    {'name': 'BuildOutput'}
+                ],
+                'namespace': 'DeployVariables',
+                'runOrder': 1
+            }
+        elif iac_type == "terraform":
+            deploy_project = self._create_terraform_deploy_project(pipeline_name, stack_name)
+            action = {
+                'name': 'DeployAction',
+                'actionTypeId': {
+                    'category': 'Build',
+                    'owner': 'AWS',
+                    'provider': 'CodeBuild',
+                    'version': '1'
+                },
+                'configuration': {
+                    'ProjectName': deploy_project['project']['name']
+                },
+                'inputArtifacts': [
+                    {'name': 'BuildOutput'}
+                ],
+                'namespace': 'DeployVariables',
+                'runOrder': 1
+            }
+        else:
+            raise ValueError(f"Unsupported iac_type type: {iac_type}")
+
+        return {
+            'name': 'Deploy',
+            'actions': [action]
+        }
+
+    def _create_terraform_deploy_project(self, pipeline_name: str, stack_name: str) -> dict:
+        state_bucket = self.artifact_bucket
+        state_key = self._terraform_state_key(pipeline_name)
+
+        buildspec = f"""
+version: 0.2
+
+phases:
+  install:
+    commands:
+      - curl -sSLo /tmp/terraform.zip https://releases.hashicorp.com/terraform/${{TERRAFORM_VERSION}}/terraform_${{TERRAFORM_VERSION}}_linux_amd64.zip
+      - unzip -o -q /tmp/terraform.zip -d /usr/local/bin
+  build:
+    commands:
+      - cd {self.infra_path}
+      - terraform init -input=false -backend-config="bucket={state_bucket}" -backend-config="key={state_key}" -backend-config="region=$AWS_DEFAULT_REGION"
+      - terraform apply -input=false -auto-approve -var-file=dev.json -var="stack_name={stack_name}"
+      - export NetworkLoadBalancerDNS=$(terraform output -json stack_outputs | python3 -c "import json,sys; print(json.load(sys.stdin)['NetworkLoadBalancerDNS'])")
+
+env:
+  exported-variables:
+    - NetworkLoadBalancerDNS
+"""
+
+        return self._create_or_update_project(
+            name=f"{pipeline_name}-deploy",
+            source={
+                'type': 'CODEPIPELINE',
+                'buildspec': buildspec
+            },
+            artifacts={
+                'type': 'CODEPIPELINE'
+            },
+            environment={
+                'type': 'LINUX_CONTAINER',
+                'image': 'aws/codebuild/standard:5.0',
+                'computeType': 'BUILD_GENERAL1_SMALL',
+                'environmentVariables': [
+                    {'name': 'TERRAFORM_VERSION', 'value': '1.9.8', 'type': 'PLAINTEXT'}
+                ]
+            },
+            logsConfig={
+                'cloudWatchLogs': {
+                    'status': 'ENABLED',
+                    'groupName': f"/aws/codebuild/{pipeline_name}-deploy",
+                    'streamName': '{build-id}'
+                },
+                's3Logs': {
+                    'status': 'DISABLED'
+                }
+            },
+            serviceRole=self.codebuild_role_arn,
+        )
+
+    def _load_test_stage(self, pipeline_name: str, load_test: dict, iac_info: dict) -> dict:
+        project_name = f"{pipeline_name}-loadtest"
+
+        subnets = iac_info.get("subnets", [])
+        if isinstance(subnets, str):
+            subnets = [subnet.strip() for subnet in subnets.split(",") if subnet.strip()]
+
+        buildspec = """
+version: 0.2
+
+phases:
+  build:
+    commands:
+      - python3 loadtest/run.py --base-url "http://$SERVICE_HOST" --report loadtest-report.json
+artifacts:
+  files:
+    - loadtest-report.json
+"""
 
-        return response
+        self._create_or_update_project(
+            name=project_name,
+            source={
+                'type': 'CODEPIPELINE',
+                'buildspec': buildspec
+            },
+            artifacts={
+                'type': 'CODEPIPELINE'
+            },
+            environment={
+                'type': 'LINUX_CONTAINER',
+                'image': 'aws/codebuild/standard:5.0',
+                'computeType': 'BUILD_GENERAL1_SMALL'
+            },
+            vpcConfig={
+                'vpcId': iac_info["vpc"],
+                'subnets': subnets,
+                'securityGroupIds': load_test["securityGroupIds"]
+            },
+            logsConfig={
+                'cloudWatchLogs': {
+                    'status': 'ENABLED',
+                    'groupName': f"/aws/codebuild/{project_name}",
+                    'streamName': '{build-id}'
+                },
+                's3Logs': {
+                    'status': 'DISABLED'
+                }
+            },
+            serviceRole=self.codebuild_role_arn,
+        )
+
+        return {
+            'name': 'LoadTest',
+            'actions': [
+                {
+                    'name': 'LoadTestAction',
+                    'actionTypeId': {
+                        'category': 'Test',
+                        'owner': 'AWS',
+                        'provider': 'CodeBuild',
+                        'version': '1'
+                    },
+                    'configuration': {
+                        'ProjectName': project_name,
+                        'EnvironmentVariables': json.dumps([
+                            {
+                                'name': 'SERVICE_HOST',
+                                'value': '#{DeployVariables.NetworkLoadBalancerDNS}',
+                                'type': 'PLAINTEXT'
+                            }
+                        ])
+                    },
+                    'inputArtifacts': [
+                        {'name': 'BuildOutput'}
+                    ],
+                    'outputArtifacts': [
+                        {'name': 'LoadTestReport'}
+                    ],
+                    'runOrder': 1
+                }
+            ]
+        }
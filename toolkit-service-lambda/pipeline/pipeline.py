@@ -3,6 +3,25 @@ from abc import ABC, abstractmethod
 
 class Pipeline(ABC):
     @abstractmethod
-    def create_pipeline(self, service_info: dict, scm_info: dict):
-        """Abstract method to create a pipeline."""
+    def create_pipeline(self, service_info: dict, scm_info: dict, iac_type: str = "cloudformation", iac_info: dict = None,
+                        source_token: str = None):
+        """
+        Creates the pipeline, or updates it if an earlier attempt already created it. `source_token` is the
+        source repository's access token, used by the pipeline's source action.
+        """
+        pass
+
+    @abstractmethod
+    def pipeline_resources(self, service_info: dict, iac_type: str = "cloudformation") -> dict:
+        """Returns the names of the resources create_pipeline creates, as stored for teardown."""
+        pass
+
+    @abstractmethod
+    def delete_pipeline(self, resources: dict):
+        """Deletes the pipeline and build projects described by pipeline_resources."""
+        pass
+
+    @abstractmethod
+    def delete_stack(self, resources: dict):
+        """Starts deletion of the service stack deployed by the pipeline."""
         pass
@@ -0,0 +1,48 @@
+import os
+import boto3
+
+from artifacts.s3_artifact_store import S3ArtifactStore
+from docker_registry.ecr_registry import EcrRegistry
+from pipeline.aws_code_pipeline import AwsCodePipeline
+from source_repo.github_source_repo import GitHubSourceRepo
+from targets.deployment_targets import target_session
+
+
+class AwsProviders:
+    """Creates the AWS and GitHub clients the bootstrapper uses when deployed as a Lambda function."""
+
+    name = "aws"
+
+    def __init__(self):
+        self._services_table = None
+
+    def registry(self, session: boto3.session.Session = None, region: str = None):
+        return EcrRegistry(session, region)
+
+    def pipeline(self, session: boto3.session.Session = None, target: dict = None):
+        return AwsCodePipeline(session, target)
+
+    def source_repo(self, scm_type: str, scm_info: dict):
+        if scm_type == "github":
+            return GitHubSourceRepo(scm_info)
+
+        raise ValueError(f"Unsupported scm_type type: {scm_type}")
+
+    def services_table(self):
+        if self._services_table is None:
+            table_name = os.getenv("SERVICES_TABLE_NAME", "ServicesTable")
+            self._services_table = boto3.resource("dynamodb").Table(table_name)
+
+        return self._services_table
+
+    def artifact_store(self):
+        # Stage outputs are only kept when the stack provides a bucket for them
+        bucket = os.getenv("ARTIFACTS_BUCKET")
+
+        return S3ArtifactStore(bucket) if bucket else None
+
+    def session(self):
+        return boto3.session.Session()
+
+    def target_session(self, target: dict):
+        return target_session(target)
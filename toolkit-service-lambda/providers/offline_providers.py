@@ -0,0 +1,293 @@
+import os
+import json
+import shutil
+import threading
+import subprocess
+
+from artifacts.local_artifact_store import LocalArtifactStore
+from pipeline.aws_code_pipeline import AwsCodePipeline
+from docker_registry.registry import Registry
+from source_repo.source_repo import SourceRepo
+from workspace import workspace_root
+
+OFFLINE_ACCOUNT_ID = "000000000000"
+OFFLINE_REGION = "us-east-1"
+
+
+class OfflineProviders:
+    """
+    Runs the bootstrapper without AWS or GitHub.
+
+    Generated projects are pushed to local bare git repositories, AWS resources are recorded in
+    `plan` instead of created, and service records are kept in a local JSON file. With
+    `plan_only`, nothing is pushed either, so a run only shows what would be created.
+    """
+
+    name = "offline"
+
+    def __init__(self, root: str = None, plan_only: bool = False):
+        self.root = root or workspace_root()
+        self.plan_only = plan_only
+        self.plan = []
+        self._lock = threading.Lock()
+        self._services_table = LocalJsonTable(os.path.join(self.root, "services-table.json"))
+
+    def record(self, action: str, resource: str, name: str, **details):
+        entry = {"action": action, "resource": resource, "name": name}
+        entry.update(details)
+
+        # Targets are provisioned concurrently
+        with self._lock:
+            self.plan.append(entry)
+
+    def registry(self, session=None, region: str = None):
+        return NoopRegistry(self, region or OFFLINE_REGION)
+
+    def pipeline(self, session=None, target: dict = None):
+        return NoopPipeline(self, target)
+
+    def source_repo(self, scm_type: str, scm_info: dict):
+        if self.plan_only:
+            return NoopSourceRepo(self, scm_type, scm_info)
+
+        return LocalGitSourceRepo(os.path.join(self.root, "remotes"), scm_info)
+
+    def services_table(self):
+        return self._services_table
+
+    def artifact_store(self):
+        return LocalArtifactStore(os.path.join(self.root, "artifacts"))
+
+    def session(self):
+        return OfflineSession(OFFLINE_REGION)
+
+    def target_session(self, target: dict):
+        return OfflineSession(target["region"])
+
+
+class OfflineSession:
+    """Stands in for a boto3 session where only the caller identity and region are needed."""
+
+    def __init__(self, region_name: str):
+        self.region_name = region_name
+
+    def client(self, service_name: str, region_name: str = None):
+        if service_name != "sts":
+            raise RuntimeError(f"The offline providers do not support the {service_name} client")
+
+        return OfflineStsClient()
+
+
+class OfflineStsClient:
+
+    def get_caller_identity(self):
+        return {"Account": OFFLINE_ACCOUNT_ID}
+
+
+class NoopRegistry(Registry):
+
+    def __init__(self, providers: OfflineProviders, region: str):
+        self.providers = providers
+        self.region = region
+
+    def create_repository(self, repository_name: str, config: dict = None):
+        self.providers.record("create", "ecr-repository", repository_name, region=self.region, config=config or {})
+
+    def apply_policies(self, repository_name: str, config: dict = None):
+        self.providers.record("update", "ecr-repository", repository_name, region=self.region, config=config or {})
+
+    def delete_repository(self, repository_name: str):
+        self.providers.record("delete", "ecr-repository", repository_name, region=self.region)
+
+
+class NoopPipeline(AwsCodePipeline):
+    """Records the pipeline and build projects AwsCodePipeline would create, with the same names."""
+
+    def __init__(self, providers: OfflineProviders, target: dict = None):
+        self.providers = providers
+        self.target = target
+        self.region = target["region"] if target else OFFLINE_REGION
+        # Recorded in pipeline_resources for targets
+        self.artifact_bucket = target.get("artifactBucket") if target else None
+
+    def create_pipeline(self, service_info: dict, scm_info: dict, iac_type: str = "cloudformation", iac_info: dict = None,
+                        source_token: str = None):
+        resources = self.pipeline_resources(service_info, iac_type)
+
+        for project_name in resources["buildProjects"]:
+            self.providers.record("create", "codebuild-project", project_name, region=self.region)
+        self.providers.record("create", "codepipeline", resources["pipeline"], region=self.region,
+                              source=scm_info["repo"], iacType=iac_type)
+        self.providers.record("create", "cloudformation-stack", resources["stack"], region=self.region,
+                              createdBy=resources["pipeline"])
+
+    def delete_pipeline(self, resources: dict):
+        self.providers.record("delete", "codepipeline", resources["pipeline"], region=self.region)
+
+    def delete_stack(self, resources: dict):
+        self.providers.record("delete", "cloudformation-stack", resources["stack"], region=self.region)
+
+
+class NoopSourceRepo(SourceRepo):
+
+    def __init__(self, providers: OfflineProviders, scm_type: str, scm_info: dict):
+        self.providers = providers
+        self.scm_type = scm_type
+        self.repo = scm_info["repo"]
+
+    def create_repo(self):
+        self.providers.record("create", f"{self.scm_type}-repository", self.repo)
+
+    def commit(self, repo_dir: str, commit_message: str):
+        files = sum(len(names) for _, _, names in os.walk(repo_dir))
+        self.providers.record("push", f"{self.scm_type}-repository", self.repo, files=files, source=repo_dir)
+
+    def delete_repo(self):
+        self.providers.record("delete", f"{self.scm_type}-repository", self.repo)
+
+
+class LocalGitSourceRepo(SourceRepo):
+    """Pushes the generated project to a bare repository under `remotes_dir`, named after the repo URL."""
+
+    def __init__(self, remotes_dir: str, scm_info: dict):
+        repo_name = scm_info["repo"].rstrip('/').split('/')[-1]
+
+        self.remote_path = os.path.join(remotes_dir, f"{repo_name}.git")
+        self.email = scm_info.get("email") or "bootstrapper@localhost"
+        self.name = scm_info.get("name") or "Industry Toolkit"
+
+    def create_repo(self):
+        if os.path.exists(self.remote_path):
+            # Left behind by an earlier attempt of the same bootstrap
+            print(f"Repository {self.remote_path} already exists")
+            return
+
+        os.makedirs(os.path.dirname(self.remote_path), exist_ok=True)
+        self.git(None, "init", "--bare", "--initial-branch=main", self.remote_path)
+        print(f"Repository created at {self.remote_path}")
+
+    def commit(self, repo_dir: str, commit_message: str):
+        self.git(repo_dir, "init", "--initial-branch=main")
+        self.git(repo_dir, "add", ".")
+        self.git(repo_dir, "-c", f"user.email={self.email}", "-c", f"user.name={self.name}",
+                 "commit", "-q", "-m", commit_message)
+        self.git(repo_dir, "push", "-q", self.remote_path, "main")
+        print(f"Pushed {repo_dir} to {self.remote_path}")
+
+    def delete_repo(self):
+        shutil.rmtree(self.remote_path, ignore_errors=True)
+
+    def git(self, repo_dir, *args):
+        command = ["git"] + (["-C", repo_dir] if repo_dir else []) + list(args)
+
+        try:
+            subprocess.run(command, check=True, capture_output=True, text=True)
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(f"Git command failed: {e.stderr}")
+
+
+class LocalJsonTable:
+    """The subset of the DynamoDB Table API the bootstrapper uses, stored in a JSON file keyed by id."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def put_item(self, Item: dict):
+        with self._lock:
+            items = self.load()
+            items[Item["id"]] = Item
+            self.save(items)
+
+    def get_item(self, Key: dict, **kwargs) -> dict:
+        item = self.load().get(Key["id"])
+
+        return {"Item": item} if item is not None else {}
+
+    def delete_item(self, Key: dict):
+        with self._lock:
+            items = self.load()
+            items.pop(Key["id"], None)
+            self.save(items)
+
+    def update_item(self, Key: dict, UpdateExpression: str, ExpressionAttributeValues: dict, **kwargs):
+        # Only "SET a.b = :value, ..." expressions, which is all the bootstrapper writes
+        if not UpdateExpression.startswith("SET "):
+            raise ValueError(f"The local services table only supports SET updates: {UpdateExpression}")
+
+        with self._lock:
+            items = self.load()
+            item = items.setdefault(Key["id"], dict(Key))
+
+            for assignment in UpdateExpression[len("SET "):].split(","):
+                path, value = (part.strip() for part in assignment.split("="))
+                *parents, attribute = path.split(".")
+
+                target = item
+                for parent in parents:
+                    target = target.setdefault(parent, {})
+                target[attribute] = ExpressionAttributeValues[value]
+
+            self.save(items)
+
+    def scan(self, FilterExpression=None, **kwargs) -> dict:
+        items = list(self.load().values())
+
+        if FilterExpression is not None:
+            items = [item for item in items if matches(FilterExpression, item)]
+
+        return {"Items": items}
+
+    def load(self) -> dict:
+        try:
+            with open(self.path) as table_file:
+                return json.load(table_file)
+        except FileNotFoundError:
+            return {}
+
+    def save(self, items: dict):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as table_file:
+            json.dump(items, table_file, indent=2, default=str)
+        os.replace(tmp_path, self.path)
+
+
+# Evaluators for the boto3 conditions that lifecycle.services.filter_condition builds
+CONDITION_OPERATORS = {
+    "AND": lambda item, left, right: matches(left, item) and matches(right, item),
+    "OR": lambda item, left, right: matches(left, item) or matches(right, item),
+    "NOT": lambda item, condition: not matches(condition, item),
+    "=": lambda item, attribute, value: attribute_value(item, attribute) == value,
+    "<": lambda item, attribute, value: compare(attribute_value(item, attribute), value, lambda a, b: a < b),
+    "IN": lambda item, attribute, values: attribute_value(item, attribute) in values,
+}
+
+
+def matches(condition, item: dict) -> bool:
+    operator = condition.expression_operator
+
+    if operator not in CONDITION_OPERATORS:
+        raise ValueError(f"The local services table does not support the {operator} condition")
+
+    return CONDITION_OPERATORS[operator](item, *condition.get_expression()["values"])
+
+
+def attribute_value(item: dict, attribute):
+    value = item
+    for part in attribute.name.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+
+    return value
+
+
+def compare(value, other, operator) -> bool:
+    # Like DynamoDB, a missing attribute or one of another type never matches
+    if value is None or type(value) is not type(other):
+        return False
+
+    return operator(value, other)
+
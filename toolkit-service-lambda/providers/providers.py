@@ -0,0 +1,24 @@
+import os
+
+_providers = {}
+
+
+def get_providers(name: str = None):
+    """
+    Returns the providers selected by `name` or the BOOTSTRAP_PROVIDERS environment variable:
+    "aws" (the default) or "offline". Providers are created once per name and reused.
+    """
+    name = name or os.getenv("BOOTSTRAP_PROVIDERS", "aws")
+
+    if name not in _providers:
+        # Imported lazily so offline runs do not need AWS configuration
+        if name == "aws":
+            from providers.aws_providers import AwsProviders
+            _providers[name] = AwsProviders()
+        elif name == "offline":
+            from providers.offline_providers import OfflineProviders
+            _providers[name] = OfflineProviders()
+        else:
+            raise ValueError(f"Unsupported BOOTSTRAP_PROVIDERS value: {name}")
+
+    return _providers[name]
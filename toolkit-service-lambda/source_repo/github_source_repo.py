@@ -5,6 +5,8 @@ import requests
 import subprocess
 import logging
 
+from urllib.parse import urlparse
+
 from source_repo.source_repo import SourceRepo
 
 
@@ -14,13 +16,13 @@ class GitHubSourceRepo(SourceRepo):
 
     def __init__(self, scm_info):
         self.repo = scm_info['repo']
-        self.email = scm_info['email']
-        self.name = scm_info['name']
+        # Only needed to commit; teardown constructs the repo from the stored repo URL and secret key
+        self.email = scm_info.get('email')
+        self.name = scm_info.get('name')
         self.secret_key = scm_info['secretKey']
 
         self.github_token = self._get_github_token(self.secret_key)
-
-        os.environ['GITHUB_TOKEN'] = self.github_token
+        self.access_token = self.github_token
 
     def _get_github_token(self, secret_key):
         """Fetch the GitHub token from AWS Secrets Manager."""
@@ -48,12 +50,33 @@ class GitHubSourceRepo(SourceRepo):
 
         if response.status_code == 201:
             print(f"Repository '{service_name}' created successfully under {self.repo}.")
+        elif response.status_code == 422 and "already exists" in response.text:
+            # Left behind by an earlier attempt of the same bootstrap
+            print(f"Repository '{service_name}' already exists.")
         else:
             raise RuntimeError(f"Failed to create repository: {response.text}")
 
+    def delete_repo(self):
+        repository_name = urlparse(self.repo).path.strip('/')
+        url = f"https://api.github.com/repos/{repository_name}"
+        headers = {
+            "Authorization": f"token {self.github_token}",
+            "Accept": "application/vnd.github.v3+json"
+        }
+
+        # Requires a token with the delete_repo scope
+        response = requests.delete(url, headers=headers, timeout=30)
+
+        if response.status_code == 204:
+            print(f"Repository '{repository_name}' deleted.")
+        elif response.status_code == 404:
+            print(f"Repository '{repository_name}' does not exist.")
+        else:
+            raise RuntimeError(f"Failed to delete repository: {response.text}")
+
     def commit(self, repo_dir: str, commit_message: str):
         os.chdir(repo_dir)
-        authenticated_repo_url = self.repo.replace("https://", f"https://{os.environ['GITHUB_TOKEN']}@")
+        authenticated_repo_url = self.repo.replace("https://", f"https://{self.github_token}@")
 
         try:
             os.environ['HOME'] = '/tmp'
@@ -2,6 +2,9 @@ from abc import ABC, abstractmethod
 
 
 class SourceRepo(ABC):
+    # Credential the pipeline's source action uses to pull from the repository, if it needs one
+    access_token = None
+
     @abstractmethod
     def create_repo(self):
         """Create a new repository."""
@@ -11,3 +14,8 @@ class SourceRepo(ABC):
     def commit(self, repo_dir: str, commit_message: str):
         """Commit changes to the GitHub repository."""
         pass
+
+    @abstractmethod
+    def delete_repo(self):
+        """Delete the repository. Deleting a missing repository is not an error."""
+        pass
@@ -0,0 +1,50 @@
+import time
+
+from contextlib import contextmanager
+
+
+class StageTimer:
+    """
+    Records wall-clock time per bootstrap stage, so slow stages show up in logs and plans.
+
+    Listeners, such as a JobStatus, are told when each stage starts and finishes.
+    """
+
+    def __init__(self, listeners: list = None):
+        self.durations = {}
+        self.listeners = list(listeners or [])
+
+    @contextmanager
+    def stage(self, name: str):
+        for listener in self.listeners:
+            listener.stage_started(name)
+
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+            for listener in self.listeners:
+                listener.stage_finished(name, seconds, error)
+
+    def durations_ms(self) -> dict:
+        # Whole milliseconds, since DynamoDB does not accept floats
+        return {name: int(round(seconds * 1000)) for name, seconds in self.durations.items()}
+
+    def report(self) -> str:
+        total = sum(self.durations.values())
+        width = max((len(name) for name in self.durations), default=0)
+
+        lines = [
+            f"{name.ljust(width)}  {seconds * 1000:10.1f} ms  {seconds / total * 100 if total else 0:5.1f}%"
+            for name, seconds in self.durations.items()
+        ]
+        lines.append(f"{'total'.ljust(width)}  {total * 1000:10.1f} ms")
+
+        return "\n".join(lines)
@@ -0,0 +1,96 @@
+import os
+import re
+import boto3
+
+ACCOUNT_ID = re.compile(r"^\d{12}$")
+REGION = re.compile(r"^[a-z]{2}(-[a-z]+)+-\d$")
+
+# Names of the resources every target account provides for the toolkit, overridable in the "targets" block
+TARGET_DEFAULTS = {
+    "roleName": os.getenv("TARGET_ROLE_NAME", "IndustryToolkitTargetRole"),
+    "codeBuildRoleName": "IndustryToolkitCodeBuildRole",
+    "codePipelineRoleName": "IndustryToolkitCodePipelineRole",
+    "artifactBucketPrefix": "industry-toolkit-artifacts",
+}
+
+
+def deployment_targets(targets: dict, iac_info: dict) -> list:
+    """
+    Expands the "targets" block of the payload into one target per account and region.
+
+    Example:
+        "targets": {
+            "accounts": ["111111111111", "222222222222"],
+            "regions": ["us-east-1", "eu-west-1"],
+            "iac": {
+                "111111111111/us-east-1": {"vpc": "vpc-...", "subnets": "subnet-...,subnet-..."}
+            }
+        }
+
+    Each target's IaC parameters are the iac block overlaid with its "<account>/<region>" entry,
+    since VPCs and subnets differ between accounts and regions. Returns [] without a targets block.
+    """
+    if not targets:
+        return []
+
+    targets = dict(targets)
+    accounts = [str(account) for account in targets.pop("accounts", [])]
+    regions = list(targets.pop("regions", []))
+    overrides = targets.pop("iac", {}) or {}
+
+    unknown = set(targets) - set(TARGET_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unsupported targets fields: {', '.join(sorted(unknown))}")
+
+    settings = dict(TARGET_DEFAULTS)
+    settings.update(targets)
+
+    if not accounts or not regions:
+        raise ValueError("targets.accounts and targets.regions must each list at least one entry")
+    for account in accounts:
+        if not ACCOUNT_ID.match(account):
+            raise ValueError(f"targets.accounts entries must be 12-digit account ids, got {account!r}")
+    for region in regions:
+        if not REGION.match(region):
+            raise ValueError(f"targets.regions entries must be region names, got {region!r}")
+
+    expanded = []
+    for account in accounts:
+        for region in regions:
+            target_iac = dict(iac_info)
+            target_iac.update(overrides.get(f"{account}/{region}", {}))
+
+            expanded.append({
+                "id": f"{account}-{region}",
+                "account": account,
+                "region": region,
+                "roleArn": f"arn:aws:iam::{account}:role/{settings['roleName']}",
+                "codeBuildRoleArn": f"arn:aws:iam::{account}:role/{settings['codeBuildRoleName']}",
+                "codePipelineRoleArn": f"arn:aws:iam::{account}:role/{settings['codePipelineRoleName']}",
+                "artifactBucket": f"{settings['artifactBucketPrefix']}-{account}-{region}",
+                "ecrRegistryUri": f"{account}.dkr.ecr.{region}.amazonaws.com",
+                "iac": target_iac,
+            })
+
+    unmatched = set(overrides) - {f"{t['account']}/{t['region']}" for t in expanded}
+    if unmatched:
+        raise ValueError(f"targets.iac has entries for unknown targets: {', '.join(sorted(unmatched))}")
+
+    return expanded
+
+
+def target_session(target: dict) -> boto3.session.Session:
+    """Returns a session in the target's account and region, using the target role."""
+    sts_client = boto3.client("sts")
+
+    credentials = sts_client.assume_role(
+        RoleArn=target["roleArn"],
+        RoleSessionName="industry-toolkit-bootstrapper"
+    )["Credentials"]
+
+    return boto3.session.Session(
+        aws_access_key_id=credentials["AccessKeyId"],
+        aws_secret_access_key=credentials["SecretAccessKey"],
+        aws_session_token=credentials["SessionToken"],
+        region_name=target["region"]
+    )
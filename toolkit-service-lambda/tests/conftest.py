@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The Lambda's modules import each other from the function root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,97 @@
+import json
+
+import pytest
+
+import handler
+from providers.offline_providers import OfflineProviders
+
+PAYLOAD = {"service": {"name": "petstore", "type": "spring"}, "iac": {"cloudformation": {}}}
+
+
+class Context:
+    invoked_function_arn = "arn:aws:lambda:us-east-1:000000000000:function:bootstrapper:live"
+
+
+@pytest.fixture
+def providers(tmp_path, monkeypatch):
+    providers = OfflineProviders(root=str(tmp_path), plan_only=True)
+    monkeypatch.setattr(handler, "get_providers", lambda: providers)
+    return providers
+
+
+def post(payload):
+    return handler.process_api_request({"httpMethod": "POST", "requestContext": {}, "body": json.dumps(payload)},
+                                       Context())
+
+
+def get(project_id, query=None):
+    return handler.process_api_request({"httpMethod": "GET", "requestContext": {}, "pathParameters": {"id": project_id},
+                                        "queryStringParameters": query}, Context())
+
+
+def test_post_fails_the_job_when_the_bootstrap_cannot_start(providers, monkeypatch):
+    def throttled(*args):
+        raise RuntimeError("Rate exceeded")
+
+    monkeypatch.setattr(handler, "start_async_bootstrap", throttled)
+
+    response = post(PAYLOAD)
+
+    assert response["statusCode"] == 503
+    body = json.loads(response["body"])
+    job = providers.services_table().get_item(Key={"id": body["id"]})["Item"]["job"]
+    assert job["status"] == "FAILED"
+    assert job["error"]["message"] == "Rate exceeded"
+
+
+def test_post_accepts_and_starts_the_bootstrap(providers, monkeypatch):
+    started = []
+    monkeypatch.setattr(handler, "start_async_bootstrap", lambda *args: started.append(args))
+
+    response = post(PAYLOAD)
+
+    assert response["statusCode"] == 202
+    assert started[0][0] == Context.invoked_function_arn
+    assert json.loads(get(started[0][1])["body"])["status"] == "PENDING"
+
+
+@pytest.mark.parametrize("wait", ["nan", "inf", "soon"])
+def test_get_rejects_invalid_waits(providers, wait):
+    assert get("service-1", {"since": "1", "wait": wait})["statusCode"] == 400
+
+
+def test_get_unknown_service(providers):
+    assert get("missing")["statusCode"] == 404
+
+
+@pytest.mark.parametrize("payload", [
+    {"iac": {"cloudformation": {}}},
+    {"service": {"name": "petstore", "type": "spring"}, "iac": {"pulumi": {}}},
+    {"service": {"name": "petstore", "type": "spring", "lifecycle": {"ttlHours": 0}}, "iac": {"cloudformation": {}}},
+])
+def test_post_rejects_invalid_payloads_without_a_record(providers, monkeypatch, payload):
+    monkeypatch.setattr(handler, "start_async_bootstrap", lambda *args: pytest.fail("bootstrap started"))
+
+    assert post(payload)["statusCode"] == 400
+    assert providers.services_table().scan()["Items"] == []
+
+
+def test_direct_invocation_rejects_invalid_payloads_without_a_record(providers):
+    with pytest.raises(ValueError):
+        handler.process_service_creation({"service": {"name": "petstore", "type": "spring"}, "iac": {"pulumi": {}}},
+                                         providers)
+
+    assert providers.services_table().scan()["Items"] == []
+
+
+def test_invalid_accepted_bootstrap_fails_its_record(providers, monkeypatch):
+    monkeypatch.setattr(handler, "start_async_bootstrap", lambda *args: None)
+    project_id = json.loads(post(PAYLOAD)["body"])["id"]
+
+    with pytest.raises(ValueError):
+        handler.process_service_creation({"service": {"name": "petstore", "type": "spring"}}, providers,
+                                         project_id=project_id)
+
+    job = json.loads(get(project_id)["body"])
+    assert job["status"] == "FAILED"
+    assert job["error"]["type"] == "ValueError"
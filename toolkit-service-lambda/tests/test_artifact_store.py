@@ -0,0 +1,124 @@
+import hashlib
+import io
+import json
+import os
+
+import pytest
+
+from artifacts.artifact_store import artifact_key, content_hash, pack, piped, unpack
+from artifacts.local_artifact_store import LocalArtifactStore
+from handler import process_service_creation
+from providers.offline_providers import OfflineProviders
+from stage_timer import StageTimer
+
+PAYLOAD = {
+    "service": {"name": "petstore", "type": "spring", "description": "Pet store",
+                "openapi": {"model": "petstore.yaml"}},
+    "scm": {"github": {"repo": "https://github.com/example/petstore"}},
+    "iac": {"cloudformation": {"vpc": "vpc-1", "subnets": "subnet-1,subnet-2"}},
+}
+
+
+def write_project(root):
+    os.makedirs(os.path.join(root, "app", "src"))
+    with open(os.path.join(root, "app", "src", "Main.java"), "w") as source:
+        source.write("class Main {}")
+    with open(os.path.join(root, "app", "mvnw"), "w") as wrapper:
+        wrapper.write("#!/bin/sh")
+    os.chmod(os.path.join(root, "app", "mvnw"), 0o755)
+    os.symlink("app/mvnw", os.path.join(root, "mvnw"))
+
+
+def test_pack_and_unpack_round_trip(tmp_path):
+    write_project(tmp_path / "project")
+
+    archive = io.BytesIO()
+    pack(str(tmp_path / "project"), archive)
+    archive.seek(0)
+    unpack(archive, str(tmp_path / "restored"))
+
+    assert content_hash(str(tmp_path / "restored")) == content_hash(str(tmp_path / "project"))
+    assert os.readlink(tmp_path / "restored" / "mvnw") == "app/mvnw"
+    assert os.access(tmp_path / "restored" / "app" / "mvnw", os.X_OK)
+
+
+def test_content_hash_covers_contents_and_modes(tmp_path):
+    write_project(tmp_path / "project")
+    digest = content_hash(str(tmp_path / "project"))
+
+    os.chmod(tmp_path / "project" / "app" / "mvnw", 0o644)
+    assert content_hash(str(tmp_path / "project")) != digest
+
+    os.chmod(tmp_path / "project" / "app" / "mvnw", 0o755)
+    (tmp_path / "project" / "app" / "src" / "Main.java").write_text("class Main { }")
+    assert content_hash(str(tmp_path / "project")) != digest
+
+
+def test_store_is_content_addressed(tmp_path):
+    store = LocalArtifactStore(str(tmp_path / "artifacts"))
+    write_project(tmp_path / "first")
+    write_project(tmp_path / "second")
+
+    first = store.save(str(tmp_path / "first"))
+    second = store.save(str(tmp_path / "second"))
+
+    assert first["key"] == artifact_key(first["sha256"])
+    assert first["uploaded"] is True
+    assert second == {"key": first["key"], "sha256": first["sha256"], "uploaded": False}
+
+    store.load(first["sha256"], str(tmp_path / "restored"))
+    assert content_hash(str(tmp_path / "restored")) == first["sha256"]
+
+
+def test_piped_raises_producer_errors(tmp_path):
+    def produce(pipe):
+        pipe.write(b"partial")
+        raise RuntimeError("upload source vanished")
+
+    with pytest.raises(RuntimeError, match="vanished"):
+        with piped(produce) as reader:
+            while reader.read(1024):
+                pass
+
+
+def test_retried_bootstrap_restores_the_stored_project(tmp_path, monkeypatch):
+    monkeypatch.setenv("WORKSPACE_ROOT", str(tmp_path / "workspace"))
+    providers = OfflineProviders(root=str(tmp_path), plan_only=True)
+
+    # What the first attempt left behind: the stored project, and a job that failed while pushing it
+    write_project(tmp_path / "generated")
+    project = providers.artifact_store().save(str(tmp_path / "generated"))
+    providers.services_table().put_item(Item={"id": "service-1", "job": {
+        "status": "FAILED", "version": 9, "stages": {},
+        "checkpoint": {"generatedOutput": {"filesRemoved": 3}, "project": project,
+                       "payloadHash": hashlib.sha256(json.dumps(PAYLOAD, sort_keys=True).encode()).hexdigest()},
+    }})
+
+    timer = StageTimer()
+    item = process_service_creation(PAYLOAD, providers, timer, project_id="service-1")
+
+    assert "restore" in timer.durations and "codegen" not in timer.durations
+    assert content_hash(str(tmp_path / "workspace" / "service-1")) == project["sha256"]
+    assert item["metadata"]["generatedOutput"] == {"filesRemoved": 3}
+    assert item["metadata"]["artifacts"] == {"project": project}
+    assert item["job"]["status"] == "SUCCEEDED" and item["job"]["version"] > 9
+    assert ("push", "github-repository") in [(entry["action"], entry["resource"]) for entry in providers.plan]
+
+
+def test_retry_skips_the_push_of_a_committed_project(tmp_path, monkeypatch):
+    monkeypatch.setenv("WORKSPACE_ROOT", str(tmp_path / "workspace"))
+    providers = OfflineProviders(root=str(tmp_path), plan_only=True)
+
+    write_project(tmp_path / "generated")
+    project = providers.artifact_store().save(str(tmp_path / "generated"))
+    providers.services_table().put_item(Item={"id": "service-1", "job": {
+        "status": "FAILED", "version": 12, "stages": {},
+        "checkpoint": {"generatedOutput": {}, "project": project, "committed": True,
+                       "payloadHash": hashlib.sha256(json.dumps(PAYLOAD, sort_keys=True).encode()).hexdigest()},
+    }})
+
+    timer = StageTimer()
+    process_service_creation(PAYLOAD, providers, timer, project_id="service-1")
+
+    assert "scm" not in timer.durations
+    assert "github-repository" not in [entry["resource"] for entry in providers.plan]
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+
+import boto3
+import pytest
+from botocore.stub import Stubber
+
+from handler import process_service_creation
+from pipeline.aws_code_pipeline import AwsCodePipeline
+from providers.offline_providers import OfflineProviders
+from source_repo.github_source_repo import GitHubSourceRepo
+from stage_timer import StageTimer
+
+SERVICE = {"name": "petstore", "type": "spring", "description": "Pet store"}
+SCM = {"repo": "https://github.com/example/petstore", "secretKey": "github"}
+
+PAYLOAD = {
+    "service": {**SERVICE, "openapi": {"model": "petstore.yaml"}},
+    "scm": {"github": SCM},
+    "iac": {"cloudformation": {"vpc": "vpc-1", "subnets": "subnet-1,subnet-2"}},
+}
+
+PROJECT = {"name": "petstore-pipeline-build", "arn": "arn:aws:codebuild:us-east-1:111111111111:project/petstore"}
+PIPELINE = {"name": "petstore-pipeline", "roleArn": "arn:aws:iam::111111111111:role/pipeline", "stages": []}
+
+
+class StubbedPipeline:
+    """An AwsCodePipeline with stubbed clients that records the pipeline definitions it sends."""
+
+    def __init__(self):
+        session = boto3.session.Session(aws_access_key_id="test", aws_secret_access_key="test",
+                                        region_name="us-east-1")
+        self.pipeline = AwsCodePipeline(session)
+        self.codebuild = Stubber(self.pipeline.codebuild_client)
+        self.codepipeline = Stubber(self.pipeline.codepipeline_client)
+        self.definitions = []
+
+        def record(params, **kwargs):
+            self.definitions.append(params["pipeline"])
+
+        for operation in ("CreatePipeline", "UpdatePipeline"):
+            self.pipeline.codepipeline_client.meta.events.register(
+                f"provide-client-params.codepipeline.{operation}", record)
+
+    def __enter__(self):
+        self.codebuild.activate()
+        self.codepipeline.activate()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.codebuild.deactivate()
+        self.codepipeline.deactivate()
+
+
+@pytest.fixture
+def cold_environment(monkeypatch):
+    # A fresh container: nothing but the function's own configuration in the environment
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+    monkeypatch.setenv("CODEBUILD_ROLE_ARN", "arn:aws:iam::111111111111:role/codebuild")
+    monkeypatch.setenv("CODEPIPELINE_ROLE_ARN", "arn:aws:iam::111111111111:role/pipeline")
+    monkeypatch.setenv("CODEPIPELINE_BUCKET", "artifacts")
+    monkeypatch.setattr(GitHubSourceRepo, "_get_github_token", lambda self, secret_key: f"token-{secret_key}")
+
+
+def test_source_action_uses_the_given_token(cold_environment):
+    with StubbedPipeline() as stubbed:
+        stubbed.codebuild.add_response("create_project", {"project": PROJECT})
+        stubbed.codepipeline.add_response("create_pipeline", {"pipeline": PIPELINE})
+
+        stubbed.pipeline.create_pipeline(SERVICE, SCM, source_token="token-github")
+
+    source = stubbed.definitions[0]["stages"][0]["actions"][0]
+    assert source["configuration"]["OAuthToken"] == "token-github"
+    assert "GITHUB_TOKEN" not in os.environ
+
+
+def test_create_pipeline_requires_a_token(cold_environment):
+    with StubbedPipeline() as stubbed, pytest.raises(ValueError, match="access token"):
+        stubbed.pipeline.create_pipeline(SERVICE, SCM)
+
+
+def test_create_pipeline_updates_resources_left_by_an_earlier_attempt(cold_environment):
+    with StubbedPipeline() as stubbed:
+        stubbed.codebuild.add_client_error("create_project", service_error_code="ResourceAlreadyExistsException")
+        stubbed.codebuild.add_response("update_project", {"project": PROJECT})
+        stubbed.codepipeline.add_client_error("create_pipeline", service_error_code="PipelineNameInUseException")
+        stubbed.codepipeline.add_response("update_pipeline", {"pipeline": PIPELINE})
+
+        stubbed.pipeline.create_pipeline(SERVICE, SCM, source_token="token-github")
+
+        stubbed.codebuild.assert_no_pending_responses()
+        stubbed.codepipeline.assert_no_pending_responses()
+
+    assert [definition["name"] for definition in stubbed.definitions] == ["petstore-pipeline"] * 2
+
+
+def test_resumed_committed_bootstrap_creates_the_pipeline_in_a_cold_container(tmp_path, monkeypatch,
+                                                                             cold_environment):
+    monkeypatch.setenv("WORKSPACE_ROOT", str(tmp_path / "workspace"))
+    stubbed = StubbedPipeline()
+
+    class ColdContainerProviders(OfflineProviders):
+        def source_repo(self, scm_type, scm_info):
+            return GitHubSourceRepo(scm_info)
+
+        def pipeline(self, session=None, target=None):
+            return stubbed.pipeline
+
+    providers = ColdContainerProviders(root=str(tmp_path), plan_only=True)
+
+    os.makedirs(tmp_path / "generated" / "app")
+    (tmp_path / "generated" / "app" / "Main.java").write_text("class Main {}")
+    project = providers.artifact_store().save(str(tmp_path / "generated"))
+    providers.services_table().put_item(Item={"id": "service-1", "job": {
+        "status": "FAILED", "version": 4, "stages": {},
+        "checkpoint": {"generatedOutput": {}, "project": project, "committed": True,
+                       "payloadHash": hashlib.sha256(json.dumps(PAYLOAD, sort_keys=True).encode()).hexdigest()},
+    }})
+
+    timer = StageTimer()
+    with stubbed:
+        stubbed.codebuild.add_response("create_project", {"project": PROJECT})
+        stubbed.codepipeline.add_response("create_pipeline", {"pipeline": PIPELINE})
+
+        item = process_service_creation(PAYLOAD, providers, timer, project_id="service-1")
+
+    assert "scm" not in timer.durations
+    assert item["job"]["status"] == "SUCCEEDED"
+    assert stubbed.definitions[0]["stages"][0]["actions"][0]["configuration"]["OAuthToken"] == "token-github"
@@ -0,0 +1,84 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from build_strategies.registry import (BUILD_STRATEGIES, get_build_strategy, get_buildspec_generator,
+                                       get_dockerfile_generator)
+from codebuild.buildspec_generator import BuildspecGenerator
+from docker.dockerfile_generator import DockerfileGenerator
+from handler import infra_parameters
+from infra.cloudformation_infra_generator import CloudFormationInfraGenerator
+
+
+@pytest.mark.parametrize("build_mode, task_size", [
+    # JVM builds emit no task size, so the template's own defaults apply
+    ("default", {}),
+    ("native", {"taskCpu": "256", "taskMemory": "512"}),
+])
+def test_emitted_infra_parameters(tmp_path, monkeypatch, build_mode, task_size):
+    monkeypatch.setenv("WORKSPACE_ROOT", str(tmp_path))
+    generator = CloudFormationInfraGenerator()
+    iac = {"vpc": "vpc-1", "subnets": "subnet-1,subnet-2"}
+
+    params = infra_parameters(iac, get_build_strategy("spring", build_mode), {}, generator)
+    generator.generate_infra("service-1", params)
+
+    with open(tmp_path / "service-1" / "infra" / "dev.json") as config:
+        emitted = json.load(config)["Parameters"]
+
+    assert {k: v for k, v in emitted.items() if k in ("taskCpu", "taskMemory")} == task_size
+    assert emitted["vpc"] == "vpc-1"
+
+
+def test_payload_task_size_overrides_the_build_mode_defaults():
+    params = infra_parameters({"vpc": "vpc-1", "subnets": "subnet-1", "taskCpu": "1024", "taskMemory": "2048"},
+                              get_build_strategy("spring", "native"), {}, CloudFormationInfraGenerator())
+
+    assert (params["taskCpu"], params["taskMemory"]) == ("1024", "2048")
+
+
+@pytest.mark.parametrize("service_type, build_mode", [("go-server", "native"), ("haskell", "default")])
+def test_unsupported_strategies_are_rejected(service_type, build_mode):
+    with pytest.raises(ValueError):
+        get_build_strategy(service_type, build_mode)
+
+
+STRATEGIES = [(service_type, build_mode) for service_type, modes in BUILD_STRATEGIES.items() for build_mode in modes]
+
+FUNCTION_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize("service_type, build_mode", STRATEGIES)
+def test_every_strategy_loads_its_generators(service_type, build_mode):
+    assert isinstance(get_dockerfile_generator(service_type, build_mode), DockerfileGenerator)
+    assert isinstance(get_buildspec_generator(service_type, build_mode, session=object()), BuildspecGenerator)
+
+
+def test_strategies_are_imported_on_first_use():
+    script = ("import sys, build_strategies.registry; "
+              "print(sorted(m for m in sys.modules if m.startswith(('docker.', 'codebuild.'))))")
+    result = subprocess.run([sys.executable, "-c", script], cwd=FUNCTION_ROOT, capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == "[]"
+
+
+@pytest.mark.parametrize("service_type, build_mode", [
+    (service_type, build_mode) for service_type, build_mode in STRATEGIES
+    if (service_type, build_mode) != ("spring", "default")
+])
+def test_container_builds_are_multi_stage_with_cached_dependencies(tmp_path, monkeypatch, service_type, build_mode):
+    monkeypatch.setenv("WORKSPACE_ROOT", str(tmp_path))
+    # The native build adds its Maven plugin to the generated pom
+    os.makedirs(tmp_path / "service-1" / "app")
+    (tmp_path / "service-1" / "app" / "pom.xml").write_text("<project>\n  <dependencies>\n  </dependencies>\n</project>\n")
+
+    with open(get_dockerfile_generator(service_type, build_mode).generate_dockerfile("service-1")) as dockerfile:
+        content = dockerfile.read()
+
+    runtime_image = [line for line in content.splitlines() if line.startswith("FROM ")][-1]
+    assert " AS build" in content
+    assert "distroless" in runtime_image or "-slim" in runtime_image
+    assert "--mount=type=cache" in content
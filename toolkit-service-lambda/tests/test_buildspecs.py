@@ -0,0 +1,53 @@
+import pytest
+import yaml
+
+from codebuild.container_buildspec_generator import ContainerBuildspecGenerator
+from codebuild.java_maven_buildspec_generator import JavaMavenBuildspecGenerator
+
+
+class Session:
+    region_name = "us-east-1"
+
+
+def build_commands(tmp_path, registry_config, generator_class=ContainerBuildspecGenerator, phase="build"):
+    generator = generator_class(Session())
+    with open(generator.write_buildspec(str(tmp_path), "petstore", "111111111111", registry_config)) as buildspec:
+        return yaml.safe_load(buildspec)["phases"][phase]["commands"]
+
+
+@pytest.mark.parametrize("registry_config", [None, {"tagImmutability": False}])
+def test_mutable_repositories_cache_from_latest(tmp_path, registry_config):
+    commands = build_commands(tmp_path, registry_config)
+
+    assert "CACHE_IMAGE=$ECR_REGISTRY_URI/$ECR_REPOSITORY_NAME:latest" in commands
+    assert any("--cache-from $CACHE_IMAGE" in command for command in commands)
+
+
+def test_immutable_repositories_cache_from_the_last_pushed_image(tmp_path):
+    commands = build_commands(tmp_path, {"tagImmutability": True})
+
+    assert any(command.startswith("CACHE_TAG=$(aws ecr describe-images") for command in commands)
+    assert "CACHE_IMAGE=$ECR_REGISTRY_URI/$ECR_REPOSITORY_NAME:$CACHE_TAG" in commands
+    assert any("--cache-from $CACHE_IMAGE" in command for command in commands)
+    assert not any("$ECR_REGISTRY_URI/$ECR_REPOSITORY_NAME:latest" in command for command in commands)
+
+
+@pytest.mark.parametrize("generator_class", [ContainerBuildspecGenerator, JavaMavenBuildspecGenerator])
+def test_mutable_repositories_push_latest_and_the_commit(tmp_path, generator_class):
+    commands = build_commands(tmp_path, None, generator_class, phase="post_build")
+
+    assert "docker push $ECR_REGISTRY_URI/$ECR_REPOSITORY_NAME:latest" in commands
+    assert "docker push $ECR_REGISTRY_URI/$ECR_REPOSITORY_NAME:$CODEBUILD_RESOLVED_SOURCE_VERSION" in commands
+
+
+@pytest.mark.parametrize("generator_class", [ContainerBuildspecGenerator, JavaMavenBuildspecGenerator])
+def test_immutable_repositories_skip_pushing_a_tag_that_exists(tmp_path, generator_class):
+    commands = build_commands(tmp_path, {"tagImmutability": True}, generator_class, phase="post_build")
+    pushes = [command for command in commands if "docker push" in command]
+
+    assert pushes == [
+        "if aws ecr describe-images --repository-name $ECR_REPOSITORY_NAME "
+        "--image-ids imageTag=$CODEBUILD_RESOLVED_SOURCE_VERSION >/dev/null 2>&1; "
+        "then echo Image $CODEBUILD_RESOLVED_SOURCE_VERSION already pushed; "
+        "else docker push $ECR_REGISTRY_URI/$ECR_REPOSITORY_NAME:$CODEBUILD_RESOLVED_SOURCE_VERSION; fi"
+    ]
@@ -0,0 +1,118 @@
+import pytest
+
+from handler import provision_targets
+from providers.offline_providers import OfflineProviders
+from targets import deployment_targets as targets_module
+from targets.deployment_targets import deployment_targets
+
+IAC = {"vpc": "vpc-shared", "subnets": "subnet-1,subnet-2"}
+
+SERVICE = {"name": "petstore", "type": "spring"}
+SCM = {"repo": "https://github.com/example/petstore"}
+
+
+def test_no_targets_block():
+    assert deployment_targets(None, IAC) == []
+    assert deployment_targets({}, IAC) == []
+
+
+def test_targets_are_every_account_in_every_region():
+    targets = deployment_targets({
+        "accounts": ["111111111111", 222222222222],
+        "regions": ["us-east-1", "eu-west-1"],
+        "iac": {"222222222222/eu-west-1": {"vpc": "vpc-eu"}},
+    }, IAC)
+
+    assert [target["id"] for target in targets] == [
+        "111111111111-us-east-1", "111111111111-eu-west-1", "222222222222-us-east-1", "222222222222-eu-west-1",
+    ]
+
+    eu = targets[-1]
+    assert eu["roleArn"] == "arn:aws:iam::222222222222:role/IndustryToolkitTargetRole"
+    assert eu["codeBuildRoleArn"] == "arn:aws:iam::222222222222:role/IndustryToolkitCodeBuildRole"
+    assert eu["codePipelineRoleArn"] == "arn:aws:iam::222222222222:role/IndustryToolkitCodePipelineRole"
+    assert eu["artifactBucket"] == "industry-toolkit-artifacts-222222222222-eu-west-1"
+    assert eu["ecrRegistryUri"] == "222222222222.dkr.ecr.eu-west-1.amazonaws.com"
+    # Overrides apply to their own target only, on top of the shared iac block
+    assert eu["iac"] == {"vpc": "vpc-eu", "subnets": "subnet-1,subnet-2"}
+    assert targets[0]["iac"] == IAC
+
+
+def test_resource_names_can_be_overridden():
+    target, = deployment_targets({
+        "accounts": ["111111111111"], "regions": ["us-west-2"],
+        "roleName": "Deployer", "codeBuildRoleName": "Builder", "codePipelineRoleName": "Releaser",
+        "artifactBucketPrefix": "acme-artifacts",
+    }, IAC)
+
+    assert target["roleArn"] == "arn:aws:iam::111111111111:role/Deployer"
+    assert target["codeBuildRoleArn"] == "arn:aws:iam::111111111111:role/Builder"
+    assert target["codePipelineRoleArn"] == "arn:aws:iam::111111111111:role/Releaser"
+    assert target["artifactBucket"] == "acme-artifacts-111111111111-us-west-2"
+
+
+@pytest.mark.parametrize("targets", [
+    {"accounts": ["111111111111"], "regions": []},
+    {"accounts": [], "regions": ["us-east-1"]},
+    {"accounts": ["1111"], "regions": ["us-east-1"]},
+    {"accounts": ["111111111111"], "regions": ["mars-1"]},
+    {"accounts": ["111111111111"], "regions": ["us-east-1"], "owner": "me"},
+    {"accounts": ["111111111111"], "regions": ["us-east-1"], "iac": {"111111111111/eu-west-1": {}}},
+])
+def test_invalid_targets_are_rejected(targets):
+    with pytest.raises(ValueError):
+        deployment_targets(targets, IAC)
+
+
+def test_target_session_assumes_the_target_role(monkeypatch):
+    calls = []
+
+    class Sts:
+        def assume_role(self, **kwargs):
+            calls.append(kwargs)
+            return {"Credentials": {"AccessKeyId": "AKID", "SecretAccessKey": "secret", "SessionToken": "token"}}
+
+    monkeypatch.setattr(targets_module.boto3, "client", lambda service_name: Sts())
+    target, = deployment_targets({"accounts": ["111111111111"], "regions": ["eu-west-1"]}, IAC)
+
+    session = targets_module.target_session(target)
+
+    assert calls == [{"RoleArn": "arn:aws:iam::111111111111:role/IndustryToolkitTargetRole",
+                      "RoleSessionName": "industry-toolkit-bootstrapper"}]
+    assert session.region_name == "eu-west-1"
+    assert session.get_credentials().token == "token"
+
+
+def test_provisioning_creates_a_registry_and_pipeline_per_target(tmp_path):
+    providers = OfflineProviders(root=str(tmp_path), plan_only=True)
+    targets = deployment_targets({"accounts": ["111111111111"], "regions": ["us-east-1", "eu-west-1"]}, IAC)
+
+    results = provision_targets(providers, targets, SERVICE, SCM, "cloudformation", {}, "token")
+
+    assert [(result["target"], result["status"]) for result in results] == [
+        ("111111111111-us-east-1", "CREATED"), ("111111111111-eu-west-1", "CREATED"),
+    ]
+    created = sorted((entry["resource"], entry["region"]) for entry in providers.plan
+                     if entry["resource"] in ("ecr-repository", "codepipeline"))
+    assert created == [("codepipeline", "eu-west-1"), ("codepipeline", "us-east-1"),
+                       ("ecr-repository", "eu-west-1"), ("ecr-repository", "us-east-1")]
+    assert results[1]["resources"]["pipeline"]["pipeline"] == "petstore-pipeline"
+
+
+def test_a_failed_target_does_not_stop_the_others(tmp_path):
+
+    class PartlyFailingProviders(OfflineProviders):
+        def target_session(self, target):
+            if target["region"] == "eu-west-1":
+                raise RuntimeError("AccessDenied assuming the target role")
+            return super().target_session(target)
+
+    providers = PartlyFailingProviders(root=str(tmp_path), plan_only=True)
+    targets = deployment_targets({"accounts": ["111111111111"], "regions": ["us-east-1", "eu-west-1"]}, IAC)
+
+    created, failed = provision_targets(providers, targets, SERVICE, SCM, "cloudformation", {}, "token")
+
+    assert created["status"] == "CREATED"
+    assert failed["status"] == "FAILED" and "AccessDenied" in failed["error"]
+    # Recorded even though provisioning failed, so teardown can find the target
+    assert failed["resources"]["target"]["region"] == "eu-west-1"
@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+from docker_registry.ecr_policy import ECR_DEFAULTS, ecr_config, lifecycle_policy
+
+
+def test_config_defaults():
+    assert ecr_config(None) == ECR_DEFAULTS
+    assert ecr_config({"keepTaggedImages": 30})["keepTaggedImages"] == 30
+
+
+@pytest.mark.parametrize("ecr", [
+    {"keepImages": 5},
+    {"keepTaggedImages": -1},
+    {"keepTaggedImages": 10001},
+    {"keepTaggedImages": True},
+    {"expireUntaggedAfterDays": "7"},
+    {"scanOnPush": "yes"},
+    {"tagImmutability": 1},
+])
+def test_config_rejects_invalid_fields(ecr):
+    with pytest.raises(ValueError):
+        ecr_config(ecr)
+
+
+def test_lifecycle_policy_renders_both_rules():
+    policy = json.loads(lifecycle_policy(ecr_config({"keepTaggedImages": 30, "expireUntaggedAfterDays": 3})))
+
+    untagged, tagged = policy["rules"]
+    assert untagged["rulePriority"] == 1
+    assert untagged["selection"] == {"tagStatus": "untagged", "countType": "sinceImagePushed",
+                                     "countUnit": "days", "countNumber": 3}
+    assert tagged["rulePriority"] == 2
+    assert tagged["selection"] == {"tagStatus": "tagged", "tagPatternList": ["*"],
+                                   "countType": "imageCountMoreThan", "countNumber": 30}
+    assert all(rule["action"] == {"type": "expire"} for rule in policy["rules"])
+
+
+@pytest.mark.parametrize("disabled", [False, 0, None])
+def test_disabled_rules_are_left_out(disabled):
+    policy = json.loads(lifecycle_policy(ecr_config({"expireUntaggedAfterDays": disabled})))
+
+    assert [rule["selection"]["tagStatus"] for rule in policy["rules"]] == ["tagged"]
+
+
+def test_no_policy_when_both_rules_are_disabled():
+    assert lifecycle_policy(ecr_config({"keepTaggedImages": False, "expireUntaggedAfterDays": 0})) is None
@@ -0,0 +1,42 @@
+import pytest
+
+from infra import cdk_infra_generator
+from infra.cdk_infra_generator import CdkInfraGenerator
+
+
+@pytest.fixture
+def cdk_installed(monkeypatch):
+    monkeypatch.setattr(cdk_infra_generator.shutil, "which", lambda command: f"/usr/bin/{command}")
+    monkeypatch.setattr(cdk_infra_generator.util, "find_spec", lambda name: object())
+
+
+def test_cdk_include_parameters_are_template_strings(tmp_path, monkeypatch, cdk_installed):
+    generator = CdkInfraGenerator(cache_dir=str(tmp_path / "cache"))
+    written = {}
+
+    def run_synth(app_dir, params):
+        written.update(params)
+        return "{}"
+
+    monkeypatch.setenv("WORKSPACE_ROOT", str(tmp_path))
+    monkeypatch.setattr(generator, "run_synth", run_synth)
+
+    generator.generate_infra("service-1", {
+        "vpc": "vpc-1",
+        "subnets": "subnet-1, subnet-2",
+        "enableObservability": True,
+        "taskCpu": 512,
+        "scaling": {"minCapacity": 2, "maxCapacity": 4},
+    })
+
+    assert written["subnets"] == ["subnet-1", "subnet-2"]
+    assert written["enableObservability"] == "true"
+    assert written["taskCpu"] == "512"
+    assert all(isinstance(value, (str, list)) for value in written.values())
+
+
+def test_cdk_backend_requires_the_cdk_image(tmp_path, monkeypatch):
+    monkeypatch.setattr(cdk_infra_generator.shutil, "which", lambda command: None)
+
+    with pytest.raises(ValueError, match="WITH_CDK=true"):
+        CdkInfraGenerator(cache_dir=str(tmp_path / "cache"))
@@ -0,0 +1,87 @@
+import math
+
+import pytest
+
+from lifecycle import job_status
+from lifecycle.job_status import JobStatus, job_view, wait_for_update
+from providers.offline_providers import LocalJsonTable
+
+
+class AdvancingTable:
+    """Returns the given records in turn, so each poll sees the next version of the job."""
+
+    def __init__(self, items):
+        self.items = list(items)
+        self.reads = 0
+
+    def get_item(self, Key, **kwargs):
+        item = self.items[min(self.reads, len(self.items) - 1)]
+        self.reads += 1
+        return {"Item": item} if item is not None else {}
+
+
+def record(status, version):
+    return {"id": "service-1", "job": {"status": status, "version": version, "stages": {}}}
+
+
+@pytest.fixture(autouse=True)
+def fast_polling(monkeypatch):
+    monkeypatch.setattr(job_status, "POLL_INTERVAL_SECONDS", 0.01)
+
+
+def test_wait_for_update_returns_current_record_without_since():
+    table = AdvancingTable([record("RUNNING", 3), record("RUNNING", 4)])
+
+    assert wait_for_update(table, "service-1", None, 10)["job"]["version"] == 3
+    assert table.reads == 1
+
+
+def test_wait_for_update_waits_for_a_newer_version():
+    table = AdvancingTable([record("RUNNING", 3), record("RUNNING", 3), record("RUNNING", 4)])
+
+    assert wait_for_update(table, "service-1", 3, 10)["job"]["version"] == 4
+    assert table.reads == 3
+
+
+def test_wait_for_update_returns_finished_jobs_immediately():
+    table = AdvancingTable([record("FAILED", 3)])
+
+    assert wait_for_update(table, "service-1", 3, 10)["job"]["status"] == "FAILED"
+
+
+def test_wait_for_update_gives_up_at_the_deadline():
+    table = AdvancingTable([record("RUNNING", 3)])
+
+    assert wait_for_update(table, "service-1", 3, 0.05)["job"]["version"] == 3
+    assert table.reads > 1
+
+
+def test_wait_for_update_returns_none_for_missing_records():
+    assert wait_for_update(AdvancingTable([None]), "service-1", 3, 10) is None
+
+
+@pytest.mark.parametrize("wait", [math.nan, math.inf])
+def test_wait_for_update_rejects_non_finite_waits(wait):
+    with pytest.raises(ValueError):
+        wait_for_update(AdvancingTable([record("RUNNING", 3)]), "service-1", 3, wait)
+
+
+def test_job_status_records_stages_and_failure(tmp_path):
+    table = LocalJsonTable(str(tmp_path / "services.json"))
+    status = JobStatus(table, "service-1")
+
+    status.accept({"name": "petstore", "type": "spring"})
+    status.start()
+    status.stage_started("codegen")
+    status.stage_finished("codegen", 1.5)
+    status.stage_started("scm")
+    error = RuntimeError("push rejected")
+    status.stage_finished("scm", 0.1, error)
+    status.fail(error)
+
+    view = job_view(table.get_item(Key={"id": "service-1"})["Item"])
+    assert view["status"] == "FAILED"
+    assert view["stages"]["codegen"] == {**view["stages"]["codegen"], "status": "SUCCEEDED", "durationMs": 1500}
+    assert view["stages"]["scm"]["status"] == "FAILED"
+    assert view["error"] == {"stage": "scm", "type": "RuntimeError", "message": "push rejected"}
+    assert view["version"] == 7
@@ -0,0 +1,48 @@
+import pytest
+
+from codegen.json_pointer import pointer_parts, resolve_local_ref, resolve_pointer
+from codegen.model_ingestion import OpenApiModelIngestor
+
+SPEC = {
+    "paths": {"/pets/{id}": {"get": {"parameters": [{"$ref": "#/components/parameters/Id"}]}}},
+    "components": {
+        "parameters": {"Id": {"$ref": "#/components/parameters/PetId"}, "PetId": {"name": "id", "in": "path"}},
+        "schemas": {"a/b~c": {"type": "string"}, "Loop": {"$ref": "#/components/schemas/Loop"}},
+    },
+}
+
+
+def test_pointer_parts_unescape_tokens():
+    assert pointer_parts("/components/schemas/a~1b~0c") == ["components", "schemas", "a/b~c"]
+    assert pointer_parts("/paths/~1pets~1%7Bid%7D") == ["paths", "/pets/{id}"]
+
+
+def test_resolve_pointer_follows_mappings_and_lists():
+    assert resolve_pointer(SPEC, "/paths/~1pets~1{id}/get/parameters/0") == {"$ref": "#/components/parameters/Id"}
+    assert resolve_pointer(SPEC, "/components/schemas/a~1b~0c") == {"type": "string"}
+    assert resolve_pointer(SPEC, "") is SPEC
+
+
+@pytest.mark.parametrize("pointer", ["/components/missing", "/paths/~1pets~1{id}/get/parameters/1"])
+def test_resolve_pointer_rejects_unresolvable_pointers(pointer):
+    with pytest.raises(ValueError):
+        resolve_pointer(SPEC, pointer)
+
+
+def test_resolve_local_ref_follows_chains():
+    assert resolve_local_ref(SPEC, {"$ref": "#/components/parameters/Id"}) == {"name": "id", "in": "path"}
+    assert resolve_local_ref(SPEC, {"type": "integer"}) == {"type": "integer"}
+
+
+@pytest.mark.parametrize("ref", ["#/components/schemas/Loop", "#/components/missing", "other.yaml#/Pet"])
+def test_resolve_local_ref_returns_none_for_unusable_refs(ref):
+    assert resolve_local_ref(SPEC, {"$ref": ref}) is None
+
+
+def test_bundling_reports_unresolvable_external_refs(tmp_path):
+    (tmp_path / "pet.yaml").write_text("Pet:\n  type: object\n")
+    (tmp_path / "root.yaml").write_text(
+        "openapi: 3.0.0\npaths: {}\ncomponents:\n  schemas:\n    Pet:\n      $ref: 'pet.yaml#/Missing/type'\n")
+
+    with pytest.raises(ValueError, match="Unresolvable \\$ref: pet.yaml#/Missing/type"):
+        OpenApiModelIngestor(cache_dir=str(tmp_path / "cache")).ingest(str(tmp_path / "root.yaml"), str(tmp_path / "out.yaml"))
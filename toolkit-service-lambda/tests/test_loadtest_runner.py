@@ -0,0 +1,164 @@
+import json
+import subprocess
+import sys
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from loadtest import runner
+from loadtest.scenario_generator import LOAD_TEST_DEFAULTS, LoadTestScenarioGenerator
+
+SPEC = """
+openapi: 3.0.3
+info: {title: Pets, version: "1"}
+servers:
+  - url: https://pets.example.com/v1
+paths:
+  /pets:
+    get:
+      operationId: listPets
+      parameters:
+        - {name: limit, in: query, required: true, schema: {type: integer}}
+      responses: {"200": {description: ok}}
+    post:
+      operationId: createPet
+      requestBody:
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                name: {type: string}
+      responses: {"201": {description: created}}
+  /pets/{petId}:
+    get:
+      operationId: showPet
+      parameters:
+        - {name: petId, in: path, required: true, schema: {type: string}}
+      responses: {"200": {description: ok}}
+"""
+
+
+class PetService(BaseHTTPRequestHandler):
+    """Answers list requests, returns 501 for unimplemented stubs, and fails creates when `failing` is set."""
+
+    failing = False
+    received = []
+
+    def do_GET(self):
+        self.received.append(("GET", self.path))
+        self.respond(200 if self.path.split("?")[0] == "/v1/pets" else 501)
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.received.append(("POST", body))
+        self.respond(500 if self.failing else 201)
+
+    def respond(self, status):
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def service():
+    PetService.failing = False
+    PetService.received = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PetService)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def loadtest_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("WORKSPACE_ROOT", str(tmp_path))
+    (tmp_path / "petstore.yaml").write_text(SPEC)
+
+    config = dict(LOAD_TEST_DEFAULTS, durationSeconds=1, concurrency=2)
+    LoadTestScenarioGenerator().generate_scenario("service-1", str(tmp_path / "petstore.yaml"), config)
+
+    return tmp_path / "service-1" / "loadtest"
+
+
+def run_generated(loadtest_dir, base_url):
+    report_path = loadtest_dir / "report.json"
+    result = subprocess.run([sys.executable, str(loadtest_dir / "run.py"), "--base-url", base_url,
+                             "--report", str(report_path)], capture_output=True, text=True, timeout=60)
+
+    with open(report_path) as report_file:
+        return result.returncode, json.load(report_file)
+
+
+def test_generated_runner_passes_within_budget(loadtest_dir, service):
+    returncode, report = run_generated(loadtest_dir, service)
+
+    assert returncode == 0
+    assert report["passed"] is True
+    # 501 responses from unimplemented stubs are not errors
+    assert report["errorRate"] == 0
+    assert set(report["operations"]) == {"listPets", "createPet", "showPet"}
+    assert all(operation["requests"] > 0 for operation in report["operations"].values())
+    # Bodies and query parameters are synthesized from the schemas, under the server's base path
+    assert ("POST", {"name": "loadtest"}) in PetService.received
+    assert any(path.startswith("/v1/pets?limit=") for method, path in PetService.received if method == "GET")
+
+
+def test_generated_runner_fails_the_build_over_the_error_budget(loadtest_dir, service):
+    PetService.failing = True
+
+    returncode, report = run_generated(loadtest_dir, service)
+
+    assert returncode == 1
+    assert report["passed"] is False
+    assert report["errorRate"] > report["budgets"]["maxErrorRate"]
+
+
+def test_unreachable_service_counts_as_errors():
+    _, is_error = runner.send("http://127.0.0.1:9", {"method": "GET", "path": "/"})
+
+    assert is_error is True
+
+
+def test_percentile_uses_nearest_rank():
+    samples = list(range(1, 101))
+
+    assert runner.percentile(samples, 0.95) == 95
+    assert runner.percentile(samples, 0.5) == 50
+    assert runner.percentile([7.0], 0.99) == 7.0
+    assert runner.percentile([], 0.95) == 0.0
+
+
+def test_check_budgets():
+    budgets = {"p95LatencyMs": 100, "maxErrorRate": 0.01}
+
+    assert runner.check_budgets({"p95LatencyMs": 100, "errorRate": 0.01}, budgets) == []
+    violations = runner.check_budgets({"p95LatencyMs": 150.5, "errorRate": 0.05}, budgets)
+    assert [violation.split()[0] for violation in violations] == ["p95", "error"]
+
+
+def test_run_scenario_requires_requests():
+    with pytest.raises(ValueError):
+        runner.run_scenario("http://127.0.0.1:9", {"requests": []}, 1, 1)
+
+
+@pytest.mark.parametrize("pom, dockerfile, expected", [
+    (True, "FROM corretto\nCOPY target/app.jar /app.jar\n", True),
+    (True, "FROM maven AS build\nRUN mvn package\n", False),
+    (False, "FROM python\nCOPY . .\n", False),
+])
+def test_packages_outside_docker(tmp_path, pom, dockerfile, expected):
+    if pom:
+        (tmp_path / "pom.xml").write_text("<project/>")
+    (tmp_path / "Dockerfile").write_text(dockerfile)
+
+    assert runner.packages_outside_docker(str(tmp_path)) is expected
@@ -0,0 +1,213 @@
+import pytest
+import yaml
+
+from codegen.model_ingestion import OpenApiModelIngestor
+
+ROOT = """
+openapi: 3.0.3
+info: {title: Pets, version: "1"}
+paths:
+  /pets:
+    get:
+      parameters:
+        - $ref: "./common.yaml#/parameters/limit"
+      responses:
+        "200":
+          content:
+            application/json:
+              schema: {$ref: "./common.yaml#/components/schemas/Pet"}
+        default:
+          content:
+            application/json:
+              schema: {$ref: "./error.yaml"}
+components:
+  schemas:
+    Pet: {type: object, properties: {local: {type: string}}}
+"""
+
+COMMON = """
+parameters:
+  limit: {name: limit, in: query, schema: {type: integer}}
+components:
+  schemas:
+    Pet:
+      type: object
+      properties:
+        name: {type: string}
+        children: {type: array, items: {$ref: "#/components/schemas/Pet"}}
+"""
+
+ERROR = """
+type: object
+properties:
+  message: {type: string}
+"""
+
+
+class Response:
+
+    def __init__(self, status_code, body=b"", etag=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = {"ETag": etag} if etag else {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+    def iter_content(self, chunk_size):
+        return iter([self.body])
+
+    def close(self):
+        pass
+
+
+class Server:
+    """Serves documents by URL with ETags, answering conditional requests with 304 when they match."""
+
+    def __init__(self, documents):
+        self.documents = {url: (body.encode("utf-8"), etag) for url, (body, etag) in documents.items()}
+        self.requests = []
+
+    def get(self, url, headers=None, stream=False, timeout=None):
+        body, etag = self.documents[url]
+        conditional = (headers or {}).get("If-None-Match")
+        self.requests.append((url, conditional))
+
+        if conditional and conditional == etag:
+            return Response(304, etag=etag)
+        return Response(200, body, etag)
+
+
+def write_documents(directory):
+    (directory / "petstore.yaml").write_text(ROOT)
+    (directory / "common.yaml").write_text(COMMON)
+    (directory / "error.yaml").write_text(ERROR)
+
+
+def bundle(ingestor, location, tmp_path):
+    with open(ingestor.ingest(location, str(tmp_path / "out" / "openapi.yaml"))) as bundled:
+        return yaml.safe_load(bundled)
+
+
+def test_bundles_refs_across_files(tmp_path):
+    write_documents(tmp_path)
+    ingestor = OpenApiModelIngestor(cache_dir=str(tmp_path / "cache"))
+
+    spec = bundle(ingestor, str(tmp_path / "petstore.yaml"), tmp_path)
+    operation = spec["paths"]["/pets"]["get"]
+    schemas = spec["components"]["schemas"]
+
+    # Non-component targets are inlined
+    assert operation["parameters"] == [{"name": "limit", "in": "query", "schema": {"type": "integer"}}]
+    # Components keep their name, renamed when the root already uses it
+    assert operation["responses"]["200"]["content"]["application/json"]["schema"] == {"$ref": "#/components/schemas/Pet2"}
+    assert schemas["Pet"] == {"type": "object", "properties": {"local": {"type": "string"}}}
+    # Whole-file schemas are hoisted under the file name
+    assert operation["responses"]["default"]["content"]["application/json"]["schema"] == {"$ref": "#/components/schemas/error"}
+    assert schemas["error"]["properties"] == {"message": {"type": "string"}}
+
+
+def test_recursive_components_point_at_the_hoisted_copy(tmp_path):
+    write_documents(tmp_path)
+    ingestor = OpenApiModelIngestor(cache_dir=str(tmp_path / "cache"))
+
+    spec = bundle(ingestor, str(tmp_path / "petstore.yaml"), tmp_path)
+
+    assert spec["components"]["schemas"]["Pet2"]["properties"]["children"]["items"] == {"$ref": "#/components/schemas/Pet2"}
+
+
+def test_circular_inlined_refs_are_rejected(tmp_path):
+    (tmp_path / "petstore.yaml").write_text('openapi: 3.0.3\npaths:\n  /a: {$ref: "./loop.yaml#/a"}\n')
+    (tmp_path / "loop.yaml").write_text('a: {get: {$ref: "#/b"}}\nb: {responses: {$ref: "#/a"}}\n')
+    ingestor = OpenApiModelIngestor(cache_dir=str(tmp_path / "cache"))
+
+    with pytest.raises(ValueError, match="Circular"):
+        ingestor.ingest(str(tmp_path / "petstore.yaml"), str(tmp_path / "out" / "openapi.yaml"))
+
+
+def test_unresolvable_refs_are_rejected(tmp_path):
+    (tmp_path / "petstore.yaml").write_text('openapi: 3.0.3\npaths:\n  /a: {$ref: "./common.yaml#/missing"}\n')
+    (tmp_path / "common.yaml").write_text(COMMON)
+    ingestor = OpenApiModelIngestor(cache_dir=str(tmp_path / "cache"))
+
+    with pytest.raises(ValueError, match="Unresolvable"):
+        ingestor.ingest(str(tmp_path / "petstore.yaml"), str(tmp_path / "out" / "openapi.yaml"))
+
+
+def remote_ingestor(tmp_path, error_etag='"e1"'):
+    ingestor = OpenApiModelIngestor(cache_dir=str(tmp_path / "cache"))
+    ingestor.session = Server({
+        "https://models.example.com/api/petstore.yaml": (ROOT, '"r1"'),
+        "https://models.example.com/api/common.yaml": (COMMON, '"c1"'),
+        "https://models.example.com/api/error.yaml": (ERROR, error_etag),
+    })
+    return ingestor
+
+
+def test_bundles_remote_refs_relative_to_the_document_url(tmp_path):
+    ingestor = remote_ingestor(tmp_path)
+
+    spec = bundle(ingestor, "https://models.example.com/api/petstore.yaml", tmp_path)
+
+    assert set(spec["components"]["schemas"]) == {"Pet", "Pet2", "error"}
+    assert [url for url, _ in ingestor.session.requests] == [
+        "https://models.example.com/api/petstore.yaml",
+        "https://models.example.com/api/common.yaml",
+        "https://models.example.com/api/error.yaml",
+    ]
+
+
+def test_cache_hit_only_revalidates_etags(tmp_path):
+    ingestor = remote_ingestor(tmp_path)
+    first = bundle(ingestor, "https://models.example.com/api/petstore.yaml", tmp_path)
+    ingestor.session.requests.clear()
+
+    assert bundle(ingestor, "https://models.example.com/api/petstore.yaml", tmp_path) == first
+    assert all(conditional for _, conditional in ingestor.session.requests)
+    assert len(ingestor.session.requests) == 3
+
+
+def test_cache_miss_until_the_model_is_bundled(tmp_path):
+    ingestor = remote_ingestor(tmp_path)
+
+    assert ingestor.cached_bundle("https://models.example.com/api/petstore.yaml") is None
+    bundle(ingestor, "https://models.example.com/api/petstore.yaml", tmp_path)
+
+    assert ingestor.cached_bundle("https://models.example.com/api/petstore.yaml") is not None
+    assert ingestor.cached_bundle("https://models.example.com/api/common.yaml") is None
+
+
+def test_changed_etag_rebuilds_the_bundle(tmp_path):
+    ingestor = remote_ingestor(tmp_path)
+    bundle(ingestor, "https://models.example.com/api/petstore.yaml", tmp_path)
+
+    ingestor.session.documents["https://models.example.com/api/error.yaml"] = (
+        ERROR.replace("message", "detail").encode("utf-8"), '"e2"')
+    ingestor.session.requests.clear()
+
+    spec = bundle(ingestor, "https://models.example.com/api/petstore.yaml", tmp_path)
+
+    assert spec["components"]["schemas"]["error"]["properties"] == {"detail": {"type": "string"}}
+    assert ("https://models.example.com/api/error.yaml", None) in ingestor.session.requests
+
+
+def test_local_documents_are_revalidated_by_content_hash(tmp_path):
+    write_documents(tmp_path)
+    ingestor = OpenApiModelIngestor(cache_dir=str(tmp_path / "cache"))
+    location = str(tmp_path / "petstore.yaml")
+    bundle(ingestor, location, tmp_path)
+
+    assert ingestor.cached_bundle(location) is not None
+
+    (tmp_path / "error.yaml").write_text(ERROR.replace("message", "detail"))
+
+    assert ingestor.cached_bundle(location) is None
+    assert bundle(ingestor, location, tmp_path)["components"]["schemas"]["error"]["properties"] == {
+        "detail": {"type": "string"}}
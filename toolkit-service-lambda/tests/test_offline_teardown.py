@@ -0,0 +1,79 @@
+from lifecycle.registry_policies import RegistryPolicyUpdater
+from lifecycle.services import find_services
+from lifecycle.teardown import ServiceTeardown
+from providers.offline_providers import OfflineProviders
+
+ITEM = {
+    "id": "service-1",
+    "project_name": "petstore",
+    "metadata": {
+        "resources": {
+            "scm": {"type": "github", "repo": "https://github.com/example/petstore", "secretKey": "key"},
+            "registry": {"type": "ecr", "name": "petstore"},
+            "pipeline": {
+                "pipeline": "petstore-pipeline",
+                "buildProjects": ["petstore-pipeline-build"],
+                "stack": "petstore-pipeline-stack",
+                "iacType": "cloudformation",
+            },
+        },
+    },
+}
+
+
+def test_offline_teardown_only_records_deletions(tmp_path):
+    providers = OfflineProviders(root=str(tmp_path), plan_only=True)
+    table = providers.services_table()
+    table.put_item(Item=ITEM)
+
+    result = ServiceTeardown(table, providers).teardown(ITEM)
+
+    assert result["status"] == "DELETED"
+    assert table.get_item(Key={"id": "service-1"}) == {}
+    assert sorted((entry["action"], entry["resource"]) for entry in providers.plan) == [
+        ("delete", "cloudformation-stack"),
+        ("delete", "codepipeline"),
+        ("delete", "ecr-repository"),
+        ("delete", "github-repository"),
+    ]
+
+
+def test_offline_registry_policies_only_record_updates(tmp_path):
+    providers = OfflineProviders(root=str(tmp_path), plan_only=True)
+    table = providers.services_table()
+    table.put_item(Item=ITEM)
+
+    result = RegistryPolicyUpdater(table, providers).apply({"keepTaggedImages": 5})
+
+    assert result["applied"] == 1
+    assert [(entry["action"], entry["name"]) for entry in providers.plan] == [("update", "petstore")]
+
+
+def test_local_table_evaluates_service_filters(tmp_path):
+    providers = OfflineProviders(root=str(tmp_path), plan_only=True)
+    table = providers.services_table()
+    table.put_item(Item={"id": "old", "project_type": "spring", "created_timestamp": "2020-01-01T00:00:00",
+                         "metadata": {"tags": {"env": "dev"}}})
+    table.put_item(Item={"id": "new", "project_type": "spring", "created_timestamp": "2999-01-01T00:00:00",
+                         "metadata": {"tags": {"env": "dev"}}})
+    table.put_item(Item={"id": "prod", "project_type": "go-server", "created_timestamp": "2020-01-01T00:00:00",
+                         "metadata": {"tags": {"env": "prod"}}})
+
+    def ids(filters):
+        return sorted(item["id"] for item in find_services(table, filters))
+
+    assert ids({"olderThanDays": 1}) == ["old", "prod"]
+    assert ids({"type": ["spring"]}) == ["new", "old"]
+    assert ids({"tags": {"env": "dev"}, "olderThanDays": 1}) == ["old"]
+    assert ids({"tags": {"owner": "me"}}) == []
+
+
+def test_offline_bulk_teardown_with_filter(tmp_path):
+    providers = OfflineProviders(root=str(tmp_path), plan_only=True)
+    table = providers.services_table()
+    table.put_item(Item=dict(ITEM, project_type="spring"))
+
+    result = ServiceTeardown(table, providers).teardown_matching({"type": "spring"})
+
+    assert result["deleted"] == 1
+    assert table.scan()["Items"] == []
@@ -0,0 +1,68 @@
+import pytest
+
+from codegen.openapi_validator import MAX_ERRORS, OpenApiValidator
+
+VALID = """
+openapi: 3.0.3
+info: {title: Pets, version: "1.0"}
+paths:
+  /pets/{petId}:
+    parameters:
+      - $ref: '#/components/parameters/PetId'
+    get:
+      operationId: getPet
+      responses:
+        "200":
+          content:
+            application/json:
+              schema: {$ref: '#/components/schemas/Pet'}
+components:
+  parameters:
+    PetId: {name: petId, in: path, required: true, schema: {type: string}}
+  schemas:
+    Pet: {type: object}
+"""
+
+
+def validate(content):
+    return OpenApiValidator().validate(content)
+
+
+def test_valid_model_has_no_errors():
+    assert validate(VALID) == []
+
+
+@pytest.mark.parametrize("content, error", [
+    ("", "did not contain an OpenAPI document"),
+    ("openapi: [", "not valid YAML"),
+    ("- openapi", "root must be a mapping"),
+    (VALID.replace("openapi: 3.0.3", "openapi: 2.0"), "'openapi' must be a 3.x version"),
+    (VALID.replace('version: "1.0"', 'version: ""'), "'info.version' is required"),
+    (VALID.replace("required: true", "required: false"), "must have 'required: true'"),
+    (VALID.replace("'#/components/parameters/PetId'", "'#/components/parameters/Missing'"), "does not declare path parameter 'petId'"),
+    (VALID.replace("'#/components/schemas/Pet'", "'#/components/schemas/Missing'"), "does not resolve"),
+    (VALID.replace("'#/components/schemas/Pet'", "'pet.yaml#/Pet'"), "must point into this document"),
+    (VALID.replace('"200":', '"2000":'), "is not a valid HTTP status code"),
+    (VALID.replace("    Pet: {type: object}", "    Pet Type: {type: object}"), "Component name 'schemas.Pet Type'"),
+])
+def test_invalid_models_are_reported(content, error):
+    assert any(error in message for message in validate(content))
+
+
+def test_duplicate_operation_ids_are_reported():
+    content = VALID.replace("components:", "\n".join([
+        "  /pets:",
+        "    get:",
+        "      operationId: getPet",
+        "      responses: {'200': {description: ok}}",
+        "components:",
+    ]))
+
+    assert any("operationId 'getPet' is used by both" in message for message in validate(content))
+
+
+def test_errors_are_capped():
+    paths = "\n".join(f"  p{index}: {{}}" for index in range(MAX_ERRORS * 2))
+    content = f"openapi: 3.0.3\ninfo: {{title: Pets, version: '1'}}\npaths:\n{paths}\n"
+
+    assert len(validate(content)) == MAX_ERRORS
@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+from codegen.output_pruner import MIN_DEDUPE_BYTES, OutputPruner
+
+DUPLICATE = b"x" * MIN_DEDUPE_BYTES
+
+
+@pytest.fixture
+def app_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("WORKSPACE_ROOT", str(tmp_path))
+    app_dir = tmp_path / "service-1" / "app"
+
+    files = {
+        ".openapi-generator/FILES": b"listing",
+        ".mvn/wrapper/maven-wrapper.properties": b"wrapper",
+        "mvnw": b"#!/bin/sh",
+        "README.md": b"# Service",
+        "docs/Pet.md": b"# Pet",
+        "pom.xml": b"<project/>",
+        "src/main/java/Pet.java": b"class Pet {}",
+        "src/test/java/PetTest.java": b"class PetTest {}",
+        "src/main/resources/a/openapi.yaml": DUPLICATE,
+        "src/main/resources/b/openapi.yaml": DUPLICATE,
+    }
+    for path, content in files.items():
+        (app_dir / path).parent.mkdir(parents=True, exist_ok=True)
+        (app_dir / path).write_bytes(content)
+
+    return app_dir
+
+
+def remaining(app_dir):
+    return sorted(os.path.relpath(os.path.join(root, name), app_dir)
+                  for root, _, names in os.walk(app_dir) for name in names)
+
+
+def test_standard_profile_removes_boilerplate_and_reports_duplicates(app_dir):
+    report = OutputPruner().prune("service-1", "spring")
+
+    assert remaining(app_dir) == [
+        "pom.xml",
+        "src/main/java/Pet.java",
+        "src/main/resources/a/openapi.yaml",
+        "src/main/resources/b/openapi.yaml",
+        "src/test/java/PetTest.java",
+    ]
+    assert report["removed"] == 5
+    assert (report["filesBefore"], report["filesAfter"]) == (10, 5)
+    assert (report["duplicateGroups"], report["duplicateBytes"]) == (1, MIN_DEDUPE_BYTES)
+
+
+def test_keep_exclude_and_symlink_dedupe(app_dir):
+    pruner = OutputPruner({"profile": "aggressive", "keep": ["README.md"], "exclude": ["pom.xml"], "dedupe": "symlink"})
+
+    pruner.prune("service-1", "spring")
+
+    assert remaining(app_dir) == [
+        "README.md",
+        "src/main/java/Pet.java",
+        "src/main/resources/a/openapi.yaml",
+        "src/main/resources/b/openapi.yaml",
+    ]
+    assert os.readlink(app_dir / "src/main/resources/b/openapi.yaml") == "../a/openapi.yaml"
+    assert (app_dir / "src/main/resources/b/openapi.yaml").read_bytes() == DUPLICATE
+
+
+def test_none_profile_only_applies_excludes(app_dir):
+    report = OutputPruner({"profile": "none", "exclude": ["docs/"], "dedupe": "off"}).prune("service-1", "spring")
+
+    assert "docs/Pet.md" not in remaining(app_dir)
+    assert report["removed"] == 1
+    assert report["duplicateGroups"] == 0
+
+
+@pytest.mark.parametrize("config", [{"profile": "tiny"}, {"dedupe": "hardlink"}])
+def test_invalid_config_is_rejected(config):
+    with pytest.raises(ValueError):
+        OutputPruner(config)
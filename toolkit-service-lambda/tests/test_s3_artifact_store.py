@@ -0,0 +1,96 @@
+import os
+
+import pytest
+
+from botocore.exceptions import ClientError
+
+from artifacts.artifact_store import artifact_key, content_hash
+from artifacts.s3_artifact_store import S3ArtifactStore, TRANSFER_CONFIG
+
+
+class FakeS3:
+    """An in-memory S3 client with the calls S3ArtifactStore makes."""
+
+    def __init__(self, head_error=None):
+        self.objects = {}
+        self.uploads = []
+        self.head_error = head_error
+
+    def head_object(self, Bucket, Key):
+        if self.head_error:
+            raise ClientError({"Error": {"Code": self.head_error}}, "HeadObject")
+        if (Bucket, Key) not in self.objects:
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        return {"ContentLength": len(self.objects[(Bucket, Key)])}
+
+    def upload_fileobj(self, fileobj, bucket, key, ExtraArgs=None, Config=None):
+        self.uploads.append({"key": key, "extra_args": ExtraArgs, "config": Config})
+        self.objects[(bucket, key)] = fileobj.read()
+
+    def download_fileobj(self, bucket, key, fileobj, Config=None):
+        if (bucket, key) not in self.objects:
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        fileobj.write(self.objects[(bucket, key)])
+
+
+class Session:
+
+    def __init__(self, s3):
+        self.s3 = s3
+
+    def client(self, service_name):
+        assert service_name == "s3"
+        return self.s3
+
+
+def write_project(root):
+    os.makedirs(os.path.join(root, "app"))
+    with open(os.path.join(root, "app", "Main.java"), "w") as source:
+        source.write("class Main {}")
+
+
+def test_projects_round_trip_under_the_bootstrap_prefix(tmp_path):
+    s3 = FakeS3()
+    store = S3ArtifactStore("artifacts", session=Session(s3))
+    write_project(tmp_path / "project")
+
+    saved = store.save(str(tmp_path / "project"))
+    store.load(saved["sha256"], str(tmp_path / "restored"))
+
+    key = f"bootstrap/{artifact_key(saved['sha256'])}"
+    assert list(s3.objects) == [("artifacts", key)]
+    assert s3.uploads == [{"key": key, "extra_args": {"ContentType": "application/zstd"}, "config": TRANSFER_CONFIG}]
+    assert content_hash(str(tmp_path / "restored")) == saved["sha256"]
+
+
+def test_stored_projects_are_not_uploaded_again(tmp_path):
+    s3 = FakeS3()
+    store = S3ArtifactStore("artifacts", session=Session(s3))
+    write_project(tmp_path / "project")
+
+    first = store.save(str(tmp_path / "project"))
+    second = store.save(str(tmp_path / "project"))
+
+    assert first["uploaded"] is True and second["uploaded"] is False
+    assert len(s3.uploads) == 1
+
+
+@pytest.mark.parametrize("code", ["404", "NoSuchKey", "NotFound"])
+def test_missing_objects_do_not_exist(code):
+    store = S3ArtifactStore("artifacts", session=Session(FakeS3(head_error=code)))
+
+    assert store.exists("blobs/abc.tar.zst") is False
+
+
+def test_other_head_errors_are_raised():
+    store = S3ArtifactStore("artifacts", session=Session(FakeS3(head_error="403")))
+
+    with pytest.raises(ClientError):
+        store.exists("blobs/abc.tar.zst")
+
+
+def test_loading_a_missing_project_raises(tmp_path):
+    store = S3ArtifactStore("artifacts", session=Session(FakeS3()))
+
+    with pytest.raises(ClientError):
+        store.load("0" * 64, str(tmp_path / "restored"))
@@ -0,0 +1,44 @@
+import pytest
+
+from infra.scaling import SCALING_DEFAULTS, scaling_parameters
+
+
+def test_defaults_without_a_scaling_block():
+    params = scaling_parameters(None)
+
+    assert params["minCapacity"] == SCALING_DEFAULTS["minCapacity"]
+    assert params["maxCapacity"] == SCALING_DEFAULTS["maxCapacity"]
+    assert params["cpuTargetUtilization"] == SCALING_DEFAULTS["cpuTarget"]
+    assert params["memoryTargetUtilization"] == SCALING_DEFAULTS["memoryTarget"]
+    assert params["scaleOutSchedule"] == "" and params["scaleInSchedule"] == ""
+
+
+def test_disabled_targets_and_scheduled_actions():
+    params = scaling_parameters({
+        "minCapacity": 2,
+        "maxCapacity": "10",
+        "memoryTarget": False,
+        "schedule": {"scaleOut": {"cron": "cron(0 8 ? * MON-FRI *)", "minCapacity": 4, "maxCapacity": 10}},
+    })
+
+    assert params["maxCapacity"] == 10
+    assert params["memoryTargetUtilization"] == 0
+    assert params["scaleOutSchedule"] == "cron(0 8 ? * MON-FRI *)"
+    assert (params["scaleOutMinCapacity"], params["scaleOutMaxCapacity"]) == (4, 10)
+    assert (params["scaleInMinCapacity"], params["scaleInMaxCapacity"]) == (0, 0)
+
+
+@pytest.mark.parametrize("scaling, message", [
+    ({"requestCountTarget": 100}, "requestCountTarget"),
+    ({"maxTasks": 3}, "Unsupported scaling fields"),
+    ({"minCapacity": 5, "maxCapacity": 2}, "must not exceed"),
+    ({"cpuTarget": 101}, "between 1 and 100"),
+    ({"minCapacity": True}, "must be an integer"),
+    ({"scaleInCooldown": "soon"}, "must be an integer"),
+    ({"schedule": {"nightly": {}}}, "Unsupported scaling.schedule"),
+    ({"schedule": {"scaleIn": {"cron": "0 20 * * *", "minCapacity": 1, "maxCapacity": 2}}}, "cron"),
+    ({"schedule": {"scaleIn": {"cron": "rate(1 day)", "minCapacity": 3, "maxCapacity": 2}}}, "must not exceed"),
+])
+def test_invalid_scaling_is_rejected(scaling, message):
+    with pytest.raises(ValueError, match=message):
+        scaling_parameters(scaling)
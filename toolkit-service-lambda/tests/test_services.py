@@ -0,0 +1,62 @@
+import pytest
+
+from lifecycle.services import filter_condition, find_services
+from lifecycle.teardown import ServiceTeardown
+
+
+class RecordingTable:
+
+    def __init__(self, items=None):
+        self.items = items or []
+        self.scans = []
+
+    def scan(self, **kwargs):
+        self.scans.append(kwargs)
+        return {"Items": self.items}
+
+
+@pytest.mark.parametrize("filters", [{}, {"tags": {}}, {"tags": None}])
+def test_filter_condition_is_none_without_conditions(filters):
+    assert filter_condition(filters) is None
+
+
+def test_filter_condition_combines_filters():
+    condition = filter_condition({"olderThanDays": 7, "type": ["spring", "go-server"], "tags": {"env": "dev"}})
+
+    assert condition is not None
+    assert condition.expression_operator == "AND"
+
+
+@pytest.mark.parametrize("filters", [
+    {"owner": "me"},
+    {"olderThanDays": -1},
+    {"olderThanDays": "7"},
+    {"type": []},
+    {"tags": {"team.name": "payments"}},
+    {"tags": {"env[0]": "dev"}},
+    {"tags": {"": "dev"}},
+])
+def test_filter_condition_rejects_invalid_filters(filters):
+    with pytest.raises(ValueError):
+        filter_condition(filters)
+
+
+def test_find_services_skips_unfinished_bootstraps():
+    table = RecordingTable([
+        {"id": "legacy"},
+        {"id": "done", "job": {"status": "SUCCEEDED"}},
+        {"id": "running", "job": {"status": "RUNNING"}},
+        {"id": "failed", "job": {"status": "FAILED"}},
+    ])
+
+    assert [item["id"] for item in find_services(table)] == ["legacy", "done"]
+
+
+@pytest.mark.parametrize("filters", [None, {}, {"tags": {}}, {"tags": None}])
+def test_bulk_teardown_refuses_filters_matching_every_service(filters):
+    table = RecordingTable([{"id": "a", "project_name": "a"}])
+
+    with pytest.raises(ValueError):
+        ServiceTeardown(table).teardown_matching(filters, dry_run=True)
+
+    assert table.scans == []
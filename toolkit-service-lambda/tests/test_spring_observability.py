@@ -0,0 +1,132 @@
+import json
+import os
+import re
+
+import pytest
+import yaml
+
+from codegen.spring_observability import (OBSERVABILITY_DEPENDENCIES, SpringObservabilityCustomizer,
+                                          observability_config)
+
+POM = """<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0">
+  <dependencyManagement>
+    <dependencies>
+      <dependency>
+        <groupId>org.example</groupId>
+        <artifactId>bom</artifactId>
+      </dependency>
+    </dependencies>
+  </dependencyManagement>
+  <dependencies>
+    <dependency>
+      <groupId>org.springframework.boot</groupId>
+      <artifactId>spring-boot-starter-web</artifactId>
+    </dependency>
+  </dependencies>
+</project>
+"""
+
+TEMPLATE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "infra", "templates", "infra.ecs-fargate.template")
+
+
+class TemplateLoader(yaml.SafeLoader):
+    """Loads CloudFormation templates, keeping the values of intrinsic function tags such as !Sub."""
+
+
+def construct_tag(loader, tag_suffix, node):
+    if isinstance(node, yaml.ScalarNode):
+        return loader.construct_scalar(node)
+    if isinstance(node, yaml.SequenceNode):
+        return loader.construct_sequence(node, deep=True)
+    return loader.construct_mapping(node, deep=True)
+
+
+TemplateLoader.add_multi_constructor("!", construct_tag)
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.setenv("WORKSPACE_ROOT", str(tmp_path))
+    app_dir = tmp_path / "service-1" / "app"
+    os.makedirs(app_dir)
+    (app_dir / "pom.xml").write_text(POM)
+    return app_dir
+
+
+def customize(sampling_probability=0.25):
+    customizer = SpringObservabilityCustomizer({"samplingProbability": sampling_probability}, "spring")
+    customizer.customize("service-1", {"name": "petstore"})
+
+
+def properties(project) -> dict:
+    lines = (project / "src" / "main" / "resources" / "application.properties").read_text().splitlines()
+    return dict(line.split("=", 1) for line in lines if line and not line.startswith("#"))
+
+
+def test_observability_config():
+    assert observability_config({"observability": True}) == {"enabled": True}
+    assert observability_config({"observability": {"enabled": False, "samplingProbability": 1}}) == {}
+    assert observability_config({}) == {}
+
+
+@pytest.mark.parametrize("config, service_type", [
+    ({}, "python-fastapi"),
+    ({"samplingProbability": 1.5}, "spring"),
+    ({"samplingProbability": -0.1}, "kotlin-spring"),
+])
+def test_customizer_rejects_invalid_configs(config, service_type):
+    with pytest.raises(ValueError):
+        SpringObservabilityCustomizer(config, service_type)
+
+
+def test_dependencies_are_added_once_outside_dependency_management(project):
+    customize()
+    customize()
+
+    pom = (project / "pom.xml").read_text()
+    managed, dependencies = pom.split("</dependencyManagement>")
+
+    for group_id, artifact_id in OBSERVABILITY_DEPENDENCIES:
+        assert dependencies.count(f"<artifactId>{artifact_id}</artifactId>") == 1
+        assert artifact_id not in managed
+    assert "spring-boot-starter-web" in dependencies
+
+
+def test_properties_export_to_the_collector_sidecar(project):
+    customize(sampling_probability=0.25)
+
+    written = properties(project)
+    assert written["management.opentelemetry.resource-attributes.service.name"] == "petstore"
+    assert written["management.otlp.metrics.export.url"] == "http://localhost:4318/v1/metrics"
+    assert written["management.otlp.tracing.endpoint"] == "http://localhost:4318/v1/traces"
+    assert written["management.tracing.sampling.probability"] == "0.25"
+
+
+def test_dashboard_shows_metrics_the_collector_exports(project):
+    customize()
+    percentiles = properties(project)["management.metrics.distribution.percentiles.http.server.requests"].split(",")
+
+    with open(TEMPLATE) as template_file:
+        resources = yaml.load(template_file, Loader=TemplateLoader)["Resources"]
+
+    containers = resources["TaskDefinition"]["Properties"]["ContainerDefinitions"]
+    collector = next(container[1] for container in containers if isinstance(container, list))
+    collector_config = yaml.safe_load(collector["Environment"][0]["Value"])
+    selectors = [selector
+                 for declaration in collector_config["exporters"]["awsemf"]["metric_declarations"]
+                 for selector in declaration["metric_name_selectors"]]
+
+    body = resources["PerformanceDashboard"]["Properties"]["DashboardBody"]
+    dashboard = json.loads(re.sub(r"\$\{[^}]+}", "placeholder", body))
+    metrics = [metric for widget in dashboard["widgets"] for metric in widget["properties"]["metrics"]]
+
+    # The first row of a widget names the metric; "..." rows repeat it with another quantile
+    names = [metric[1] for metric in metrics if metric[0] == "placeholder"]
+    quantiles = [metric[3] if metric[0] != "..." else metric[1] for metric in metrics
+                 if metric[0] == "..." or "quantile" in metric]
+
+    assert names == ["http.server.requests", "http.server.requests_count"]
+    assert all(any(re.match(selector, name) for selector in selectors) for name in names)
+    assert quantiles == percentiles
@@ -0,0 +1,63 @@
+import pytest
+
+from stage_timer import StageTimer
+
+
+class RecordingListener:
+
+    def __init__(self, name, events):
+        self.name = name
+        self.events = events
+
+    def stage_started(self, stage):
+        self.events.append((self.name, "started", stage))
+
+    def stage_finished(self, stage, seconds, error=None):
+        assert seconds >= 0
+        self.events.append((self.name, "finished", stage, type(error).__name__ if error else None))
+
+
+def test_listeners_are_told_in_order_around_each_stage():
+    events = []
+    timer = StageTimer([RecordingListener("first", events), RecordingListener("second", events)])
+
+    with timer.stage("codegen"):
+        events.append(("stage", "codegen"))
+    with timer.stage("scm"):
+        pass
+
+    assert events == [
+        ("first", "started", "codegen"),
+        ("second", "started", "codegen"),
+        ("stage", "codegen"),
+        ("first", "finished", "codegen", None),
+        ("second", "finished", "codegen", None),
+        ("first", "started", "scm"),
+        ("second", "started", "scm"),
+        ("first", "finished", "scm", None),
+        ("second", "finished", "scm", None),
+    ]
+    assert list(timer.durations_ms()) == ["codegen", "scm"]
+
+
+def test_failed_stages_report_the_error_and_are_still_timed():
+    events = []
+    timer = StageTimer([RecordingListener("status", events)])
+
+    with pytest.raises(RuntimeError):
+        with timer.stage("scm"):
+            raise RuntimeError("push rejected")
+
+    assert events[-1] == ("status", "finished", "scm", "RuntimeError")
+    assert "scm" in timer.durations
+
+
+def test_repeated_stages_accumulate():
+    timer = StageTimer()
+
+    for _ in range(3):
+        with timer.stage("infra"):
+            pass
+
+    assert list(timer.durations) == ["infra"]
+    assert timer.report().splitlines()[-1].startswith("total")
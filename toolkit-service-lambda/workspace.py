@@ -0,0 +1,14 @@
+import os
+
+
+def workspace_root() -> str:
+    """Directory projects are generated in: /tmp in Lambda, configurable with WORKSPACE_ROOT for local runs."""
+    return os.getenv("WORKSPACE_ROOT", "/tmp")
+
+
+def project_path(project_id: str, *parts: str) -> str:
+    return os.path.join(workspace_root(), project_id, *parts)
+
+
+def openapi_generator_jar() -> str:
+    return os.getenv("OPENAPI_GENERATOR_JAR", "/opt/openapi-generator-cli.jar")
@@ -0,0 +1,40 @@
+import pytest
+
+from toolkit.tuning import TUNING_PROFILES, tuning_profile
+
+
+def test_default_profile():
+    assert tuning_profile() == TUNING_PROFILES["default"]
+
+
+def test_overrides_apply_on_top_of_the_profile():
+    tuning = tuning_profile("interactive", {"memorySize": 3008})
+
+    assert tuning["memorySize"] == 3008
+    assert tuning["provisionedConcurrency"] == TUNING_PROFILES["interactive"]["provisionedConcurrency"]
+
+
+def test_overrides_from_context_strings():
+    assert tuning_profile("batch", '{"memorySize": 4096}')["memorySize"] == 4096
+
+
+def test_profiles_are_not_modified():
+    tuning_profile("default", {"memorySize": 4096})
+
+    assert TUNING_PROFILES["default"]["memorySize"] == 1024
+
+
+@pytest.mark.parametrize("name, overrides, message", [
+    ("huge", None, "Unknown tuning profile"),
+    ("default", {"timeout": 60}, "Unsupported tuning settings"),
+    ("default", {"memorySize": 64}, "memorySize must be an integer between"),
+    ("default", {"memorySize": "2048"}, "memorySize must be an integer between"),
+    ("default", {"reservedConcurrency": True}, "reservedConcurrency must be an integer between"),
+    ("default", {"architecture": "ppc64"}, "architecture must be one of"),
+    # The bootstrapper image has no arm64 build
+    ("default", {"architecture": "arm64"}, "architecture must be one of"),
+    ("batch", {"provisionedConcurrency": 20}, "cannot exceed tuning.reservedConcurrency"),
+])
+def test_invalid_tuning_is_rejected(name, overrides, message):
+    with pytest.raises(ValueError, match=message):
+        tuning_profile(name, overrides)
@@ -1,6 +1,12 @@
 from aws_cdk import (
     Stack,
+    ArnFormat,
+    Aws,
+    CfnCondition,
     Duration,
+    Fn,
+    Size,
+    Token,
     RemovalPolicy,
     CfnParameter,
     CfnOutput,
@@ -26,6 +32,8 @@ from aws_cdk import (
 from constructs import Construct
 import uuid
 
+from toolkit.tuning import ARCHITECTURES, LIMITS, tuning_profile
+
 
 class IndustryToolkitStack(Stack):
     def __init__(self, scope: Construct, id: str, **kwargs) -> None:
@@ -82,6 +90,48 @@ class IndustryToolkitStack(Stack):
                                          default="industry-toolkit-credentials",
                                          description="Name of the Secrets Manager secret containing the secrets used by the toolkit."
                                          )
+        # Parameter for the role the bootstrapper assumes in deployment target accounts
+        target_role_name_param = CfnParameter(self, "TargetRoleName",
+                                              type="String",
+                                              default="IndustryToolkitTargetRole",
+                                              description="Name of the role assumed in each deployment target account."
+                                              )
+        # Parameters for the bootstrapper's resources, defaulting to the tuning profile chosen with
+        # `-c tuningProfile=<name>` (see toolkit/tuning.py)
+        tuning = tuning_profile(self.node.try_get_context("tuningProfile"), self.node.try_get_context("tuning"))
+
+        memory_size_param = CfnParameter(self, "BootstrapperMemorySize",
+                                         type="Number",
+                                         default=tuning["memorySize"],
+                                         min_value=LIMITS["memorySize"][0],
+                                         max_value=LIMITS["memorySize"][1],
+                                         description="Memory of the Bootstrapper Lambda function in MB; CPU scales with it."
+                                         )
+        ephemeral_storage_param = CfnParameter(self, "BootstrapperEphemeralStorageSize",
+                                               type="Number",
+                                               default=tuning["ephemeralStorageSize"],
+                                               min_value=LIMITS["ephemeralStorageSize"][0],
+                                               max_value=LIMITS["ephemeralStorageSize"][1],
+                                               description="Size of /tmp for the Bootstrapper Lambda function in MB."
+                                               )
+        architecture_param = CfnParameter(self, "BootstrapperArchitecture",
+                                          type="String",
+                                          default=tuning["architecture"],
+                                          allowed_values=ARCHITECTURES,
+                                          description="Instruction set of the Bootstrapper Lambda function; must match the image."
+                                          )
+        provisioned_concurrency_param = CfnParameter(self, "BootstrapperProvisionedConcurrency",
+                                                     type="Number",
+                                                     default=tuning["provisionedConcurrency"],
+                                                     min_value=0,
+                                                     description="Pre-initialized instances of the Bootstrapper 'live' alias. 0 disables it."
+                                                     )
+        reserved_concurrency_param = CfnParameter(self, "BootstrapperReservedConcurrency",
+                                                  type="Number",
+                                                  default=tuning["reservedConcurrency"],
+                                                  min_value=0,
+                                                  description="Concurrency reserved for (and limiting) the Bootstrapper. 0 leaves it unreserved."
+                                                  )
         # Parameter for the prefix for all cloudwatch logs
         log_group_name_param = CfnParameter(self, "LogGroupPrefix",
                                         type="String",
@@ -94,7 +144,10 @@ class IndustryToolkitStack(Stack):
         # -------------------------
         bucket_name = artifacts_bucket_name_param.value_as_string or f"industry-toolkit-artifacts-bucket-{str(uuid.uuid4())[:8]}"
         artifacts_bucket = s3.Bucket(self, "ArtifactsBucket",
-                                     bucket_name=artifacts_bucket_name_param.value_as_string)
+                                     bucket_name=artifacts_bucket_name_param.value_as_string,
+                                     # Generated projects are only kept for retries, and may be shared by services
+                                     lifecycle_rules=[s3.LifecycleRule(prefix="bootstrap/",
+                                                                       expiration=Duration.days(7))])
 
         ecr_repository = ecr.Repository(
             self,
@@ -117,7 +170,10 @@ class IndustryToolkitStack(Stack):
                 type=dynamodb.AttributeType.STRING
             ),
             billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
-            point_in_time_recovery=True
+            point_in_time_recovery=True,
+            # Ephemeral services set expires_at; the stream lets the bootstrapper tear them down
+            time_to_live_attribute="expires_at",
+            stream=dynamodb.StreamViewType.OLD_IMAGE
         )
 
         # -------------------------
@@ -139,12 +195,71 @@ class IndustryToolkitStack(Stack):
                 "logs:*",
                 "s3:*",
                 "secretsmanager:GetSecretValue",
-                "ecr:*",
                 "ec2:*"
             ],
             resources=["*"]
         ))
 
+        # Builds pull their layer cache and push the service image. DescribeImages finds the cache image
+        # and the tags already pushed to repositories with immutable tags.
+        project_codebuild_role.add_to_policy(iam.PolicyStatement(
+            actions=[
+                "ecr:GetAuthorizationToken",
+                "ecr:BatchCheckLayerAvailability",
+                "ecr:GetDownloadUrlForLayer",
+                "ecr:BatchGetImage",
+                "ecr:DescribeImages",
+                "ecr:InitiateLayerUpload",
+                "ecr:UploadLayerPart",
+                "ecr:CompleteLayerUpload",
+                "ecr:PutImage"
+            ],
+            resources=["*"]
+        ))
+
+        # Service stack templates create their task roles under the /industry-toolkit/ path. Generated role
+        # names may truncate the stack name, so the path rather than the name scopes these role actions.
+        service_stack_role_statements = [
+            iam.PolicyStatement(
+                actions=[
+                    "iam:CreateRole",
+                    "iam:DeleteRole",
+                    "iam:GetRole",
+                    "iam:TagRole",
+                    "iam:UntagRole",
+                    "iam:UpdateAssumeRolePolicy",
+                    "iam:PutRolePolicy",
+                    "iam:GetRolePolicy",
+                    "iam:DeleteRolePolicy",
+                    "iam:AttachRolePolicy",
+                    "iam:DetachRolePolicy",
+                    "iam:ListRolePolicies",
+                    "iam:ListAttachedRolePolicies",
+                    "iam:PassRole"
+                ],
+                resources=[f"arn:aws:iam::{self.account}:role/industry-toolkit/*"]
+            ),
+            # ECS and Application Auto Scaling create their service-linked roles on first use
+            iam.PolicyStatement(
+                actions=["iam:CreateServiceLinkedRole"],
+                resources=[f"arn:aws:iam::{self.account}:role/aws-service-role/*"]
+            )
+        ]
+
+        # Terraform deploy stages apply the service stack from CodeBuild
+        project_codebuild_role.add_to_policy(iam.PolicyStatement(
+            actions=[
+                "cloudformation:*",
+                "ecs:*",
+                "elasticloadbalancing:*",
+                "application-autoscaling:*",
+                "cloudwatch:*"
+            ],
+            resources=["*"]
+        ))
+        for statement in service_stack_role_statements:
+            project_codebuild_role.add_to_policy(statement)
+
         codepipeline_role = iam.Role(
             self, "IndustryToolkitCodePipelineRole",
             assumed_by=iam.ServicePrincipal("codepipeline.amazonaws.com"),
@@ -163,18 +278,23 @@ class IndustryToolkitStack(Stack):
                 "s3:*",
                 "codebuild:*",
                 "secretsmanager:GetSecretValue",
-                "iam:PassRole",
                 "ec2:*",
                 "logs:*",
-                "iam:*",
-                "iam:DeleteRolePolicy",
-                "iam:DeleteRole",
-                "iam:CreateRole",
-                "elasticloadbalancing:*"
+                "elasticloadbalancing:*",
+                "application-autoscaling:*",
+                "cloudwatch:*"
             ],
             resources=["*"]
         ))
 
+        # The pipeline's CloudFormation deploy action runs as this role, which then creates the stack's roles
+        codepipeline_role.add_to_policy(iam.PolicyStatement(
+            actions=["iam:PassRole"],
+            resources=[codepipeline_role.role_arn]
+        ))
+        for statement in service_stack_role_statements:
+            codepipeline_role.add_to_policy(statement)
+
 
         repo = ecr.Repository.from_repository_arn(
             self, "IndustryToolkitRepo",
@@ -189,20 +309,80 @@ class IndustryToolkitStack(Stack):
             code=lambda_.Code.from_ecr_image(repository=repo, tag_or_digest=image_digest),
             handler=lambda_.Handler.FROM_IMAGE,
             runtime=lambda_.Runtime.FROM_IMAGE,
-            memory_size=1024,
+            memory_size=memory_size_param.value_as_number,
+            ephemeral_storage_size=Size.mebibytes(ephemeral_storage_param.value_as_number),
+            architecture=lambda_.Architecture.custom(architecture_param.value_as_string),
+            # current_version hashes the function's configuration, but parameters are unresolved at synth
+            # time. Their values go in the version description, so changing them at deploy time also
+            # publishes a new version for the 'live' alias.
+            current_version_options=lambda_.VersionOptions(
+                description=Fn.join(" ", [
+                    Token.as_string(memory_size_param.value),
+                    Token.as_string(ephemeral_storage_param.value),
+                    architecture_param.value_as_string
+                ])
+            ),
             timeout=Duration.seconds(300),
+            # Failed bootstraps are retried, restoring the generated project from the artifacts bucket
+            retry_attempts=2,
             environment={
                 "LOG_LEVEL": bootstrapper_log_level_param.value_as_string,
                 "CODEBUILD_ROLE_ARN": project_codebuild_role.role_arn,
                 "CODEPIPELINE_ROLE_ARN": codepipeline_role.role_arn,
                 "SCM_CREDENTIALS": github_pat_secret.secret_arn,
                 "CODEPIPELINE_BUCKET": artifacts_bucket.bucket_name,
+                "ARTIFACTS_BUCKET": artifacts_bucket.bucket_name,
                 "ECR_REGISTRY_URI": ecr_repository.repository_uri,
-                "SERVICES_TABLE_NAME": services_table.table_name
+                "SERVICES_TABLE_NAME": services_table.table_name,
+                "TARGET_ROLE_NAME": target_role_name_param.value_as_string
             },
         )
 
+        # A concurrency of 0 means unset, which CloudFormation expresses by omitting the property
+        has_reserved_concurrency = CfnCondition(
+            self, "HasReservedConcurrency",
+            expression=Fn.condition_not(Fn.condition_equals(reserved_concurrency_param.value, "0"))
+        )
+        has_provisioned_concurrency = CfnCondition(
+            self, "HasProvisionedConcurrency",
+            expression=Fn.condition_not(Fn.condition_equals(provisioned_concurrency_param.value, "0"))
+        )
+
+        bootstrapper_lambda_function.node.default_child.reserved_concurrent_executions = Token.as_number(
+            Fn.condition_if(has_reserved_concurrency.logical_id,
+                            reserved_concurrency_param.value_as_number,
+                            Aws.NO_VALUE)
+        )
+
+        # The API and stream invoke the 'live' alias, which carries any provisioned concurrency
+        bootstrapper_alias = lambda_.Alias(
+            self, "BootstrapperLiveAlias",
+            alias_name="live",
+            version=bootstrapper_lambda_function.current_version
+        )
+        bootstrapper_alias.node.default_child.provisioned_concurrency_config = Fn.condition_if(
+            has_provisioned_concurrency.logical_id,
+            # A raw property map: structs inside Fn::If are not converted to CloudFormation casing
+            {"ProvisionedConcurrentExecutions": provisioned_concurrency_param.value_as_number},
+            Aws.NO_VALUE
+        )
+
         services_table.grant_read_write_data(bootstrapper_lambda_function)
+
+        # Only TTL expiries (removals by the DynamoDB service) trigger a teardown
+        bootstrapper_alias.add_event_source(event_sources.DynamoEventSource(
+            services_table,
+            starting_position=lambda_.StartingPosition.LATEST,
+            batch_size=10,
+            retry_attempts=3,
+            filters=[lambda_.FilterCriteria.filter({
+                "eventName": lambda_.FilterRule.is_equal("REMOVE"),
+                "userIdentity": {
+                    "type": lambda_.FilterRule.is_equal("Service"),
+                    "principalId": lambda_.FilterRule.is_equal("dynamodb.amazonaws.com")
+                }
+            })]
+        ))
         github_pat_secret.grant_read(bootstrapper_lambda_function)
 
         codebuild_codepipeline_policy = iam.PolicyStatement(
@@ -230,6 +410,52 @@ class IndustryToolkitStack(Stack):
             resources=["*"]
         ))
 
+        # Teardown deletes service stacks and their Terraform state
+        bootstrapper_lambda_function.add_to_role_policy(iam.PolicyStatement(
+            actions=["cloudformation:DeleteStack", "cloudformation:DescribeStacks"],
+            resources=["*"]
+        ))
+
+        artifacts_bucket.grant_delete(bootstrapper_lambda_function, "terraform/*")
+
+        # Generated projects are kept under bootstrap/ so retried bootstraps can restore them
+        artifacts_bucket.grant_read_write(bootstrapper_lambda_function, "bootstrap/*")
+
+        # Multi-target bootstraps provision registries and pipelines through a role in each target account
+        bootstrapper_lambda_function.add_to_role_policy(iam.PolicyStatement(
+            actions=["sts:AssumeRole"],
+            resources=[f"arn:aws:iam::*:role/{target_role_name_param.value_as_string}"]
+        ))
+
+        # Bootstraps accepted by the API run in an asynchronous invocation of the same function.
+        # The ARN is built from the stack name, since referencing the function from its own policy is circular.
+        bootstrapper_lambda_function.add_to_role_policy(iam.PolicyStatement(
+            actions=["lambda:InvokeFunction"],
+            resources=[self.format_arn(
+                service="lambda",
+                resource="function",
+                resource_name=f"{self.stack_name}-*",
+                arn_format=ArnFormat.COLON_RESOURCE_NAME
+            )]
+        ))
+
+        # -------------------------
+        # Bootstrapper API
+        # -------------------------
+        bootstrapper_api = apigateway.LambdaRestApi(
+            self, "BootstrapperApi",
+            handler=bootstrapper_alias,
+            proxy=False,
+            description="Starts service bootstraps and reports their progress",
+            default_method_options=apigateway.MethodOptions(
+                authorization_type=apigateway.AuthorizationType.IAM
+            )
+        )
+
+        services_resource = bootstrapper_api.root.add_resource("services")
+        services_resource.add_method("POST")
+        services_resource.add_resource("{id}").add_method("GET")
+
         bootstrapper_lambda_function.add_to_role_policy(
             iam.PolicyStatement(
                 actions=["bedrock:InvokeModel"],
@@ -242,4 +468,6 @@ class IndustryToolkitStack(Stack):
         CfnOutput(self, "ArtifactsBucketNameOutput", value=artifacts_bucket.bucket_name, description="Artifacts S3 Bucket Name")
         CfnOutput(self, "EcrRepositoryUriOutput", value=ecr_repository.repository_uri, description="ECR Repository URI")
         CfnOutput(self, "SecretsManagerSecretArnOutput", value=github_pat_secret.secret_arn, description="Secrets Manager ARN")
+        CfnOutput(self, "BootstrapperApiUrl", value=bootstrapper_api.url, description="Bootstrapper API URL")
         CfnOutput(self, "BootstraperLambdaName", value=bootstrapper_lambda_function.function_name, description="Project Bootstrap Lambda Name")
+        CfnOutput(self, "BootstrapperLiveAliasArn", value=bootstrapper_alias.function_arn, description="Project Bootstrap Lambda alias with the tuned concurrency")
@@ -0,0 +1,79 @@
+import json
+
+# The published bootstrapper image is built for x86_64 only
+ARCHITECTURES = ["x86_64"]
+
+# Resource settings for the bootstrapper function. The openapi-generator JVM, the CDK CLI and git all
+# run inside it, so memory (which also sets the CPU share) dominates bootstrap latency.
+TUNING_PROFILES = {
+    # The settings the stack has always used
+    "default": {
+        "memorySize": 1024,
+        "ephemeralStorageSize": 512,
+        "architecture": "x86_64",
+        "provisionedConcurrency": 0,
+        "reservedConcurrency": 0,
+    },
+    # Interactive use through the API: a full vCPU and one pre-initialized instance
+    "interactive": {
+        "memorySize": 2048,
+        "ephemeralStorageSize": 2048,
+        "architecture": "x86_64",
+        "provisionedConcurrency": 1,
+        "reservedConcurrency": 0,
+    },
+    # Bulk bootstraps and teardowns: more CPU per run, capped so they cannot exhaust account concurrency
+    "batch": {
+        "memorySize": 3008,
+        "ephemeralStorageSize": 4096,
+        "architecture": "x86_64",
+        "provisionedConcurrency": 0,
+        "reservedConcurrency": 10,
+    },
+}
+
+LIMITS = {
+    "memorySize": (128, 10240),
+    "ephemeralStorageSize": (512, 10240),
+    "provisionedConcurrency": (0, 1000),
+    "reservedConcurrency": (0, 1000),
+}
+
+
+def tuning_profile(name: str = None, overrides=None) -> dict:
+    """
+    Returns the named tuning profile with `overrides` applied, e.g. from CDK context:
+
+        cdk deploy -c tuningProfile=interactive -c 'tuning={"memorySize": 3008}'
+
+    The result provides the defaults of the stack's Bootstrapper* parameters, which can still be
+    changed at deploy time. A reservedConcurrency or provisionedConcurrency of 0 leaves it unset.
+    """
+    name = name or "default"
+    if name not in TUNING_PROFILES:
+        raise ValueError(f"Unknown tuning profile '{name}', expected one of: {', '.join(TUNING_PROFILES)}")
+
+    # Context values given on the command line are strings
+    if isinstance(overrides, str):
+        overrides = json.loads(overrides)
+
+    overrides = overrides or {}
+    unknown = set(overrides) - set(TUNING_PROFILES[name])
+    if unknown:
+        raise ValueError(f"Unsupported tuning settings: {', '.join(sorted(unknown))}")
+
+    tuning = dict(TUNING_PROFILES[name])
+    tuning.update(overrides)
+
+    for key, (minimum, maximum) in LIMITS.items():
+        value = tuning[key]
+        if not isinstance(value, int) or isinstance(value, bool) or not minimum <= value <= maximum:
+            raise ValueError(f"tuning.{key} must be an integer between {minimum} and {maximum}, got {value!r}")
+
+    if tuning["architecture"] not in ARCHITECTURES:
+        raise ValueError(f"tuning.architecture must be one of {', '.join(ARCHITECTURES)}, got {tuning['architecture']!r}")
+
+    if tuning["reservedConcurrency"] and tuning["provisionedConcurrency"] > tuning["reservedConcurrency"]:
+        raise ValueError("tuning.provisionedConcurrency cannot exceed tuning.reservedConcurrency")
+
+    return tuning